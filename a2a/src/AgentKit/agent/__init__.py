@@ -1,6 +1,47 @@
 from .agent import Agent
-from .config import AgentConfig, ModelSpec
+from .config import (
+    AgentCardCacheConfig,
+    AgentConfig,
+    ArtifactConfig,
+    CircuitBreakerConfig,
+    HedgeConfig,
+    HttpConfig,
+    McpConfig,
+    MergeStrategy,
+    ModelSpec,
+    ParallelConfig,
+    ResilienceConfig,
+    ResponseCacheConfig,
+    RetryConfig,
+    StatusUpdateConfig,
+    StoreBackend,
+    StoreConfig,
+    SubAgentSpec,
+)
 from .llm_agent import LlmAgent
+from .parallel_agent import ParallelAgent
 from .sequential_agent import SequentialAgent
 
-__all__ = ["Agent", "AgentConfig", "LlmAgent", "ModelSpec", "SequentialAgent"]
+__all__ = [
+    "Agent",
+    "AgentCardCacheConfig",
+    "AgentConfig",
+    "ArtifactConfig",
+    "CircuitBreakerConfig",
+    "HedgeConfig",
+    "HttpConfig",
+    "LlmAgent",
+    "McpConfig",
+    "MergeStrategy",
+    "ModelSpec",
+    "ParallelAgent",
+    "ParallelConfig",
+    "ResilienceConfig",
+    "ResponseCacheConfig",
+    "RetryConfig",
+    "SequentialAgent",
+    "StatusUpdateConfig",
+    "StoreBackend",
+    "StoreConfig",
+    "SubAgentSpec",
+]
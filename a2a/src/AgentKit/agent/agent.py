@@ -1,27 +1,42 @@
 from abc import abstractmethod
+import contextlib
 import os
-from typing import Any, AsyncIterable, Callable, Sequence, Type, TypeVar
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Sequence,
+    Type,
+    TypeVar,
+)
 
 from a2a.server.apps import A2AStarletteApplication
 from a2a.server.request_handlers import DefaultRequestHandler
-from a2a.server.tasks import InMemoryTaskStore
 from a2a.types import (
     AgentCapabilities,
     AgentCard,
 )
 from google.adk.agents.base_agent import BaseAgent as ADKBaseAgent
-from google.adk.artifacts import InMemoryArtifactService
-from google.adk.memory.in_memory_memory_service import InMemoryMemoryService
+from google.adk.agents.run_config import RunConfig, StreamingMode
 from google.adk.runners import Runner
-from google.adk.sessions import InMemorySessionService
 from google.genai import types
 from starlette.applications import Starlette
+from starlette.routing import Route
 import yaml
 
 from ..executor import ADKAgentExecutor
+from ..metrics import metrics_endpoint
+from ..store import create_stores
+from ..tools.probe import gateway_address, probe_gateway
+from ..tools.result_cache import configure_tool_result_cache
+from ..tools.schema_cache import configure_tool_schema_cache
+from ..tools.session import close_mcp_sessions
 from .base_agent import BaseAgent
-from .config import AgentConfig, AgentType
+from .card_cache import configure_agent_card_cache, warm_up_agent_cards
+from .config import AgentConfig, AgentType, McpConfig
 from .proxy import A2AProxyAgent
+from .transport import close_http_client, configure_http_client, get_http_client
 
 SUPPORTED_CONTENT_TYPES = ["text", "text/plain"]
 
@@ -37,20 +52,35 @@ class Agent(BaseAgent, ADKBaseAgent):
 
     def __init__(self, config: AgentConfig):
         self._config = config
+        configure_http_client(config.http)
+        configure_agent_card_cache(config.agent_cards)
+        mcp_config = config.mcp or McpConfig()
+        configure_tool_schema_cache(mcp_config.schema_snapshot_path)
+        configure_tool_result_cache(
+            mcp_config.result_cache_max_entries, mcp_config.result_cache_max_mb
+        )
         self._agent = self.build_agent()
         self._user_id = config.agent_id
+        self._stores = create_stores(config.store)
         self._runner = Runner(
             app_name=self._config.agent_id,
             agent=self._agent,
-            artifact_service=InMemoryArtifactService(),
-            session_service=InMemorySessionService(),
-            memory_service=InMemoryMemoryService(),
+            artifact_service=self._stores.artifact_service,
+            session_service=self._stores.session_service,
+            memory_service=self._stores.memory_service,
+        )
+        self._run_config = RunConfig(
+            streaming_mode=(
+                StreamingMode.SSE if self._streams_partials() else StreamingMode.NONE
+            )
         )
 
     def app(self, port: int) -> Starlette:
         request_handler = DefaultRequestHandler(
-            agent_executor=ADKAgentExecutor(self),
-            task_store=InMemoryTaskStore(),
+            agent_executor=ADKAgentExecutor(
+                self, self._config.status_updates, self._config.artifacts
+            ),
+            task_store=self._stores.task_store,
         )
 
         capabilities = AgentCapabilities(streaming=True)
@@ -71,17 +101,52 @@ class Agent(BaseAgent, ADKBaseAgent):
             http_handler=request_handler,
         )
 
-        return server.build()
+        return server.build(
+            lifespan=self._lifespan,
+            routes=[Route("/metrics", metrics_endpoint)],
+        )
+
+    @contextlib.asynccontextmanager
+    async def _lifespan(self, app: Starlette) -> AsyncIterator[None]:
+        """Open shared resources when the server starts and release them on shutdown."""
+        get_http_client()
+        if self._config.tools:
+            # Fail fast when the MCP gateway cannot be reached
+            mcp_config = self._config.mcp or McpConfig()
+            await probe_gateway(
+                gateway_address(os.environ["MCPGATEWAY_ENDPOINT"]),
+                mcp_config.probe_timeout,
+                mcp_config.probe_retry,
+            )
+        try:
+            yield
+        finally:
+            await close_http_client()
+            await close_mcp_sessions()
+            await self._stores.close()
+
+    def _streams_partials(self) -> bool:
+        """Whether runs stream partial events, see `AgentConfig.streaming`."""
+        if self._config.streaming is not None:
+            return self._config.streaming
+        # Text deltas only come with partial events
+        status_updates = self._config.status_updates
+        artifacts = self._config.artifacts
+        return bool(
+            (status_updates and status_updates.text_deltas)
+            or (artifacts and artifacts.streaming)
+        )
 
     def get_processing_message(self) -> str:
         return "Processing..."
 
     def build_agent(self) -> ADKBaseAgent:
-        sub_agents: Sequence[ADKBaseAgent] = (
-            [A2AProxyAgent(a2a_url=url) for url in self._config.sub_agents]
-            if self._config.sub_agents
-            else []
-        )
+        specs = self._config.sub_agent_specs
+        warm_up_agent_cards([spec.url for spec in specs])
+        sub_agents: Sequence[ADKBaseAgent] = [
+            A2AProxyAgent(a2a_url=spec.url, resilience=spec.resilience)
+            for spec in specs
+        ]
         return self._build_agent(list(sub_agents))
 
     @abstractmethod
@@ -91,23 +156,30 @@ class Agent(BaseAgent, ADKBaseAgent):
     async def stream(
         self, query: str, session_id: str
     ) -> AsyncIterable[dict[str, Any]]:
-        session = await self._runner.session_service.get_session(
+        # Looked up once here; the runner then reads the same session again
+        # from the store without copying it.
+        session = await self._stores.session_service.get_or_create_session(
             app_name=self._agent.name,
             user_id=self._user_id,
             session_id=session_id,
         )
         content = types.Content(role="user", parts=[types.Part.from_text(text=query)])
-        if session is None:
-            session = await self._runner.session_service.create_session(
-                app_name=self._agent.name,
-                user_id=self._user_id,
-                state={},
-                session_id=session_id,
-            )
+        # When artifacts are streamed, text deltas are sent as they arrive
+        # and are not accumulated here.
+        stream_artifacts = bool(
+            self._config.artifacts and self._config.artifacts.streaming
+        )
         accumulated_response = ""
+        # Partial events are followed by a complete event repeating their text
+        after_partial = False
         async for event in self._runner.run_async(
-            user_id=self._user_id, session_id=session.id, new_message=content
+            user_id=self._user_id,
+            session_id=session.id,
+            new_message=content,
+            run_config=self._run_config,
         ):
+            repeats_partials = after_partial and not event.partial
+            after_partial = bool(event.partial)
             if event.is_final_response():
                 response: str | dict[str, Any] = ""
                 if (
@@ -129,23 +201,35 @@ class Agent(BaseAgent, ADKBaseAgent):
                             response = p.function_response.model_dump()
                             break
 
-                # Use accumulated response if available, otherwise use final response
-                final_content = (
-                    accumulated_response if accumulated_response else response
-                )
+                if stream_artifacts:
+                    # Only what has not been sent as a delta yet
+                    final_content = (
+                        ""
+                        if repeats_partials and isinstance(response, str)
+                        else response
+                    )
+                else:
+                    # Use accumulated response if available, otherwise use final response
+                    final_content = (
+                        accumulated_response if accumulated_response else response
+                    )
                 yield {
                     "is_task_complete": True,
                     "content": final_content,
                 }
             else:
                 # Handle streaming content - accumulate partial responses
-                if event.content and event.content.parts:
-                    for part in event.content.parts:
-                        if part.text:
-                            accumulated_response += part.text
+                delta = ""
+                if event.content and event.content.parts and not repeats_partials:
+                    delta = "".join(
+                        part.text for part in event.content.parts if part.text
+                    )
+                    if not stream_artifacts:
+                        accumulated_response += delta
                 yield {
                     "is_task_complete": False,
                     "updates": self.get_processing_message(),
+                    "delta": delta,
                 }
 
     def __str__(self):
@@ -0,0 +1,161 @@
+"""Agent card discovery cache.
+
+Agent cards of A2A sub-agents are cached in memory with a TTL and can be
+snapshotted to disk, so that the first request does not pay one card fetch
+per sub-agent and a restarted agent can boot from the snapshot while a
+sub-agent is slow or unreachable.
+"""
+
+import asyncio
+from dataclasses import dataclass
+import json
+import logging
+import os
+import time
+from typing import Iterable, Optional
+
+from a2a.client import A2ACardResolver
+from a2a.types import AgentCard
+import httpx
+
+from .config import AgentCardCacheConfig
+from .transport import get_http_client
+
+logger = logging.getLogger(__name__)
+
+_SNAPSHOT_VERSION = 1
+
+
+@dataclass
+class _Entry:
+    card: AgentCard
+    fetched_at: float
+
+
+class AgentCardCache:
+    def __init__(self, config: AgentCardCacheConfig):
+        self._config = config
+        self._entries: dict[str, _Entry] = {}
+        if config.snapshot_path:
+            self._load_snapshot(config.snapshot_path)
+
+    async def get(
+        self, url: str, httpx_client: Optional[httpx.AsyncClient] = None
+    ) -> Optional[AgentCard]:
+        """
+        Return the agent card for `url`, fetching it if missing or expired.
+        A stale card is returned when the refresh fails.
+        """
+        entry = self._entries.get(url)
+        if entry and time.time() - entry.fetched_at < self._config.ttl:
+            return entry.card
+        card = await self._fetch(url, httpx_client or get_http_client())
+        if card is None:
+            return entry.card if entry else None
+        self._entries[url] = _Entry(card=card, fetched_at=time.time())
+        self._save_snapshot()
+        return card
+
+    async def warm_up(
+        self, urls: Iterable[str], httpx_client: Optional[httpx.AsyncClient] = None
+    ) -> None:
+        """Fetch the agent cards of all `urls` concurrently."""
+        await asyncio.gather(*(self.get(url, httpx_client) for url in urls))
+
+    async def _fetch(
+        self, url: str, httpx_client: httpx.AsyncClient
+    ) -> Optional[AgentCard]:
+        try:
+            return await A2ACardResolver(httpx_client, base_url=url).get_agent_card(
+                http_kwargs={"timeout": self._config.fetch_timeout}
+            )
+        except Exception as e:
+            logger.warning("Failed to fetch agent card from %s: %s", url, e)
+            return None
+
+    def _load_snapshot(self, path: str) -> None:
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable agent card snapshot %s: %s", path, e)
+            return
+        if data.get("version") != _SNAPSHOT_VERSION:
+            logger.warning("Ignoring agent card snapshot %s: version mismatch", path)
+            return
+        for url, entry in data.get("cards", {}).items():
+            try:
+                self._entries[url] = _Entry(
+                    card=AgentCard.model_validate(entry["card"]),
+                    fetched_at=float(entry["fetched_at"]),
+                )
+            except (KeyError, TypeError, ValueError) as e:
+                logger.warning("Ignoring snapshot entry for %s: %s", url, e)
+
+    def _save_snapshot(self) -> None:
+        path = self._config.snapshot_path
+        if not path:
+            return
+        data = {
+            "version": _SNAPSHOT_VERSION,
+            "cards": {
+                url: {
+                    "fetched_at": entry.fetched_at,
+                    "card": entry.card.model_dump(mode="json", exclude_none=True),
+                }
+                for url, entry in self._entries.items()
+            },
+        }
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning("Failed to write agent card snapshot %s: %s", path, e)
+
+
+_cache: Optional[AgentCardCache] = None
+_background_tasks: set[asyncio.Task] = set()
+
+
+def configure_agent_card_cache(config: Optional[AgentCardCacheConfig]) -> None:
+    """Replace the process-wide agent card cache."""
+    global _cache
+    _cache = AgentCardCache(config or AgentCardCacheConfig())
+
+
+def get_agent_card_cache() -> AgentCardCache:
+    """Return the process-wide agent card cache, creating it if needed."""
+    global _cache
+    if _cache is None:
+        _cache = AgentCardCache(AgentCardCacheConfig())
+    return _cache
+
+
+def warm_up_agent_cards(urls: list[str]) -> None:
+    """
+    Populate the agent card cache for `urls` concurrently.
+    Blocks until done when called outside of an event loop, otherwise the
+    warm-up is scheduled on the running loop.
+    """
+    if not urls:
+        return
+    cache = get_agent_card_cache()
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        asyncio.run(_warm_up_with_own_client(cache, urls))
+        return
+    task = loop.create_task(cache.warm_up(urls))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+async def _warm_up_with_own_client(cache: AgentCardCache, urls: list[str]) -> None:
+    # The shared client is bound to the serving event loop, so a blocking
+    # warm-up uses a short-lived client of its own.
+    async with httpx.AsyncClient() as client:
+        await cache.warm_up(urls, client)
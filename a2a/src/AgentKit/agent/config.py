@@ -17,9 +17,193 @@ class ModelSpec(BaseModel):
     provider: Optional[str] = None
 
 
+class HttpConfig(BaseModel):
+    """
+    Connection pool settings for the HTTP client shared by all sub-agent proxies.
+    HTTP/2 requires the optional `h2` package (`httpx[http2]`).
+    """
+
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    http2: bool = False
+    timeout: float = 60.0
+    connect_timeout: float = 5.0
+
+
+class AgentCardCacheConfig(BaseModel):
+    """
+    Settings for the cache of sub-agent cards.
+    When `snapshot_path` is set, cached cards are persisted there and reused
+    on restart if a sub-agent cannot be reached.
+    """
+
+    ttl: float = 300.0
+    fetch_timeout: float = 5.0
+    snapshot_path: Optional[str] = None
+
+
+class RetryConfig(BaseModel):
+    """
+    Retries with exponential backoff and full jitter.
+    `attempts` includes the first call.
+    """
+
+    attempts: int = 1
+    initial_backoff: float = 0.5
+    max_backoff: float = 10.0
+    multiplier: float = 2.0
+
+
+class HedgeConfig(BaseModel):
+    """
+    Send a second, hedged request when the first one is slower than the given
+    latency quantile of recent successful calls.
+    """
+
+    quantile: float = 0.95
+    min_samples: int = 20
+
+
+class CircuitBreakerConfig(BaseModel):
+    """
+    Fail fast after `failure_threshold` consecutive failures, for
+    `reset_timeout` seconds, before letting a trial call through.
+    """
+
+    failure_threshold: int = 5
+    reset_timeout: float = 30.0
+
+
+class ResilienceConfig(BaseModel):
+    """
+    Resilience policy for calls to a sub-agent.
+    `deadline` bounds the whole call in seconds, including retries.
+    """
+
+    deadline: Optional[float] = None
+    retry: RetryConfig = RetryConfig()
+    hedge: Optional[HedgeConfig] = None
+    circuit_breaker: Optional[CircuitBreakerConfig] = None
+
+
+class McpConfig(BaseModel):
+    """
+    Settings for MCP tools.
+    The MCP gateway is probed once at startup, giving up on each connection
+    attempt after `probe_timeout` seconds and retrying as per `probe_retry`.
+    When `schema_snapshot_path` is set, the tool schemas listed from the
+    gateway are persisted there and served on restart until refreshed.
+    Results of tools given a TTL in their spec (`mcp/server:tool?ttl=60`) are
+    cached in an LRU bounded by `result_cache_max_entries` and
+    `result_cache_max_mb`. With `parallel_tool_calls`, the MCP tool calls
+    of a model turn run concurrently, at most `max_concurrent_calls` at a
+    time per MCP server.
+    """
+
+    probe_timeout: float = 5.0
+    probe_retry: RetryConfig = RetryConfig(attempts=3)
+    schema_snapshot_path: Optional[str] = None
+    result_cache_max_entries: int = 1000
+    result_cache_max_mb: Optional[float] = 64.0
+    parallel_tool_calls: bool = True
+    max_concurrent_calls: int = 4
+
+
+class ResponseCacheConfig(BaseModel):
+    """
+    Cache of model responses, kept for `ttl` seconds in an LRU bounded by
+    `max_entries` and `max_mb`. With `embedding_model`, served by the provider
+    of the agent's model, a request whose last user message has an embedding
+    within `similarity_threshold` (cosine) of a cached one is also a hit.
+    """
+
+    ttl: float = 3600.0
+    max_entries: int = 256
+    max_mb: Optional[float] = 64.0
+    embedding_model: Optional[str] = None
+    similarity_threshold: float = 0.95
+
+
+class SubAgentSpec(BaseModel):
+    """
+    Specification for an A2A sub-agent.
+    If no resilience policy is given, the agent's default policy is used.
+    """
+
+    url: str
+    resilience: Optional[ResilienceConfig] = None
+
+
+class StatusUpdateConfig(BaseModel):
+    """
+    Coalescing of the "working" status updates sent while a task runs.
+    With `text_deltas`, updates carry newly generated text instead of a fixed
+    processing message.
+    """
+
+    min_interval: float = 1.0
+    text_deltas: bool = False
+
+
+class ArtifactConfig(BaseModel):
+    """
+    How the response artifact of a task is sent.
+    With `streaming`, text is appended to the artifact in chunks as it is
+    generated instead of being sent once the task completes.
+    """
+
+    streaming: bool = False
+
+
+class StoreBackend(str, Enum):
+    MEMORY = "memory"
+    SQLITE = "sqlite"
+
+
+class StoreConfig(BaseModel):
+    """
+    Where sessions, artifacts, memories and tasks are kept.
+    The in-memory backend evicts the least recently used entries of each store
+    beyond `max_entries` or `max_memory_mb`, and entries idle for longer than
+    `ttl` seconds. The SQLite backend persists to `path` in WAL mode and
+    batches writes for up to `flush_interval` seconds; `ttl` prunes idle
+    sessions and tasks there as well.
+    Sessions keep at most `max_events` events of history, and with
+    `compact_events` events without content are dropped once applied.
+    """
+
+    backend: StoreBackend = StoreBackend.MEMORY
+    max_entries: int = 1000
+    max_memory_mb: Optional[float] = 256.0
+    ttl: Optional[float] = None
+    path: str = "agentkit.db"
+    flush_interval: float = 0.5
+    batch_size: int = 256
+    max_events: Optional[int] = None
+    compact_events: bool = False
+
+
 class AgentType(str, Enum):
     LLM = "llm"
     SEQUENTIAL = "sequential"
+    PARALLEL = "parallel"
+
+
+class MergeStrategy(str, Enum):
+    CONCAT = "concat"
+    FIRST_COMPLETE = "first_complete"
+    KEYED = "keyed"
+
+
+class ParallelConfig(BaseModel):
+    """
+    Settings for parallel agents.
+    Branches still running after `branch_timeout` seconds are cancelled.
+    """
+
+    branch_timeout: Optional[float] = None
+    merge: MergeStrategy = MergeStrategy.CONCAT
 
 
 class AgentConfig(BaseModel):
@@ -37,10 +221,38 @@ class AgentConfig(BaseModel):
     )
     skills: Optional[list[AgentSkill]] = None
     tools: Optional[list[str]] = None
-    sub_agents: Optional[list[str]] = None  # URLs for sub-agents
+    mcp: Optional[McpConfig] = None
+    response_cache: Optional[ResponseCacheConfig] = None
+    sub_agents: Optional[list[Union[str, SubAgentSpec]]] = (
+        None  # Sub-agents can be URLs or SubAgentSpec objects
+    )
+    resilience: Optional[ResilienceConfig] = None  # Default for all sub-agents
+    http: Optional[HttpConfig] = None
+    agent_cards: Optional[AgentCardCacheConfig] = None
+    parallel: Optional[ParallelConfig] = None
+    status_updates: Optional[StatusUpdateConfig] = None
+    artifacts: Optional[ArtifactConfig] = None
+    store: Optional[StoreConfig] = None
+    # Run with SSE streaming, so that models and sub-agents emit partial
+    # events. Defaults to on when the status updates carry text deltas or the
+    # artifacts are streamed.
+    streaming: Optional[bool] = None
 
     @property
     def agent_id(self) -> str:
         if self.id:
             return self.id
         return make_agent_id(self.name)
+
+    @property
+    def sub_agent_specs(self) -> list[SubAgentSpec]:
+        specs: list[SubAgentSpec] = []
+        for sub_agent in self.sub_agents or []:
+            if isinstance(sub_agent, str):
+                sub_agent = SubAgentSpec(url=sub_agent)
+            if sub_agent.resilience is None:
+                sub_agent = sub_agent.model_copy(
+                    update={"resilience": self.resilience or ResilienceConfig()}
+                )
+            specs.append(sub_agent)
+        return specs
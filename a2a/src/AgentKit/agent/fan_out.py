@@ -0,0 +1,171 @@
+"""Fan-out Agent Module
+
+This module provides an agent that sends the same input to all of its sub-agents
+concurrently and merges their results, so independent sub-agents cost the latency
+of the slowest branch instead of the sum of all branches.
+"""
+
+import asyncio
+import json
+import logging
+from typing import Any, AsyncGenerator, Optional, Union
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from google.genai import types
+
+from .config import MergeStrategy
+
+logger = logging.getLogger(__name__)
+
+# Items put on the merge queue by a branch: one of its events, the exception
+# that ended it, or None once it completed.
+_BranchItem = Union[Event, BaseException, None]
+
+
+class FanOutAgent(BaseAgent):
+    """Non-LLM agent that runs its sub-agents concurrently on the same input"""
+
+    # Declare fields as class attributes for Pydantic model
+    branch_timeout: Optional[float] = None
+    merge: MergeStrategy = MergeStrategy.CONCAT
+
+    @property
+    def output_key(self) -> str:
+        return f"{self.name}_output"
+
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        """Agent execution: runs all branches and merges their final results"""
+        queue: asyncio.Queue[tuple[BaseAgent, _BranchItem]] = asyncio.Queue()
+        tasks = [
+            asyncio.create_task(self._run_branch(sub_agent, ctx, queue))
+            for sub_agent in self.sub_agents
+        ]
+        results: dict[str, str] = {}
+        errors: dict[str, str] = {}
+        remaining = len(tasks)
+        try:
+            while remaining:
+                sub_agent, item = await queue.get()
+                if isinstance(item, Event):
+                    yield item
+                    if text := _final_text(item, sub_agent):
+                        results[sub_agent.name] = text
+                    elif item.error_message and item.author == sub_agent.name:
+                        errors[sub_agent.name] = item.error_message
+                    continue
+                remaining -= 1
+                if item is not None:
+                    logger.warning("Branch %s failed: %r", sub_agent.name, item)
+                    errors[sub_agent.name] = str(item) or type(item).__name__
+                    results.pop(sub_agent.name, None)
+                elif (
+                    self.merge == MergeStrategy.FIRST_COMPLETE
+                    and sub_agent.name in results
+                ):
+                    results = {sub_agent.name: results[sub_agent.name]}
+                    break
+        finally:
+            # Cancel stragglers, e.g. after the first branch completed or when
+            # the caller stopped consuming events.
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        if not results:
+            message = "; ".join(f"{name}: {err}" for name, err in errors.items())
+            yield Event(
+                invocation_id=ctx.invocation_id,
+                author=self.name,
+                branch=ctx.branch,
+                content=types.Content(
+                    role="model",
+                    parts=[types.Part(text=f"All parallel branches failed: {message}")],
+                ),
+                error_message=message or "No branch produced a result",
+                turn_complete=True,
+            )
+            return
+
+        merged, state_delta = self._merge_results(results)
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            content=types.Content(role="model", parts=[types.Part(text=merged)]),
+            actions=EventActions(state_delta=state_delta),
+            turn_complete=True,
+        )
+
+    async def _run_live_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        """Live (audio/video) mode is not supported for fan-out agents"""
+        yield Event(
+            author=self.name,
+            content=types.Content(
+                role="model",
+                parts=[
+                    types.Part(
+                        text="Fan-out agents do not support live audio/video mode"
+                    )
+                ],
+            ),
+            error_message="Live mode not supported",
+            turn_complete=True,
+        )
+
+    async def _run_branch(
+        self,
+        sub_agent: BaseAgent,
+        ctx: InvocationContext,
+        queue: asyncio.Queue[tuple[BaseAgent, _BranchItem]],
+    ) -> None:
+        """Runs one sub-agent in an isolated branch, forwarding its events"""
+        try:
+            async with asyncio.timeout(self.branch_timeout):
+                async for event in sub_agent.run_async(
+                    self._create_branch_ctx(sub_agent, ctx)
+                ):
+                    await queue.put((sub_agent, event))
+        except Exception as e:
+            await queue.put((sub_agent, e))
+            return
+        await queue.put((sub_agent, None))
+
+    def _create_branch_ctx(
+        self, sub_agent: BaseAgent, ctx: InvocationContext
+    ) -> InvocationContext:
+        branch_ctx = ctx.model_copy()
+        suffix = f"{self.name}.{sub_agent.name}"
+        branch_ctx.branch = f"{ctx.branch}.{suffix}" if ctx.branch else suffix
+        return branch_ctx
+
+    def _merge_results(self, results: dict[str, str]) -> tuple[str, dict[str, Any]]:
+        """Merges branch results, keeping the declaration order of sub-agents"""
+        ordered = {
+            sub_agent.name: results[sub_agent.name]
+            for sub_agent in self.sub_agents
+            if sub_agent.name in results
+        }
+        if self.merge == MergeStrategy.KEYED:
+            merged = json.dumps(ordered, ensure_ascii=False)
+            state_delta: dict[str, Any] = {
+                f"{name}_output": text for name, text in ordered.items()
+            }
+            state_delta[self.output_key] = merged
+            return merged, state_delta
+        merged = "\n\n".join(ordered.values())
+        return merged, {self.output_key: merged}
+
+
+def _final_text(event: Event, sub_agent: BaseAgent) -> str:
+    """Returns the text of a final, successful event authored by `sub_agent`"""
+    if event.partial or event.error_message or event.author != sub_agent.name:
+        return ""
+    if not event.content or not event.content.parts:
+        return ""
+    return "".join(p.text for p in event.content.parts if p.text)
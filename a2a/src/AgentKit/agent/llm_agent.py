@@ -5,14 +5,20 @@ from google.adk.models.base_llm import BaseLlm
 from google.adk.models.lite_llm import LiteLlm
 
 from ..tools.mcp import create_mcp_toolsets
+from ..tools.parallel import ParallelToolCalls
 from .agent import ADKBaseAgent, Agent
-from .config import AgentType
+from .config import AgentType, McpConfig
+from .response_cache import CachedLlm
 
 
 @Agent.register(AgentType.LLM)
 class LlmAgent(Agent):
     def _build_agent(self, sub_agents: list[ADKBaseAgent]) -> ADKBaseAgent:
-        tools = create_mcp_toolsets(tools_cfg=self._config.tools or [])
+        mcp_config = self._config.mcp or McpConfig()
+        tools = create_mcp_toolsets(
+            tools_cfg=self._config.tools or [],
+            mcp_config=mcp_config,
+        )
         return ADKLlmAgent(
             model=self._build_model(),
             name=self._config.agent_id,
@@ -20,6 +26,11 @@ class LlmAgent(Agent):
             instruction=self._config.instructions or "",
             tools=tools,  # type: ignore
             sub_agents=sub_agents,
+            before_tool_callback=(
+                ParallelToolCalls(tools)
+                if tools and mcp_config.parallel_tool_calls
+                else None
+            ),
         )
 
     def _build_model(self) -> BaseLlm:
@@ -56,4 +67,18 @@ class LlmAgent(Agent):
                 raise ValueError("OPENAI_API_KEY environment variable is not set")
         else:
             raise ValueError(f"unknown model provider {provider}")
-        return LiteLlm(model=name, api_key=api_key, base_url=base_url)
+        model = LiteLlm(model=name, api_key=api_key, base_url=base_url)
+        cache_config = self._config.response_cache
+        if not cache_config:
+            return model
+        embedding_model = cache_config.embedding_model
+        if embedding_model and provider == "docker":
+            embedding_model = "openai/" + embedding_model
+        return CachedLlm(
+            model=model.model,
+            llm=model,
+            config=cache_config,
+            agent_name=self._config.agent_id,
+            embedding_model=embedding_model,
+            embedding_args={"api_key": api_key, "api_base": base_url},
+        )
@@ -0,0 +1,16 @@
+from .agent import ADKBaseAgent, Agent
+from .config import AgentType, ParallelConfig
+from .fan_out import FanOutAgent
+
+
+@Agent.register(AgentType.PARALLEL)
+class ParallelAgent(Agent):
+    def _build_agent(self, sub_agents: list[ADKBaseAgent]) -> ADKBaseAgent:
+        parallel = self._config.parallel or ParallelConfig()
+        return FanOutAgent(
+            name=self._config.agent_id,
+            description=self._config.description or "",
+            sub_agents=sub_agents,
+            branch_timeout=parallel.branch_timeout,
+            merge=parallel.merge,
+        )
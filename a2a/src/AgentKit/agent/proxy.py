@@ -4,69 +4,80 @@ This module provides a proxy agent that forwards requests to an A2A (Agent-to-Ag
 It acts as a bridge between the ADK framework and external A2A services.
 """
 
+import asyncio
 import logging
-from typing import AsyncGenerator, Optional
+from typing import Any, AsyncGenerator, Optional
 import uuid
 
 from a2a.client import A2AClient
 from a2a.types import (
-    AgentCard,
+    CancelTaskRequest,
     Message,
     MessageSendParams,
     Part,
     Role,
     SendMessageRequest,
     SendStreamingMessageRequest,
+    Task,
+    TaskIdParams,
     TextPart,
 )
 from google.adk.agents import BaseAgent
 from google.adk.agents.invocation_context import InvocationContext
+from google.adk.agents.run_config import StreamingMode
 from google.adk.events import Event, EventActions
 from google.genai import types
-import httpx
 
 from .agent_id import make_agent_id
+from .card_cache import get_agent_card_cache
+from .config import ResilienceConfig
+from .resilience import CallPolicy
+from .transport import get_http_client
 
 logger = logging.getLogger(__name__)
 
+# Timeout for the best-effort cancellation of a sub-agent task
+_REMOTE_CANCEL_TIMEOUT = 5.0
+
+_background_tasks: set[asyncio.Task] = set()
+
 
 class A2AProxyAgent(BaseAgent):
-    """Non-LLM agent that proxies calls to an A2A server"""
+    """Non-LLM agent that proxies calls to an A2A server
+
+    When the invocation runs with SSE streaming enabled, artifact chunks are
+    forwarded as partial events as soon as they arrive, followed by a final
+    aggregated event carrying the state delta. Calls go through the
+    sub-agent's resilience policy (deadline, retries, hedging, circuit breaker).
+    """
 
     # Declare fields as class attributes for Pydantic model
     a2a_url: str
     output_key: str
-    httpx_client: Optional[httpx.AsyncClient] = None
+    policy: CallPolicy
     client: Optional[A2AClient] = None
+    streaming: bool = True
 
-    def __init__(self, a2a_url: str):
+    def __init__(self, a2a_url: str, resilience: Optional[ResilienceConfig] = None):
         name = make_agent_id(a2a_url)
-        super().__init__(name=name, a2a_url=a2a_url, output_key=a2a_url)  # type: ignore
+        policy = CallPolicy(name, resilience or ResilienceConfig())
+        super().__init__(name=name, a2a_url=a2a_url, output_key=a2a_url, policy=policy)  # type: ignore
 
     async def _initialize_client(self):
-        """Initialize A2A client by fetching agent card"""
-        if self.client is None:
-            self.httpx_client = httpx.AsyncClient()
-
-            # Fetch agent card first (optional but recommended)
-            try:
-                response = await self.httpx_client.get(
-                    f"{self.a2a_url}/.well-known/agent.json"
-                )
-                agent_card_data = response.json()
-                agent_card = AgentCard(**agent_card_data)
-                agent_card.url = self.a2a_url
-
+        """Initialize A2A client from the cached agent card"""
+        httpx_client = get_http_client()
+        if self.client is None or self.client.httpx_client is not httpx_client:
+            agent_card = await get_agent_card_cache().get(self.a2a_url)
+            if agent_card:
+                self.streaming = agent_card.capabilities.streaming is not False
                 # Create client with agent card
                 self.client = A2AClient(
-                    httpx_client=self.httpx_client,
-                    agent_card=agent_card,
+                    httpx_client=httpx_client,
+                    agent_card=agent_card.model_copy(update={"url": self.a2a_url}),
                 )
-            except Exception:
+            else:
                 # Fallback to URL-only initialization
-                self.client = A2AClient(
-                    httpx_client=self.httpx_client, url=self.a2a_url
-                )
+                self.client = A2AClient(httpx_client=httpx_client, url=self.a2a_url)
 
     async def _run_async_impl(
         self, ctx: InvocationContext
@@ -85,72 +96,45 @@ class A2AProxyAgent(BaseAgent):
             content_to_send = ctx.user_content.parts[0].text or ""
         else:
             content_to_send = self._get_input_from_state(ctx)
+        stream_partials = (
+            ctx.run_config is not None
+            and ctx.run_config.streaming_mode == StreamingMode.SSE
+        )
+        partials: asyncio.Queue[str] = asyncio.Queue()
+        streamed = False
+
+        async def attempt() -> str:
+            nonlocal streamed
+            # Chunks are joined once at the end rather than concatenated as
+            # they arrive.
+            chunks: list[str] = []
+            async for chunk_content in self._send(content_to_send):
+                chunks.append(chunk_content)
+                if stream_partials:
+                    streamed = True
+                    partials.put_nowait(chunk_content)
+            return "".join(chunks)
+
         try:
-            # Try streaming first, fallback to non-streaming if needed
-            streaming_request = SendStreamingMessageRequest(
-                id=str(uuid.uuid4()), params=make_message_send_params(content_to_send)
+            # Partial output that was already forwarded cannot be retracted,
+            # so such calls are neither hedged nor retried.
+            call = asyncio.ensure_future(
+                self.policy.call(
+                    attempt, hedge=not stream_partials, can_retry=lambda: not streamed
+                )
             )
-
-            # Collect streaming response
-            final_result = ""
             try:
-                stream_response = self.client.send_message_streaming(streaming_request)
-
-                async for chunk in stream_response:
-                    chunk_content = ""
-
-                    # Extract content from A2A streaming response
-                    if (
-                        (root := getattr(chunk, "root", None))
-                        and (result := getattr(root, "result", None))
-                        and (artifact := getattr(result, "artifact", None))
-                    ):
-                        if parts := getattr(artifact, "parts", None):
-                            for part in parts:
-                                if (root := getattr(part, "root", None)) and (
-                                    text := getattr(root, "text", None)
-                                ):
-                                    chunk_content = str(text)
-                                    break
-                                elif text := getattr(part, "text", None):
-                                    chunk_content = str(text)
-                                    break
-                    elif result := getattr(chunk, "result", None):
-                        if content := getattr(result, "content", None):
-                            chunk_content = str(content)
-                        elif message := getattr(result, "message", None):
-                            if content := getattr(message, "content", None):
-                                chunk_content = str(content)
-                        elif text := getattr(result, "text", None):
-                            chunk_content = str(text)
-                    elif content := getattr(chunk, "content", None):
-                        chunk_content = str(content)
-                    elif text := getattr(chunk, "text", None):
-                        chunk_content = str(text)
-
-                    if chunk_content:
-                        final_result += chunk_content
-
-            except Exception as e:
-                logger.warning("Streaming failed, falling back to non-streaming: %s", e)
-                # Fallback to non-streaming if streaming fails
-                request = SendMessageRequest(
-                    id=str(uuid.uuid4()),
-                    params=make_message_send_params(content_to_send),
-                )
-                response = await self.client.send_message(request)
-
-                # Handle non-streaming response
-                if result := getattr(response, "result", None):
-                    if content := getattr(result, "content", None):
-                        final_result = content
-                    elif message := getattr(result, "message", None):
-                        if content := getattr(message, "content", None):
-                            final_result = content
-                    else:
-                        final_result = str(result)
-                else:
-                    final_result = str(response)
+                async for chunk_content in _drain(partials, call):
+                    yield Event(
+                        author=self.name,
+                        content=types.Content(
+                            role="model", parts=[types.Part(text=chunk_content)]
+                        ),
+                        partial=True,
+                    )
+                final_result = await call
+            finally:
+                call.cancel()
 
             # Save to state
             if self.output_key:
@@ -181,6 +165,64 @@ class A2AProxyAgent(BaseAgent):
                 turn_complete=True,
             )
 
+    async def _send(self, text: str) -> AsyncGenerator[str, None]:
+        """Sends one request to the A2A agent, yielding response text chunks"""
+        if self.client is None:
+            raise RuntimeError("client did not properly initialize")
+        if self.streaming:
+            request = SendStreamingMessageRequest(
+                id=str(uuid.uuid4()), params=make_message_send_params(text)
+            )
+            task_id: Optional[str] = None
+            try:
+                async for chunk in self.client.send_message_streaming(request):
+                    task_id = task_id or _extract_task_id(chunk)
+                    if chunk_content := _extract_chunk_text(chunk):
+                        yield chunk_content
+            except asyncio.CancelledError:
+                # Closing the stream alone leaves the sub-agent running, so
+                # its task is cancelled as well.
+                if task_id:
+                    self._cancel_remote_task(task_id)
+                raise
+            return
+
+        response = await self.client.send_message(
+            SendMessageRequest(
+                id=str(uuid.uuid4()), params=make_message_send_params(text)
+            )
+        )
+        # Handle non-streaming response
+        if result := getattr(response, "result", None):
+            if content := getattr(result, "content", None):
+                yield str(content)
+            elif message := getattr(result, "message", None):
+                if content := getattr(message, "content", None):
+                    yield str(content)
+            else:
+                yield str(result)
+        else:
+            yield str(response)
+
+    def _cancel_remote_task(self, task_id: str) -> None:
+        """Asks the A2A agent to cancel `task_id`, without waiting for it"""
+        task = asyncio.ensure_future(self._send_cancel(task_id))
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+
+    async def _send_cancel(self, task_id: str) -> None:
+        if self.client is None:
+            return
+        try:
+            await self.client.cancel_task(
+                CancelTaskRequest(
+                    id=str(uuid.uuid4()), params=TaskIdParams(id=task_id)
+                ),
+                http_kwargs={"timeout": _REMOTE_CANCEL_TIMEOUT},
+            )
+        except Exception as e:
+            logger.warning("Failed to cancel task %s on %s: %s", task_id, self.name, e)
+
     async def _run_live_impl(
         self, ctx: InvocationContext
     ) -> AsyncGenerator[Event, None]:
@@ -221,9 +263,62 @@ class A2AProxyAgent(BaseAgent):
         return "No input found"
 
     async def cleanup(self):
-        """Clean up the httpx client"""
-        if self.httpx_client:
-            await self.httpx_client.aclose()
+        """Drop the A2A client; the shared HTTP pool is closed by the app lifespan"""
+        self.client = None
+
+
+async def _drain(
+    queue: asyncio.Queue[str], call: asyncio.Future
+) -> AsyncGenerator[str, None]:
+    """Yields items put on `queue` until `call` is done and the queue is empty"""
+    while True:
+        getter = asyncio.ensure_future(queue.get())
+        await asyncio.wait({getter, call}, return_when=asyncio.FIRST_COMPLETED)
+        if getter.done():
+            yield getter.result()
+            continue
+        getter.cancel()
+        while not queue.empty():
+            yield queue.get_nowait()
+        return
+
+
+def _extract_task_id(chunk: Any) -> Optional[str]:
+    """Extract the id of the sub-agent task one A2A streaming chunk belongs to"""
+    result = getattr(getattr(chunk, "root", None), "result", None)
+    if isinstance(result, Task):
+        return result.id
+    return getattr(result, "taskId", None)
+
+
+def _extract_chunk_text(chunk: Any) -> str:
+    """Extract the text carried by one A2A streaming response chunk"""
+    if (
+        (root := getattr(chunk, "root", None))
+        and (result := getattr(root, "result", None))
+        and (artifact := getattr(result, "artifact", None))
+    ):
+        if parts := getattr(artifact, "parts", None):
+            for part in parts:
+                if (root := getattr(part, "root", None)) and (
+                    text := getattr(root, "text", None)
+                ):
+                    return str(text)
+                elif text := getattr(part, "text", None):
+                    return str(text)
+    elif result := getattr(chunk, "result", None):
+        if content := getattr(result, "content", None):
+            return str(content)
+        elif message := getattr(result, "message", None):
+            if content := getattr(message, "content", None):
+                return str(content)
+        elif text := getattr(result, "text", None):
+            return str(text)
+    elif content := getattr(chunk, "content", None):
+        return str(content)
+    elif text := getattr(chunk, "text", None):
+        return str(text)
+    return ""
 
 
 def make_message_send_params(text: str) -> MessageSendParams:
@@ -0,0 +1,200 @@
+"""Resilience policy for calls to A2A sub-agents.
+
+A CallPolicy wraps each call to a sub-agent with an overall deadline, retries
+with exponential backoff and jitter, an optional hedged request once the call
+is slower than a recent latency quantile, and a circuit breaker that fails
+fast while a sub-agent keeps failing. Outcomes are recorded as metrics.
+"""
+
+import asyncio
+from collections import deque
+import logging
+import math
+import random
+import time
+from typing import Awaitable, Callable, Optional, TypeVar
+
+from .. import metrics
+from .config import CircuitBreakerConfig, ResilienceConfig
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_LATENCY_WINDOW = 100
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when a call is rejected because the circuit breaker is open."""
+
+
+class CircuitBreaker:
+    def __init__(self, name: str, config: CircuitBreakerConfig):
+        self._name = name
+        self._config = config
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    def before_call(self) -> None:
+        """Reject the call while open; let one trial call through once half-open."""
+        if self._opened_at is None:
+            return
+        if time.monotonic() - self._opened_at < self._config.reset_timeout:
+            raise CircuitOpenError(f"circuit breaker for {self._name} is open")
+        if self._trial_in_flight:
+            raise CircuitOpenError(f"circuit breaker for {self._name} is half-open")
+        self._trial_in_flight = True
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._trial_in_flight = False
+        if self._opened_at is not None:
+            logger.info("Circuit breaker for %s closed", self._name)
+            self._opened_at = None
+            metrics.set_gauge("a2a_subagent_circuit_open", 0, agent=self._name)
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        reopen = self._trial_in_flight
+        self._trial_in_flight = False
+        if reopen or self._failures >= self._config.failure_threshold:
+            if self._opened_at is None or reopen:
+                logger.warning("Circuit breaker for %s opened", self._name)
+            self._opened_at = time.monotonic()
+            metrics.set_gauge("a2a_subagent_circuit_open", 1, agent=self._name)
+
+    def record_cancelled(self) -> None:
+        """Release the trial slot of a half-open breaker without a verdict."""
+        self._trial_in_flight = False
+
+
+class CallPolicy:
+    def __init__(self, name: str, config: ResilienceConfig):
+        self._name = name
+        self._config = config
+        self._latencies: deque[float] = deque(maxlen=_LATENCY_WINDOW)
+        self._breaker = (
+            CircuitBreaker(name, config.circuit_breaker)
+            if config.circuit_breaker
+            else None
+        )
+
+    async def call(
+        self,
+        attempt: Callable[[], Awaitable[T]],
+        *,
+        hedge: bool = True,
+        can_retry: Callable[[], bool] = lambda: True,
+    ) -> T:
+        """
+        Run `attempt` under the policy and return the first successful result.
+
+        :param attempt: Performs one complete call to the sub-agent.
+        :param hedge: Whether a hedged second attempt may be started.
+        :param can_retry: Checked after a failure; retries stop once it returns False.
+        """
+        if self._breaker:
+            try:
+                self._breaker.before_call()
+            except CircuitOpenError:
+                metrics.increment(
+                    "a2a_subagent_calls_total", agent=self._name, outcome="rejected"
+                )
+                raise
+        try:
+            async with asyncio.timeout(self._config.deadline):
+                result = await self._call_with_retries(attempt, hedge, can_retry)
+        except TimeoutError as e:
+            self._record_failure("deadline_exceeded")
+            raise TimeoutError(
+                f"call to {self._name} exceeded its {self._config.deadline}s deadline"
+            ) from e
+        except Exception:
+            self._record_failure("failure")
+            raise
+        except asyncio.CancelledError:
+            if self._breaker:
+                self._breaker.record_cancelled()
+            raise
+        if self._breaker:
+            self._breaker.record_success()
+        metrics.increment(
+            "a2a_subagent_calls_total", agent=self._name, outcome="success"
+        )
+        return result
+
+    async def _call_with_retries(
+        self,
+        attempt: Callable[[], Awaitable[T]],
+        hedge: bool,
+        can_retry: Callable[[], bool],
+    ) -> T:
+        retry = self._config.retry
+        attempts = max(retry.attempts, 1)
+        for attempt_no in range(attempts):
+            try:
+                return await self._call_once(attempt, hedge)
+            except Exception as e:
+                if attempt_no + 1 >= attempts or not can_retry():
+                    raise
+                backoff = min(
+                    retry.max_backoff,
+                    retry.initial_backoff * retry.multiplier**attempt_no,
+                )
+                delay = random.uniform(0, backoff)
+                logger.warning(
+                    "Call to %s failed (%s), retrying in %.2fs", self._name, e, delay
+                )
+                metrics.increment("a2a_subagent_retries_total", agent=self._name)
+                await asyncio.sleep(delay)
+        raise AssertionError("unreachable")
+
+    async def _call_once(self, attempt: Callable[[], Awaitable[T]], hedge: bool) -> T:
+        started = time.monotonic()
+        hedge_delay = self._hedge_delay() if hedge else None
+        if hedge_delay is None:
+            result = await attempt()
+        else:
+            result = await self._call_hedged(attempt, hedge_delay)
+        latency = time.monotonic() - started
+        self._latencies.append(latency)
+        metrics.increment("a2a_subagent_latency_seconds_sum", latency, agent=self._name)
+        metrics.increment("a2a_subagent_latency_seconds_count", agent=self._name)
+        return result
+
+    async def _call_hedged(
+        self, attempt: Callable[[], Awaitable[T]], hedge_delay: float
+    ) -> T:
+        tasks = {asyncio.ensure_future(attempt())}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=hedge_delay)
+            if not done:
+                metrics.increment("a2a_subagent_hedges_total", agent=self._name)
+                tasks.add(asyncio.ensure_future(attempt()))
+            error: Optional[BaseException] = None
+            while tasks:
+                done, tasks = await asyncio.wait(
+                    tasks, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if (error := task.exception()) is None:
+                        return task.result()
+            assert error is not None
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def _hedge_delay(self) -> Optional[float]:
+        hedge = self._config.hedge
+        if not hedge or len(self._latencies) < hedge.min_samples:
+            return None
+        ordered = sorted(self._latencies)
+        index = min(len(ordered) - 1, math.ceil(hedge.quantile * len(ordered)) - 1)
+        return ordered[max(index, 0)]
+
+    def _record_failure(self, outcome: str) -> None:
+        if self._breaker:
+            self._breaker.record_failure()
+        metrics.increment("a2a_subagent_calls_total", agent=self._name, outcome=outcome)
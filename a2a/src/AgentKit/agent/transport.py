@@ -0,0 +1,58 @@
+"""Shared HTTP transport for A2A sub-agent calls.
+
+Every A2AProxyAgent in the process uses the same pooled httpx.AsyncClient, so
+sub-agents share keep-alive connections instead of each opening its own pool.
+The client is opened and closed by the Starlette app lifespan (see Agent.app);
+outside of a server it is created lazily on first use.
+"""
+
+import importlib.util
+import logging
+from typing import Optional
+
+import httpx
+
+from .config import HttpConfig
+
+logger = logging.getLogger(__name__)
+
+_config = HttpConfig()
+_client: Optional[httpx.AsyncClient] = None
+
+
+def configure_http_client(config: Optional[HttpConfig]) -> None:
+    """Set the pool settings used the next time the shared client is created."""
+    global _config
+    _config = config or HttpConfig()
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the process-wide HTTP client, creating it if needed."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = _create_client(_config)
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the process-wide HTTP client and release its connections."""
+    global _client
+    client, _client = _client, None
+    if client is not None and not client.is_closed:
+        await client.aclose()
+
+
+def _create_client(config: HttpConfig) -> httpx.AsyncClient:
+    http2 = config.http2
+    if http2 and importlib.util.find_spec("h2") is None:
+        logger.warning("HTTP/2 requested but h2 is not installed, using HTTP/1.1")
+        http2 = False
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=config.max_connections,
+            max_keepalive_connections=config.max_keepalive_connections,
+            keepalive_expiry=config.keepalive_expiry,
+        ),
+        timeout=httpx.Timeout(config.timeout, connect=config.connect_timeout),
+        http2=http2,
+    )
@@ -1,12 +1,19 @@
+import asyncio
 import json
-from typing import cast
+import logging
+from typing import Optional, cast
+import uuid
 
 from a2a.server.agent_execution import AgentExecutor, RequestContext
 from a2a.server.events import EventQueue
 from a2a.server.tasks import TaskUpdater
 from a2a.types import (
+    Artifact,
     DataPart,
     Part,
+    Task,
+    TaskArtifactUpdateEvent,
+    TaskNotCancelableError,
     TaskState,
     TextPart,
     UnsupportedOperationError,
@@ -19,13 +26,26 @@ from a2a.utils import (
 from a2a.utils.errors import ServerError
 
 from ..agent.base_agent import BaseAgent
+from ..agent.config import ArtifactConfig, StatusUpdateConfig
+from .status import StatusUpdateCoalescer
+
+logger = logging.getLogger(__name__)
 
 
 class ADKAgentExecutor(AgentExecutor):
     """Executor for ADK based agents."""
 
-    def __init__(self, agent: BaseAgent):
+    def __init__(
+        self,
+        agent: BaseAgent,
+        status_updates: Optional[StatusUpdateConfig] = None,
+        artifacts: Optional[ArtifactConfig] = None,
+    ):
         self.agent = agent
+        self.status_updates = status_updates or StatusUpdateConfig()
+        self.artifacts = artifacts or ArtifactConfig()
+        # asyncio task running each task.id, so cancel() can stop the ADK run
+        self._running: dict[str, asyncio.Task] = {}
 
     async def execute(
         self,
@@ -47,16 +67,59 @@ class ADKAgentExecutor(AgentExecutor):
             task = new_task(context.message)
             await event_queue.enqueue_event(task)
         updater = TaskUpdater(event_queue, task.id, task.contextId)
+        running = asyncio.current_task()
+        if running is not None:
+            self._running[task.id] = running
+        try:
+            await self._stream_task(query, task, event_queue, updater)
+        except asyncio.CancelledError:
+            # Cancelled through cancel() or by the request handler. By now the
+            # ADK run and its in-flight sub-agent calls have been unwound, so
+            # only the final status is left to report. It is shielded, so it is
+            # still sent if this task is cancelled again meanwhile, and the
+            # cancellation is then propagated to whoever awaits this task.
+            logger.info("Task %s canceled", task.id)
+            await asyncio.shield(updater.update_status(TaskState.canceled, final=True))
+            raise
+        finally:
+            self._running.pop(task.id, None)
+
+    async def _stream_task(
+        self,
+        query: str,
+        task: Task,
+        event_queue: EventQueue,
+        updater: TaskUpdater,
+    ) -> None:
+        coalescer = StatusUpdateCoalescer(self.status_updates)
+        # When streaming the artifact, the latest delta is held back so the
+        # closing chunk can carry text and be flagged as the last one.
+        artifact_id = str(uuid.uuid4())
+        held_delta: Optional[str] = None
+        chunks_sent = 0
         # invoke the underlying agent, using streaming results. The streams
         # now are update events.
         async for item in self.agent.stream(query, task.contextId):
             is_task_complete = item["is_task_complete"]
             if not is_task_complete:
+                if self.artifacts.streaming and (delta := item.get("delta")):
+                    if held_delta is not None:
+                        await self._add_artifact_chunk(
+                            event_queue, task, artifact_id, held_delta, chunks_sent
+                        )
+                        chunks_sent += 1
+                    held_delta = delta
+                if message := coalescer.offer(item["updates"], item.get("delta", "")):
+                    await updater.update_status(
+                        TaskState.working,
+                        new_agent_text_message(message, task.contextId, task.id),
+                    )
+                continue
+            if pending := coalescer.flush():
                 await updater.update_status(
                     TaskState.working,
-                    new_agent_text_message(item["updates"], task.contextId, task.id),
+                    new_agent_text_message(pending, task.contextId, task.id),
                 )
-                continue
             # If the response is a dictionary, assume its a form
             if isinstance(item["content"], dict):
                 # Verify it is a valid form
@@ -86,11 +149,56 @@ class ADKAgentExecutor(AgentExecutor):
                 )
                 break
             # Emit the appropriate events
-            await updater.add_artifact(
-                [Part(root=TextPart(text=item["content"]))], name="form"
-            )
+            if self.artifacts.streaming:
+                await self._add_artifact_chunk(
+                    event_queue,
+                    task,
+                    artifact_id,
+                    (held_delta or "") + item["content"],
+                    chunks_sent,
+                    last_chunk=True,
+                )
+            else:
+                await updater.add_artifact(
+                    [Part(root=TextPart(text=item["content"]))], name="form"
+                )
             await updater.complete()
             break
 
+    async def _add_artifact_chunk(
+        self,
+        event_queue: EventQueue,
+        task: Task,
+        artifact_id: str,
+        text: str,
+        chunks_sent: int,
+        last_chunk: bool = False,
+    ) -> None:
+        await event_queue.enqueue_event(
+            TaskArtifactUpdateEvent(
+                taskId=task.id,
+                contextId=task.contextId,
+                artifact=Artifact(
+                    artifactId=artifact_id,
+                    name="form",
+                    parts=[Part(root=TextPart(text=text))],
+                ),
+                append=chunks_sent > 0,
+                lastChunk=last_chunk,
+            )
+        )
+
     async def cancel(self, context: RequestContext, event_queue: EventQueue) -> None:
-        raise ServerError(error=UnsupportedOperationError())
+        """
+        Cancel the running task. Cancelling its asyncio task unwinds the ADK
+        run, including in-flight sub-agent calls, and execute() then marks the
+        task as canceled on its event queue.
+        """
+        running = self._running.get(context.task_id or "")
+        if running is None or running.done():
+            raise ServerError(
+                error=TaskNotCancelableError(
+                    message=f"Task {context.task_id} is not running"
+                )
+            )
+        running.cancel()
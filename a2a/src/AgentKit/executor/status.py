@@ -0,0 +1,50 @@
+import time
+from typing import Optional
+
+from ..agent.config import StatusUpdateConfig
+
+
+class StatusUpdateCoalescer:
+    """
+    Coalesces the "working" status updates of one task.
+    Identical messages are sent once, and at most one update is sent per
+    `min_interval`. With `text_deltas`, updates carry the text produced since
+    the previous update instead of a fixed processing message.
+    """
+
+    def __init__(self, config: StatusUpdateConfig):
+        self._config = config
+        self._last_sent: Optional[str] = None
+        self._last_sent_at: Optional[float] = None
+        self._pending: list[str] = []
+
+    def offer(self, message: str, delta: str = "") -> Optional[str]:
+        """Record an update and return the message to send now, if any."""
+        if self._config.text_deltas:
+            if delta:
+                self._pending.append(delta)
+            if not self._pending or not self._interval_elapsed():
+                return None
+            return self._mark_sent(self.flush() or "")
+        if message == self._last_sent or not self._interval_elapsed():
+            return None
+        return self._mark_sent(message)
+
+    def flush(self) -> Optional[str]:
+        """Return buffered text deltas not sent yet, if any."""
+        if not self._pending:
+            return None
+        text = "".join(self._pending)
+        self._pending.clear()
+        return text
+
+    def _interval_elapsed(self) -> bool:
+        return (
+            self._last_sent_at is None
+            or time.monotonic() - self._last_sent_at >= self._config.min_interval
+        )
+
+    def _mark_sent(self, message: str) -> str:
+        self._last_sent = message
+        self._last_sent_at = time.monotonic()
+        return message
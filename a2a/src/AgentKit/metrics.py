@@ -0,0 +1,55 @@
+"""In-process metrics.
+
+Counters and gauges are kept in memory for the lifetime of the process and
+served by the agent server at /metrics in the Prometheus text format.
+"""
+
+from collections import defaultdict
+import threading
+
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+
+_lock = threading.Lock()
+_counters: defaultdict[str, float] = defaultdict(float)
+_gauges: dict[str, float] = {}
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _key(name: str, labels: dict[str, str]) -> str:
+    if not labels:
+        return name
+    rendered = ",".join(f'{k}="{_escape(v)}"' for k, v in sorted(labels.items()))
+    return f"{name}{{{rendered}}}"
+
+
+def increment(name: str, value: float = 1.0, **labels: str) -> None:
+    """Add `value` to the counter `name` with the given labels."""
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] += value
+
+
+def set_gauge(name: str, value: float, **labels: str) -> None:
+    """Set the gauge `name` with the given labels to `value`."""
+    key = _key(name, labels)
+    with _lock:
+        _gauges[key] = value
+
+
+def snapshot() -> dict[str, float]:
+    """Return the current value of every counter and gauge."""
+    with _lock:
+        return {**_counters, **_gauges}
+
+
+def render() -> str:
+    """Render all metrics in the Prometheus text exposition format."""
+    return "".join(f"{key} {value:g}\n" for key, value in sorted(snapshot().items()))
+
+
+async def metrics_endpoint(request: Request) -> PlainTextResponse:
+    return PlainTextResponse(render())
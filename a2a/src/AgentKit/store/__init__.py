@@ -0,0 +1,80 @@
+"""Session, artifact, memory and task stores.
+
+The `store` section of the agent config selects where an agent keeps its
+conversations: bounded in-memory stores that evict old entries, or an SQLite
+database for sessions that survive restarts of a single node.
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+from a2a.server.tasks import TaskStore
+from google.adk.artifacts import BaseArtifactService
+from google.adk.memory import BaseMemoryService
+
+from ..agent.config import StoreBackend, StoreConfig
+from .base import SessionService
+from .memory import (
+    BoundedArtifactService,
+    BoundedMemoryService,
+    BoundedSessionService,
+    BoundedTaskStore,
+    LruCache,
+)
+from .sqlite import (
+    SqliteArtifactService,
+    SqliteDatabase,
+    SqliteMemoryService,
+    SqliteSessionService,
+    SqliteTaskStore,
+)
+
+
+@dataclass
+class Stores:
+    session_service: SessionService
+    artifact_service: BaseArtifactService
+    memory_service: BaseMemoryService
+    task_store: TaskStore
+    database: Optional[SqliteDatabase] = None
+
+    async def close(self) -> None:
+        """Commit pending writes and close the database, if any."""
+        if self.database:
+            await self.database.close()
+
+
+def create_stores(config: Optional[StoreConfig]) -> Stores:
+    config = config or StoreConfig()
+    if config.backend == StoreBackend.SQLITE:
+        db = SqliteDatabase(config)
+        return Stores(
+            session_service=SqliteSessionService(db, config),
+            artifact_service=SqliteArtifactService(db),
+            memory_service=SqliteMemoryService(db),
+            task_store=SqliteTaskStore(db),
+            database=db,
+        )
+    return Stores(
+        session_service=BoundedSessionService(config),
+        artifact_service=BoundedArtifactService(config),
+        memory_service=BoundedMemoryService(config),
+        task_store=BoundedTaskStore(config),
+    )
+
+
+__all__ = [
+    "BoundedArtifactService",
+    "BoundedMemoryService",
+    "BoundedSessionService",
+    "BoundedTaskStore",
+    "LruCache",
+    "SessionService",
+    "SqliteArtifactService",
+    "SqliteDatabase",
+    "SqliteMemoryService",
+    "SqliteSessionService",
+    "SqliteTaskStore",
+    "Stores",
+    "create_stores",
+]
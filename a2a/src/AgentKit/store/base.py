@@ -0,0 +1,20 @@
+"""Base class of the session services in this package."""
+
+from google.adk.sessions import BaseSessionService, Session
+
+
+class SessionService(BaseSessionService):
+    """Session service with a single-call lookup for the request path."""
+
+    async def get_or_create_session(
+        self, *, app_name: str, user_id: str, session_id: str
+    ) -> Session:
+        """Return the session `session_id`, creating it if it does not exist."""
+        session = await self.get_session(
+            app_name=app_name, user_id=user_id, session_id=session_id
+        )
+        if session is None:
+            session = await self.create_session(
+                app_name=app_name, user_id=user_id, session_id=session_id
+            )
+        return session
@@ -0,0 +1,44 @@
+"""Event history compaction and truncation shared by the session services."""
+
+from typing import Optional
+
+from google.adk.events import Event
+
+
+def is_compactable(event: Event) -> bool:
+    """
+    Whether `event` can be left out of the history: events without content
+    only carry actions, which have already been applied to the session state.
+    """
+    return not (event.content and event.content.parts)
+
+
+def truncation_point(events: list[Event], max_events: Optional[int]) -> int:
+    """
+    Return how many leading events to drop to keep at most `max_events`.
+    The kept history starts at a user message when there is one, so it does
+    not open with the answer to a dropped question or function call.
+    """
+    if max_events is None or len(events) <= max_events:
+        return 0
+    start = len(events) - max_events
+    for i in range(start, len(events)):
+        if events[i].author == "user":
+            return i
+    return start
+
+
+def trim(
+    events: list[Event], max_events: Optional[int], compact: bool
+) -> tuple[list[Event], list[Event]]:
+    """
+    Compact and truncate `events` in place after an event was appended.
+    Returns the appended event if it was kept, and the events dropped.
+    """
+    added = events[-1:]
+    if compact and added and is_compactable(added[0]):
+        events.pop()
+        added = []
+    removed = events[: truncation_point(events, max_events)]
+    del events[: len(removed)]
+    return added, removed
@@ -0,0 +1,400 @@
+"""Bounded in-memory stores.
+
+Drop-in replacements for the ADK and A2A in-memory services that evict the
+least recently used entries once a store holds too many entries or too many
+bytes, and entries that have been idle for longer than a TTL.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+import json
+import time
+from typing import Any, Callable, Generic, Hashable, Optional, TypeVar
+import uuid
+
+from a2a.server.tasks import TaskStore
+from a2a.types import Task
+from google.adk.artifacts import BaseArtifactService
+from google.adk.events import Event
+from google.adk.memory import InMemoryMemoryService
+from google.adk.sessions import Session, State
+from google.adk.sessions.base_session_service import (
+    GetSessionConfig,
+    ListSessionsResponse,
+)
+from google.genai import types
+
+from .. import metrics
+from ..agent.config import StoreConfig
+from .base import SessionService
+from .history import trim
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+@dataclass
+class _Entry(Generic[V]):
+    value: V
+    size: int
+    touched_at: float
+
+
+class LruCache(Generic[K, V]):
+    """
+    Mapping that evicts its least recently used entries beyond `max_entries`
+    or `max_bytes`, and entries not accessed for `ttl` seconds.
+    Sizes are estimates supplied by the caller.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_entries: int,
+        max_bytes: Optional[int] = None,
+        ttl: Optional[float] = None,
+        on_evict: Optional[Callable[[K, V], None]] = None,
+    ):
+        self._name = name
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._ttl = ttl
+        self._on_evict = on_evict
+        self._entries: OrderedDict[K, _Entry[V]] = OrderedDict()
+        self._bytes = 0
+
+    @classmethod
+    def for_store(
+        cls,
+        name: str,
+        config: StoreConfig,
+        on_evict: Optional[Callable[[K, V], None]] = None,
+    ) -> "LruCache[K, V]":
+        """Create a cache bounded by the limits of the store config."""
+        max_bytes = (
+            int(config.max_memory_mb * 1024 * 1024)
+            if config.max_memory_mb is not None
+            else None
+        )
+        return cls(name, config.max_entries, max_bytes, config.ttl, on_evict)
+
+    @property
+    def sized(self) -> bool:
+        """Whether entry sizes are needed, so callers can skip estimating them."""
+        return self._max_bytes is not None
+
+    def get(self, key: K) -> Optional[V]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        now = time.monotonic()
+        if self._ttl is not None and now - entry.touched_at > self._ttl:
+            self._remove(key, "expired")
+            return None
+        entry.touched_at = now
+        self._entries.move_to_end(key)
+        return entry.value
+
+    def put(self, key: K, value: V, size: int = 0) -> None:
+        if key in self._entries:
+            self._bytes -= self._entries.pop(key).size
+        self._entries[key] = _Entry(value, size, time.monotonic())
+        self._bytes += size
+        self._evict()
+
+    def resize(self, key: K, delta: int) -> None:
+        """Account for `delta` more (or fewer) bytes held by the entry for `key`."""
+        if entry := self._entries.get(key):
+            entry.size += delta
+            self._bytes += delta
+            self._evict()
+
+    def pop(self, key: K) -> Optional[V]:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return None
+        self._bytes -= entry.size
+        return entry.value
+
+    def items(self) -> list[tuple[K, V]]:
+        self._expire()
+        return [(key, entry.value) for key, entry in self._entries.items()]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _evict(self) -> None:
+        self._expire()
+        while len(self._entries) > self._max_entries or (
+            self._max_bytes is not None
+            and self._bytes > self._max_bytes
+            and len(self._entries) > 1
+        ):
+            self._remove(next(iter(self._entries)), "evicted")
+
+    def _expire(self) -> None:
+        if self._ttl is None:
+            return
+        deadline = time.monotonic() - self._ttl
+        # Entries are ordered by last access, so expired ones come first.
+        while self._entries:
+            key, entry = next(iter(self._entries.items()))
+            if entry.touched_at >= deadline:
+                break
+            self._remove(key, "expired")
+
+    def _remove(self, key: K, reason: str) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+        metrics.increment(
+            "agentkit_store_evictions_total", store=self._name, reason=reason
+        )
+        if self._on_evict:
+            self._on_evict(key, entry.value)
+
+
+def _json_size(value: Any) -> int:
+    return len(json.dumps(value, default=str))
+
+
+def events_size(events: list[Event]) -> int:
+    """Estimate the memory held by `events` from their JSON size."""
+    return sum(len(event.model_dump_json(exclude_none=True)) for event in events)
+
+
+def _part_size(part: types.Part) -> int:
+    if part.inline_data and part.inline_data.data:
+        return len(part.inline_data.data)
+    return len(part.text or "")
+
+
+_SessionKey = tuple[str, str, str]
+
+
+class BoundedSessionService(SessionService):
+    """
+    In-memory session service with LRU/TTL eviction.
+    Reads return the stored session itself rather than a deep copy, so the
+    per-request cost does not grow with the length of the conversation.
+    """
+
+    def __init__(self, config: StoreConfig):
+        self._config = config
+        self._sessions: LruCache[_SessionKey, Session] = LruCache.for_store(
+            "sessions", config
+        )
+        self._app_state: dict[str, dict[str, Any]] = {}
+        self._user_state: dict[tuple[str, str], dict[str, Any]] = {}
+
+    async def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: Optional[dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> Session:
+        session_id = (
+            session_id.strip()
+            if session_id and session_id.strip()
+            else str(uuid.uuid4())
+        )
+        session = Session(
+            app_name=app_name,
+            user_id=user_id,
+            id=session_id,
+            state=state or {},
+            last_update_time=time.time(),
+        )
+        size = _json_size(session.state) if self._sessions.sized else 0
+        self._sessions.put((app_name, user_id, session_id), session, size)
+        return self._merge_state(session)
+
+    async def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: Optional[GetSessionConfig] = None,
+    ) -> Optional[Session]:
+        session = self._sessions.get((app_name, user_id, session_id))
+        if session is None:
+            return None
+        if config and (config.num_recent_events or config.after_timestamp):
+            events = session.events
+            if config.num_recent_events:
+                events = events[-config.num_recent_events :]
+            if config.after_timestamp:
+                events = [e for e in events if e.timestamp >= config.after_timestamp]
+            session = session.model_copy(update={"events": events})
+        return self._merge_state(session)
+
+    async def list_sessions(
+        self, *, app_name: str, user_id: str
+    ) -> ListSessionsResponse:
+        sessions = [
+            session.model_copy(update={"events": [], "state": {}})
+            for (app, user, _), session in self._sessions.items()
+            if app == app_name and user == user_id
+        ]
+        return ListSessionsResponse(sessions=sessions)
+
+    async def delete_session(
+        self, *, app_name: str, user_id: str, session_id: str
+    ) -> None:
+        self._sessions.pop((app_name, user_id, session_id))
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        await super().append_event(session=session, event=event)
+        if event.partial:
+            return event
+        session.last_update_time = event.timestamp
+
+        key = (session.app_name, session.user_id, session.id)
+        stored = self._sessions.get(key)
+        if stored is None:
+            # Evicted or deleted while the run was in progress
+            return event
+        if event.actions and event.actions.state_delta:
+            for name, value in event.actions.state_delta.items():
+                if name.startswith(State.APP_PREFIX):
+                    self._app_state.setdefault(session.app_name, {})[
+                        name.removeprefix(State.APP_PREFIX)
+                    ] = value
+                elif name.startswith(State.USER_PREFIX):
+                    self._user_state.setdefault(
+                        (session.app_name, session.user_id), {}
+                    )[name.removeprefix(State.USER_PREFIX)] = value
+        # The caller usually holds the stored session itself
+        if stored is not session:
+            await super().append_event(session=stored, event=event)
+        stored.last_update_time = event.timestamp
+        self._trim(key, stored)
+        return event
+
+    def _trim(self, key: _SessionKey, session: Session) -> None:
+        added, removed = trim(
+            session.events, self._config.max_events, self._config.compact_events
+        )
+        if self._sessions.sized:
+            self._sessions.resize(key, events_size(added) - events_size(removed))
+
+    def _merge_state(self, session: Session) -> Session:
+        for name, value in self._app_state.get(session.app_name, {}).items():
+            session.state[State.APP_PREFIX + name] = value
+        user_state = self._user_state.get((session.app_name, session.user_id), {})
+        for name, value in user_state.items():
+            session.state[State.USER_PREFIX + name] = value
+        return session
+
+
+class BoundedArtifactService(BaseArtifactService):
+    """In-memory artifact service with LRU/TTL eviction of whole artifacts"""
+
+    def __init__(self, config: StoreConfig):
+        self._artifacts: LruCache[str, list[types.Part]] = LruCache.for_store(
+            "artifacts", config
+        )
+
+    @staticmethod
+    def _path(app_name: str, user_id: str, session_id: str, filename: str) -> str:
+        if filename.startswith("user:"):
+            return f"{app_name}/{user_id}/user/{filename}"
+        return f"{app_name}/{user_id}/{session_id}/{filename}"
+
+    async def save_artifact(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        filename: str,
+        artifact: types.Part,
+    ) -> int:
+        path = self._path(app_name, user_id, session_id, filename)
+        versions = self._artifacts.get(path)
+        if versions is None:
+            versions = []
+            self._artifacts.put(path, versions)
+        versions.append(artifact)
+        self._artifacts.resize(path, _part_size(artifact))
+        return len(versions) - 1
+
+    async def load_artifact(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        filename: str,
+        version: Optional[int] = None,
+    ) -> Optional[types.Part]:
+        path = self._path(app_name, user_id, session_id, filename)
+        versions = self._artifacts.get(path)
+        if not versions:
+            return None
+        return versions[-1 if version is None else version]
+
+    async def list_artifact_keys(
+        self, *, app_name: str, user_id: str, session_id: str
+    ) -> list[str]:
+        prefixes = (
+            f"{app_name}/{user_id}/{session_id}/",
+            f"{app_name}/{user_id}/user/",
+        )
+        return sorted(
+            path.removeprefix(prefix)
+            for path, _ in self._artifacts.items()
+            for prefix in prefixes
+            if path.startswith(prefix)
+        )
+
+    async def delete_artifact(
+        self, *, app_name: str, user_id: str, session_id: str, filename: str
+    ) -> None:
+        self._artifacts.pop(self._path(app_name, user_id, session_id, filename))
+
+    async def list_versions(
+        self, *, app_name: str, user_id: str, session_id: str, filename: str
+    ) -> list[int]:
+        path = self._path(app_name, user_id, session_id, filename)
+        return list(range(len(self._artifacts.get(path) or [])))
+
+
+class BoundedMemoryService(InMemoryMemoryService):
+    """Keyword-matching memory service that keeps the latest `max_entries` sessions"""
+
+    def __init__(self, config: StoreConfig):
+        super().__init__()
+        self._order: LruCache[tuple[str, str], None] = LruCache(
+            "memory", config.max_entries, ttl=config.ttl, on_evict=self._forget
+        )
+
+    async def add_session_to_memory(self, session: Session):
+        await super().add_session_to_memory(session)
+        self._order.put((f"{session.app_name}/{session.user_id}", session.id), None)
+
+    def _forget(self, key: tuple[str, str], _: None) -> None:
+        user_key, session_id = key
+        sessions = self._session_events.get(user_key, {})
+        sessions.pop(session_id, None)
+        if not sessions:
+            self._session_events.pop(user_key, None)
+
+
+class BoundedTaskStore(TaskStore):
+    """In-memory A2A task store with LRU/TTL eviction"""
+
+    def __init__(self, config: StoreConfig):
+        self._tasks: LruCache[str, Task] = LruCache.for_store("tasks", config)
+
+    async def save(self, task: Task) -> None:
+        size = len(task.model_dump_json(exclude_none=True)) if self._tasks.sized else 0
+        self._tasks.put(task.id, task, size)
+
+    async def get(self, task_id: str) -> Optional[Task]:
+        return self._tasks.get(task_id)
+
+    async def delete(self, task_id: str) -> None:
+        self._tasks.pop(task_id)
@@ -0,0 +1,666 @@
+"""SQLite-backed stores.
+
+Sessions, artifacts, memories and tasks are kept in one SQLite database in WAL
+mode, so they survive restarts of a single-node agent. Writes are buffered and
+committed in batches by a background flusher; reads flush pending writes
+first, so every read sees the writes that came before it. A failing statement
+only loses its own write, which is reported to whoever awaits it.
+"""
+
+import asyncio
+from datetime import datetime
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Optional, Sequence
+import uuid
+
+from a2a.server.tasks import TaskStore
+from a2a.types import Task
+from google.adk.artifacts import BaseArtifactService
+from google.adk.events import Event
+from google.adk.memory import BaseMemoryService
+from google.adk.memory.base_memory_service import SearchMemoryResponse
+from google.adk.memory.memory_entry import MemoryEntry
+from google.adk.sessions import Session, State
+from google.adk.sessions.base_session_service import (
+    GetSessionConfig,
+    ListSessionsResponse,
+)
+from google.genai import types
+
+from ..agent.config import StoreConfig
+from .base import SessionService
+from .history import is_compactable, trim, truncation_point
+from .memory import LruCache, events_size
+
+logger = logging.getLogger(__name__)
+
+# Sessions and tasks idle for longer than the TTL are pruned at this interval
+_PRUNE_INTERVAL = 60.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    state TEXT NOT NULL,
+    last_update_time REAL NOT NULL,
+    PRIMARY KEY (app_name, user_id, id)
+);
+CREATE TABLE IF NOT EXISTS events (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_by_session
+    ON events (app_name, user_id, session_id, seq);
+CREATE TABLE IF NOT EXISTS app_states (
+    app_name TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (app_name, key)
+);
+CREATE TABLE IF NOT EXISTS user_states (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (app_name, user_id, key)
+);
+CREATE TABLE IF NOT EXISTS artifacts (
+    path TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (path, version)
+);
+CREATE TABLE IF NOT EXISTS memories (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS memories_by_user ON memories (app_name, user_id);
+CREATE TABLE IF NOT EXISTS tasks (
+    id TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+_Statement = tuple[str, Sequence[Any]]
+_SessionKey = tuple[str, str, str]
+
+
+class SqliteDatabase:
+    """
+    SQLite connection shared by the stores, with batched writes.
+    Statements passed to `write` are committed together in one transaction
+    every `flush_interval` seconds, or as soon as `batch_size` are pending.
+    Each statement runs in its own savepoint, so one that fails is rolled
+    back alone and the rest of the batch is still committed.
+    """
+
+    def __init__(self, config: StoreConfig):
+        self._config = config
+        self._conn = sqlite3.connect(
+            config.path, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        # The connection is used from worker threads, one at a time
+        self._conn_lock = threading.Lock()
+        self._pending: list[_Statement] = []
+        self._pending_results: list[asyncio.Future[None]] = []
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._flusher: Optional[asyncio.Task] = None
+        self._batch_full = asyncio.Event()
+        self._last_prune = 0.0
+
+    def write(self, sql: str, params: Sequence[Any] = ()) -> asyncio.Future[None]:
+        """
+        Queue a statement for the next batch. The returned future is done once
+        the batch is committed, with the error of the statement if it failed.
+        """
+        loop = asyncio.get_running_loop()
+        result = loop.create_future()
+        # Failures are logged as well, awaiting the result is optional
+        result.add_done_callback(_retrieve_exception)
+        self._pending.append((sql, params))
+        self._pending_results.append(result)
+        if self._flusher is None or self._flusher.done():
+            self._flusher = loop.create_task(self._run_flusher())
+        if len(self._pending) >= self._config.batch_size:
+            self._batch_full.set()
+        return result
+
+    async def read(self, sql: str, params: Sequence[Any] = ()) -> list[tuple]:
+        """Run a query after committing pending writes."""
+        async with self._get_flush_lock():
+            await self._flush_pending()
+            return await asyncio.to_thread(self._fetch, sql, params)
+
+    async def flush(self) -> None:
+        async with self._get_flush_lock():
+            await self._flush_pending()
+
+    async def close(self) -> None:
+        if self._flusher:
+            self._flusher.cancel()
+            self._flusher = None
+        await self.flush()
+        with self._conn_lock:
+            self._conn.close()
+
+    def _get_flush_lock(self) -> asyncio.Lock:
+        # Created lazily, as the database is opened before the event loop runs
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        return self._flush_lock
+
+    async def _run_flusher(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(
+                    self._batch_full.wait(), self._config.flush_interval
+                )
+            except TimeoutError:
+                pass
+            self._batch_full.clear()
+            try:
+                await self.flush()
+                if (
+                    self._config.ttl is not None
+                    and time.monotonic() - self._last_prune > _PRUNE_INTERVAL
+                ):
+                    self._last_prune = time.monotonic()
+                    await asyncio.to_thread(self._prune, time.time() - self._config.ttl)
+            except sqlite3.Error as e:
+                logger.warning("Failed to write to %s: %s", self._config.path, e)
+
+    async def _flush_pending(self) -> None:
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        results, self._pending_results = self._pending_results, []
+        try:
+            errors = await asyncio.to_thread(self._execute_batch, batch)
+        except asyncio.CancelledError:
+            # The batch may still be committed by the worker thread
+            for result in results:
+                result.cancel()
+            raise
+        except Exception as e:
+            for result in results:
+                if not result.done():
+                    result.set_exception(e)
+            raise
+        for (sql, _), result, error in zip(batch, results, errors):
+            if result.done():
+                continue
+            if error is None:
+                result.set_result(None)
+            else:
+                logger.warning(
+                    "Failed to write to %s: %s: %s", self._config.path, sql, error
+                )
+                result.set_exception(error)
+
+    def _execute_batch(self, batch: list[_Statement]) -> list[Optional[sqlite3.Error]]:
+        """Run a batch in one transaction, returning the error of each statement"""
+        errors: list[Optional[sqlite3.Error]] = []
+        with self._conn_lock:
+            self._conn.execute("BEGIN")
+            try:
+                for sql, params in batch:
+                    self._conn.execute("SAVEPOINT statement")
+                    try:
+                        self._conn.execute(sql, params)
+                    except sqlite3.Error as e:
+                        self._conn.execute("ROLLBACK TO statement")
+                        errors.append(e)
+                    else:
+                        errors.append(None)
+                    self._conn.execute("RELEASE statement")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+        return errors
+
+    def _fetch(self, sql: str, params: Sequence[Any]) -> list[tuple]:
+        with self._conn_lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _prune(self, before: float) -> None:
+        errors = self._execute_batch(
+            [
+                (
+                    "DELETE FROM events WHERE (app_name, user_id, session_id) IN "
+                    "(SELECT app_name, user_id, id FROM sessions "
+                    "WHERE last_update_time < ?)",
+                    (before,),
+                ),
+                ("DELETE FROM sessions WHERE last_update_time < ?", (before,)),
+                ("DELETE FROM tasks WHERE updated_at < ?", (before,)),
+            ]
+        )
+        if error := next((e for e in errors if e is not None), None):
+            raise error
+
+
+def _retrieve_exception(result: asyncio.Future[None]) -> None:
+    if not result.cancelled():
+        result.exception()
+
+
+class SqliteSessionService(SessionService):
+    """
+    Session service persisting sessions and their events to SQLite.
+    Loaded sessions are kept in an LRU cache of handles that is updated along
+    with the database, so repeated reads of a session neither query the
+    database nor deserialize its history again.
+    """
+
+    def __init__(self, db: SqliteDatabase, config: StoreConfig):
+        self._db = db
+        self._config = config
+        self._sessions: LruCache[_SessionKey, Session] = LruCache.for_store(
+            "sqlite_sessions", config
+        )
+        self._app_states: dict[str, dict[str, Any]] = {}
+        self._user_states: dict[tuple[str, str], dict[str, Any]] = {}
+
+    async def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: Optional[dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> Session:
+        session_id = (
+            session_id.strip()
+            if session_id and session_id.strip()
+            else str(uuid.uuid4())
+        )
+        session = Session(
+            app_name=app_name,
+            user_id=user_id,
+            id=session_id,
+            state=state or {},
+            last_update_time=time.time(),
+        )
+        state_json = json.dumps(session.state)
+        self._db.write(
+            "INSERT OR REPLACE INTO sessions VALUES (?, ?, ?, ?, ?)",
+            (app_name, user_id, session_id, state_json, session.last_update_time),
+        )
+        self._db.write(
+            "DELETE FROM events WHERE app_name = ? AND user_id = ? AND session_id = ?",
+            (app_name, user_id, session_id),
+        )
+        self._sessions.put((app_name, user_id, session_id), session, len(state_json))
+        return await self._merge_state(session)
+
+    async def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: Optional[GetSessionConfig] = None,
+    ) -> Optional[Session]:
+        key = (app_name, user_id, session_id)
+        filtered = bool(config and (config.num_recent_events or config.after_timestamp))
+        if not filtered and (session := self._sessions.get(key)):
+            return await self._merge_state(session)
+        loaded = await self._load(key, config)
+        if loaded is None:
+            return None
+        session, size = loaded
+        if not filtered:
+            self._sessions.put(key, session, size)
+        return await self._merge_state(session)
+
+    async def list_sessions(
+        self, *, app_name: str, user_id: str
+    ) -> ListSessionsResponse:
+        rows = await self._db.read(
+            "SELECT id, last_update_time FROM sessions "
+            "WHERE app_name = ? AND user_id = ?",
+            (app_name, user_id),
+        )
+        return ListSessionsResponse(
+            sessions=[
+                Session(
+                    app_name=app_name,
+                    user_id=user_id,
+                    id=session_id,
+                    last_update_time=last_update_time,
+                )
+                for session_id, last_update_time in rows
+            ]
+        )
+
+    async def delete_session(
+        self, *, app_name: str, user_id: str, session_id: str
+    ) -> None:
+        self._sessions.pop((app_name, user_id, session_id))
+        self._db.write(
+            "DELETE FROM sessions WHERE app_name = ? AND user_id = ? AND id = ?",
+            (app_name, user_id, session_id),
+        )
+        self._db.write(
+            "DELETE FROM events WHERE app_name = ? AND user_id = ? AND session_id = ?",
+            (app_name, user_id, session_id),
+        )
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        await super().append_event(session=session, event=event)
+        if event.partial:
+            return event
+        session.last_update_time = event.timestamp
+
+        key = (session.app_name, session.user_id, session.id)
+        if not (self._config.compact_events and is_compactable(event)):
+            self._db.write(
+                "INSERT INTO events (app_name, user_id, session_id, timestamp, data) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (*key, event.timestamp, event.model_dump_json(exclude_none=True)),
+            )
+        if event.actions and event.actions.state_delta:
+            self._write_state_delta(session, event.actions.state_delta)
+        else:
+            self._db.write(
+                "UPDATE sessions SET last_update_time = ? "
+                "WHERE app_name = ? AND user_id = ? AND id = ?",
+                (event.timestamp, *key),
+            )
+
+        if (cached := self._sessions.get(key)) is not None:
+            # The caller usually holds the cached session itself
+            if cached is not session:
+                await super().append_event(session=cached, event=event)
+            cached.last_update_time = event.timestamp
+            added, removed = trim(
+                cached.events, self._config.max_events, self._config.compact_events
+            )
+            if self._sessions.sized:
+                self._sessions.resize(key, events_size(added) - events_size(removed))
+        return event
+
+    def _write_state_delta(self, session: Session, state_delta: dict[str, Any]) -> None:
+        for name, value in state_delta.items():
+            if name.startswith(State.APP_PREFIX):
+                name = name.removeprefix(State.APP_PREFIX)
+                self._db.write(
+                    "INSERT OR REPLACE INTO app_states VALUES (?, ?, ?)",
+                    (session.app_name, name, json.dumps(value)),
+                )
+                if (app_state := self._app_states.get(session.app_name)) is not None:
+                    app_state[name] = value
+            elif name.startswith(State.USER_PREFIX):
+                name = name.removeprefix(State.USER_PREFIX)
+                self._db.write(
+                    "INSERT OR REPLACE INTO user_states VALUES (?, ?, ?, ?)",
+                    (session.app_name, session.user_id, name, json.dumps(value)),
+                )
+                user_key = (session.app_name, session.user_id)
+                if (user_state := self._user_states.get(user_key)) is not None:
+                    user_state[name] = value
+        session_state = {
+            name: value
+            for name, value in session.state.items()
+            if not name.startswith((State.APP_PREFIX, State.USER_PREFIX))
+        }
+        self._db.write(
+            "UPDATE sessions SET state = ?, last_update_time = ? "
+            "WHERE app_name = ? AND user_id = ? AND id = ?",
+            (
+                json.dumps(session_state),
+                session.last_update_time,
+                session.app_name,
+                session.user_id,
+                session.id,
+            ),
+        )
+
+    async def _load(
+        self, key: _SessionKey, config: Optional[GetSessionConfig]
+    ) -> Optional[tuple[Session, int]]:
+        """Load a session and its history, returning it with its size in bytes"""
+        rows = await self._db.read(
+            "SELECT state, last_update_time FROM sessions "
+            "WHERE app_name = ? AND user_id = ? AND id = ?",
+            key,
+        )
+        if not rows:
+            return None
+        state, last_update_time = rows[0]
+        query = (
+            "SELECT data FROM events "
+            "WHERE app_name = ? AND user_id = ? AND session_id = ?"
+        )
+        params: list[Any] = list(key)
+        if config and config.after_timestamp:
+            query += " AND timestamp >= ?"
+            params.append(config.after_timestamp)
+        query += " ORDER BY seq DESC"
+        limit = config.num_recent_events if config else None
+        if self._config.max_events is not None:
+            # One more than kept, to tell whether the history was cut
+            limit = min(
+                limit or self._config.max_events + 1, self._config.max_events + 1
+            )
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+        data = [data for (data,) in reversed(await self._db.read(query, params))]
+        events = [Event.model_validate_json(d) for d in data]
+        if cut := truncation_point(events, self._config.max_events):
+            events, data = events[cut:], data[cut:]
+        session = Session(
+            app_name=key[0],
+            user_id=key[1],
+            id=key[2],
+            state=json.loads(state),
+            events=events,
+            last_update_time=last_update_time,
+        )
+        return session, len(state) + sum(len(d) for d in data)
+
+    async def _merge_state(self, session: Session) -> Session:
+        app_state = self._app_states.get(session.app_name)
+        if app_state is None:
+            rows = await self._db.read(
+                "SELECT key, value FROM app_states WHERE app_name = ?",
+                (session.app_name,),
+            )
+            app_state = {name: json.loads(value) for name, value in rows}
+            self._app_states[session.app_name] = app_state
+        user_key = (session.app_name, session.user_id)
+        user_state = self._user_states.get(user_key)
+        if user_state is None:
+            rows = await self._db.read(
+                "SELECT key, value FROM user_states WHERE app_name = ? AND user_id = ?",
+                user_key,
+            )
+            user_state = {name: json.loads(value) for name, value in rows}
+            self._user_states[user_key] = user_state
+        for name, value in app_state.items():
+            session.state[State.APP_PREFIX + name] = value
+        for name, value in user_state.items():
+            session.state[State.USER_PREFIX + name] = value
+        return session
+
+
+class SqliteArtifactService(BaseArtifactService):
+    """
+    Artifact service persisting every artifact version to SQLite.
+    Saves are serialized, so that concurrent saves of an artifact get
+    consecutive versions, and return once the new version is committed.
+    """
+
+    def __init__(self, db: SqliteDatabase):
+        self._db = db
+        self._save_lock = asyncio.Lock()
+
+    @staticmethod
+    def _path(app_name: str, user_id: str, session_id: str, filename: str) -> str:
+        if filename.startswith("user:"):
+            return f"{app_name}/{user_id}/user/{filename}"
+        return f"{app_name}/{user_id}/{session_id}/{filename}"
+
+    async def save_artifact(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        filename: str,
+        artifact: types.Part,
+    ) -> int:
+        path = self._path(app_name, user_id, session_id, filename)
+        async with self._save_lock:
+            version = len(await self._versions(path))
+            written = self._db.write(
+                "INSERT INTO artifacts VALUES (?, ?, ?)",
+                (path, version, artifact.model_dump_json(exclude_none=True)),
+            )
+            await self._db.flush()
+        await written
+        return version
+
+    async def load_artifact(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        filename: str,
+        version: Optional[int] = None,
+    ) -> Optional[types.Part]:
+        path = self._path(app_name, user_id, session_id, filename)
+        versions = await self._versions(path)
+        if not versions:
+            return None
+        rows = await self._db.read(
+            "SELECT data FROM artifacts WHERE path = ? AND version = ?",
+            (path, versions[-1 if version is None else version]),
+        )
+        return types.Part.model_validate_json(rows[0][0])
+
+    async def list_artifact_keys(
+        self, *, app_name: str, user_id: str, session_id: str
+    ) -> list[str]:
+        prefixes = (
+            f"{app_name}/{user_id}/{session_id}/",
+            f"{app_name}/{user_id}/user/",
+        )
+        rows = await self._db.read(
+            "SELECT DISTINCT path FROM artifacts WHERE substr(path, 1, ?) = ? "
+            "OR substr(path, 1, ?) = ?",
+            (len(prefixes[0]), prefixes[0], len(prefixes[1]), prefixes[1]),
+        )
+        return sorted(
+            path.removeprefix(prefix)
+            for (path,) in rows
+            for prefix in prefixes
+            if path.startswith(prefix)
+        )
+
+    async def delete_artifact(
+        self, *, app_name: str, user_id: str, session_id: str, filename: str
+    ) -> None:
+        self._db.write(
+            "DELETE FROM artifacts WHERE path = ?",
+            (self._path(app_name, user_id, session_id, filename),),
+        )
+
+    async def list_versions(
+        self, *, app_name: str, user_id: str, session_id: str, filename: str
+    ) -> list[int]:
+        return await self._versions(self._path(app_name, user_id, session_id, filename))
+
+    async def _versions(self, path: str) -> list[int]:
+        rows = await self._db.read(
+            "SELECT version FROM artifacts WHERE path = ? ORDER BY version", (path,)
+        )
+        return [version for (version,) in rows]
+
+
+def _words(text: str) -> set[str]:
+    return {word.lower() for word in re.findall(r"[A-Za-z]+", text)}
+
+
+class SqliteMemoryService(BaseMemoryService):
+    """Keyword-matching memory service persisting session events to SQLite"""
+
+    def __init__(self, db: SqliteDatabase):
+        self._db = db
+
+    async def add_session_to_memory(self, session: Session):
+        key = (session.app_name, session.user_id, session.id)
+        self._db.write(
+            "DELETE FROM memories WHERE app_name = ? AND user_id = ? AND session_id = ?",
+            key,
+        )
+        for event in session.events:
+            if event.content and event.content.parts:
+                self._db.write(
+                    "INSERT INTO memories VALUES (?, ?, ?, ?)",
+                    (*key, event.model_dump_json(exclude_none=True)),
+                )
+
+    async def search_memory(
+        self, *, app_name: str, user_id: str, query: str
+    ) -> SearchMemoryResponse:
+        words_in_query = set(query.lower().split())
+        response = SearchMemoryResponse()
+        for (data,) in await self._db.read(
+            "SELECT data FROM memories WHERE app_name = ? AND user_id = ?",
+            (app_name, user_id),
+        ):
+            event = Event.model_validate_json(data)
+            if not event.content or not event.content.parts:
+                continue
+            words_in_event = _words(
+                " ".join(part.text for part in event.content.parts if part.text)
+            )
+            if words_in_query & words_in_event:
+                response.memories.append(
+                    MemoryEntry(
+                        content=event.content,
+                        author=event.author,
+                        timestamp=datetime.fromtimestamp(event.timestamp).isoformat(),
+                    )
+                )
+        return response
+
+
+class SqliteTaskStore(TaskStore):
+    """A2A task store persisting tasks to SQLite"""
+
+    def __init__(self, db: SqliteDatabase):
+        self._db = db
+
+    async def save(self, task: Task) -> None:
+        self._db.write(
+            "INSERT OR REPLACE INTO tasks VALUES (?, ?, ?)",
+            (task.id, task.model_dump_json(exclude_none=True), time.time()),
+        )
+
+    async def get(self, task_id: str) -> Optional[Task]:
+        rows = await self._db.read("SELECT data FROM tasks WHERE id = ?", (task_id,))
+        return Task.model_validate_json(rows[0][0]) if rows else None
+
+    async def delete(self, task_id: str) -> None:
+        self._db.write("DELETE FROM tasks WHERE id = ?", (task_id,))
@@ -1,3 +1,4 @@
 from .mcp import create_mcp_toolsets
+from .session import close_mcp_sessions
 
-__all__ = ["create_mcp_toolsets"]
+__all__ = ["close_mcp_sessions", "create_mcp_toolsets"]
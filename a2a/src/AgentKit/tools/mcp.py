@@ -1,59 +1,240 @@
+import asyncio
 from collections import defaultdict
+import contextlib
+import logging
 import os
-import socket
-from typing import List, Sequence, Union
-from urllib.parse import urlparse
+from typing import TYPE_CHECKING, Any, List, Optional, Sequence
+from urllib.parse import parse_qs
 
+from google.adk.agents.readonly_context import ReadonlyContext
+from google.adk.auth.auth_credential import AuthCredential
+from google.adk.tools.base_tool import BaseTool
 from google.adk.tools.base_toolset import BaseToolset
-from google.adk.tools.mcp_tool.mcp_session_manager import SseConnectionParams
+from google.adk.tools.mcp_tool.mcp_session_manager import (
+    SseConnectionParams,
+    retry_on_closed_resource,
+)
+from google.adk.tools.mcp_tool.mcp_tool import MCPTool
 from google.adk.tools.mcp_tool.mcp_toolset import MCPToolset
-from mcp.client.stdio import StdioServerParameters
+from google.adk.tools.tool_context import ToolContext
+import mcp.types as types
 
+from .probe import gateway_address, probe_gateway
+from .result_cache import ToolResultCache, get_tool_result_cache
+from .schema_cache import ToolSchemaCache, get_tool_schema_cache
+from .session import ConnectionParams, endpoint_key, get_session_manager
+from .tcp import TcpConnectionParams
 
-def _tcp_check(host: str, port: int) -> None:
-    """Fail fast if the MCP gateway is unreachable."""
-    try:
-        with socket.create_connection((host, port), timeout=5):
-            pass
-    except OSError as e:
-        raise RuntimeError(f"cannot reach {host}:{port}: {e}") from e
+if TYPE_CHECKING:
+    from ..agent.config import McpConfig
+
+logger = logging.getLogger(__name__)
+
+
+class GatewayTool(MCPTool):
+    """
+    MCPTool of a GatewayToolset. Calls wait for a slot of the toolset's
+    `limiter`, and successful results are cached for `ttl` seconds, if set.
+    """
+
+    def __init__(
+        self,
+        *,
+        endpoint: str,
+        ttl: Optional[float],
+        limiter: Optional[asyncio.Semaphore],
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self._endpoint = endpoint
+        self._ttl = ttl
+        self._limiter = limiter
+
+    async def _run_async_impl(
+        self, *, args, tool_context: ToolContext, credential: AuthCredential
+    ) -> Any:
+        if self._ttl is None:
+            return await self._call(args, tool_context, credential)
+        cache = get_tool_result_cache()
+        key = ToolResultCache.key(self._endpoint, self.name, args)
+        result = cache.get(key, self.name)
+        if result is not None:
+            return result
+        result = await self._call(args, tool_context, credential)
+        if not getattr(result, "isError", False):
+            size = len(result.model_dump_json()) if cache.sized else 0
+            cache.put(key, result, self._ttl, size)
+        return result
+
+    async def _call(
+        self, args, tool_context: ToolContext, credential: AuthCredential
+    ) -> Any:
+        async with self._limiter or contextlib.nullcontext():
+            return await super()._run_async_impl(
+                args=args, tool_context=tool_context, credential=credential
+            )
+
+
+class GatewayToolset(MCPToolset):
+    """
+    MCPToolset for the tools of one server of the MCP gateway, using the session
+    shared by all toolsets of the gateway. Tool schemas come from the tool
+    schema cache; an entry loaded from the snapshot is served right away and
+    refreshed in the background. With `mcp_config`, the toolset waits for the
+    gateway to be reachable before listing tools, and runs at most
+    `mcp_config.max_concurrent_calls` tool calls at a time. Results of the
+    tools in `result_ttls` are cached for their TTL.
+    """
+
+    def __init__(
+        self,
+        *,
+        address: tuple[str, int],
+        server: str,
+        mcp_config: Optional["McpConfig"],
+        connection_params: ConnectionParams,
+        tool_filter: list[str],
+        result_ttls: dict[str, float],
+        **kwargs,
+    ):
+        super().__init__(
+            connection_params=connection_params,  # type: ignore[arg-type]
+            tool_filter=tool_filter,
+            **kwargs,
+        )
+        self._mcp_session_manager = get_session_manager(connection_params)
+        self._address = address
+        self._mcp_config = mcp_config
+        self._tool_names = set(tool_filter)
+        self._result_ttls = result_ttls
+        self._endpoint = endpoint_key(connection_params)
+        self._schema_key = ToolSchemaCache.key(self._endpoint, server, tool_filter)
+        self._limiter = (
+            asyncio.Semaphore(mcp_config.max_concurrent_calls) if mcp_config else None
+        )
+        self._schemas: Optional[list[types.Tool]] = None
+        self._tools: list[GatewayTool] = []
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    @property
+    def tools(self) -> list[GatewayTool]:
+        """The tools returned by the last call to `get_tools`."""
+        return self._tools
+
+    async def get_tools(
+        self, readonly_context: Optional[ReadonlyContext] = None
+    ) -> List[BaseTool]:
+        cache = get_tool_schema_cache()
+        schemas = cache.get(self._schema_key)
+        if schemas is None:
+            schemas = await self._list_tools()
+        elif not cache.is_fresh(self._schema_key) and self._refresh_task is None:
+            self._refresh_task = asyncio.create_task(self._refresh())
+        if schemas is not self._schemas:
+            self._schemas = schemas
+            self._tools = [self._create_tool(schema) for schema in schemas]
+        return list(self._tools)
+
+    def _create_tool(self, schema: types.Tool) -> GatewayTool:
+        return GatewayTool(
+            mcp_tool=schema,
+            mcp_session_manager=self._mcp_session_manager,
+            auth_scheme=self._auth_scheme,
+            auth_credential=self._auth_credential,
+            endpoint=self._endpoint,
+            ttl=self._result_ttls.get(schema.name),
+            limiter=self._limiter,
+        )
+
+    async def close(self) -> None:
+        # The session is shared, see close_mcp_sessions
+        pass
+
+    async def _list_tools(self) -> list[types.Tool]:
+        if self._mcp_config:
+            # The probe result is cached, so this only waits on the first call
+            await probe_gateway(
+                self._address,
+                self._mcp_config.probe_timeout,
+                self._mcp_config.probe_retry,
+            )
+        result = await self._list_tools_from_session()
+        schemas = [tool for tool in result.tools if tool.name in self._tool_names]
+        get_tool_schema_cache().put(self._schema_key, schemas)
+        return schemas
+
+    @retry_on_closed_resource
+    async def _list_tools_from_session(self) -> types.ListToolsResult:
+        session = await self._mcp_session_manager.create_session()
+        return await session.list_tools()
+
+    async def _refresh(self) -> None:
+        try:
+            await self._list_tools()
+        except Exception as e:
+            logger.warning("Failed to refresh MCP tool schemas: %s", e)
+            # Try again on the next turn
+            self._refresh_task = None
 
 
 def create_mcp_toolsets(
     tools_cfg: Sequence[str],
+    mcp_config: Optional["McpConfig"] = None,
 ) -> List[BaseToolset]:
-    """Return MCPToolset objects - let ADK handle async initialization naturally."""
+    """
+    Return MCPToolset objects - let ADK handle async initialization naturally.
+    With `mcp_config`, toolsets wait for the gateway readiness probe before
+    their first use; nothing connects to the gateway here. All toolsets share
+    one session per gateway endpoint, each filtering the tools of its server,
+    and take their tool schemas from the process-wide tool schema cache.
+    A spec may opt in to result caching with a TTL in seconds, as in
+    `mcp/duckduckgo:search?ttl=3600`.
+    """
     if not tools_cfg:
         return []
 
     tools_by_server: defaultdict[str, list[str]] = defaultdict(list)
+    result_ttls: dict[str, float] = {}
     for raw in tools_cfg:
         if not raw.startswith("mcp/") or ":" not in raw:
             raise ValueError(f"Bad MCP spec: {raw}")
         server, tool = raw[4:].split(":", 1)
+        tool, _, options = tool.partition("?")
+        if options:
+            result_ttls[tool] = _parse_ttl(raw, options)
         # Use just the tool name, not server:tool format
         tools_by_server[server].append(tool)
 
     endpoint = os.environ["MCPGATEWAY_ENDPOINT"]
-    conn_params: Union[SseConnectionParams, StdioServerParameters]
+    address = gateway_address(endpoint)
+    conn_params: ConnectionParams
     if endpoint.startswith(("http://", "https://")):
-        parsed = urlparse(endpoint)
-        if not parsed.hostname:
-            raise ValueError("invalid MCP gateway URL")
-        host, port = parsed.hostname, parsed.port or 80
-        _tcp_check(host, port)
         conn_params = SseConnectionParams(url=endpoint)
     else:
-        host, port_str = endpoint.split(":")
-        _tcp_check(host, int(port_str))
-        conn_params = StdioServerParameters(
-            command="socat",
-            args=["STDIO", f"TCP:{endpoint}"],
+        host, port = address
+        conn_params = TcpConnectionParams(host=host, port=port)
+
+    return [
+        GatewayToolset(
+            address=address,
+            server=server,
+            mcp_config=mcp_config,
+            connection_params=conn_params,
+            tool_filter=tool_list,
+            result_ttls={t: result_ttls[t] for t in tool_list if t in result_ttls},
         )
+        for server, tool_list in tools_by_server.items()
+    ]
 
-    result: list[BaseToolset] = []
-    for tool_list in tools_by_server.values():
-        toolset = MCPToolset(connection_params=conn_params, tool_filter=tool_list)
-        result.append(toolset)
 
-    return result
+def _parse_ttl(raw: str, options: str) -> float:
+    try:
+        params = parse_qs(options, strict_parsing=True)
+        if set(params) != {"ttl"}:
+            raise ValueError("unknown option")
+        ttl = float(params["ttl"][-1])
+    except ValueError:
+        raise ValueError(f"Bad MCP spec: {raw}") from None
+    if ttl <= 0:
+        raise ValueError(f"Bad MCP spec: {raw}")
+    return ttl
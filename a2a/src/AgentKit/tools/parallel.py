@@ -0,0 +1,102 @@
+"""Concurrent execution of the MCP tool calls of a model turn.
+
+ADK runs the function calls of a model response one after another. Installed
+as the `before_tool_callback` of an LlmAgent, ParallelToolCalls starts all
+MCP gateway tool calls of the response together when the first of them is
+about to run, and hands each call its result when ADK gets to it. Responses
+still reach the model in the order of the calls, and each toolset's limiter
+bounds how many of its calls run at a time.
+"""
+
+import asyncio
+from dataclasses import dataclass, field
+import logging
+from typing import Any, Optional, Sequence
+
+from google.adk.events import Event
+from google.adk.tools.base_tool import BaseTool
+from google.adk.tools.base_toolset import BaseToolset
+from google.adk.tools.tool_context import ToolContext
+
+from .mcp import GatewayTool, GatewayToolset
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Batch:
+    tasks: dict[str, asyncio.Task] = field(default_factory=dict)
+
+    def cancel(self) -> None:
+        for task in self.tasks.values():
+            if not task.done():
+                task.cancel()
+            elif not task.cancelled():
+                # Retrieve the exception, the result is no longer wanted
+                task.exception()
+        self.tasks.clear()
+
+
+class ParallelToolCalls:
+    def __init__(self, toolsets: Sequence[BaseToolset]):
+        self._toolsets = [ts for ts in toolsets if isinstance(ts, GatewayToolset)]
+        # Batch of each started call that ADK has not asked for yet
+        self._batches: dict[str, _Batch] = {}
+
+    async def __call__(
+        self, tool: BaseTool, args: dict[str, Any], tool_context: ToolContext
+    ) -> Optional[Any]:
+        call_id = tool_context.function_call_id
+        if not isinstance(tool, GatewayTool) or call_id is None:
+            return None
+        batch = self._batches.pop(call_id, None) or self._start_batch(
+            call_id, tool_context
+        )
+        if batch is None:
+            return None
+        try:
+            return await batch.tasks.pop(call_id)
+        except BaseException:
+            # ADK gives up on the remaining calls of the turn
+            for other_id in batch.tasks:
+                self._batches.pop(other_id, None)
+            batch.cancel()
+            raise
+
+    def _start_batch(self, call_id: str, tool_context: ToolContext) -> Optional[_Batch]:
+        event = self._find_event(call_id, tool_context)
+        if event is None:
+            return None
+        tools = {tool.name: tool for ts in self._toolsets for tool in ts.tools}
+        calls = [
+            call
+            for call in event.get_function_calls()
+            if call.id and call.name in tools and call.id not in self._batches
+        ]
+        if len(calls) < 2:
+            return None
+        batch = _Batch()
+        invocation_context = tool_context._invocation_context
+        for call in calls:
+            assert call.id and call.name
+            context = (
+                tool_context
+                if call.id == call_id
+                else ToolContext(invocation_context, function_call_id=call.id)
+            )
+            batch.tasks[call.id] = asyncio.create_task(
+                tools[call.name].run_async(args=call.args or {}, tool_context=context)
+            )
+            if call.id != call_id:
+                self._batches[call.id] = batch
+        logger.debug("Running %d tool calls concurrently", len(calls))
+        return batch
+
+    @staticmethod
+    def _find_event(call_id: str, tool_context: ToolContext) -> Optional[Event]:
+        # The model response has been appended to the session before its
+        # function calls are handled
+        for event in reversed(tool_context._invocation_context.session.events):
+            if any(call.id == call_id for call in event.get_function_calls()):
+                return event
+        return None
@@ -0,0 +1,83 @@
+"""MCP gateway readiness probe.
+
+The gateway is probed with an asynchronous TCP connect, retried with
+exponential backoff. Concurrent probes of the same address share one attempt,
+and a successful probe is remembered for the lifetime of the process.
+"""
+
+import asyncio
+import functools
+import logging
+from typing import TYPE_CHECKING
+from urllib.parse import urlparse
+
+if TYPE_CHECKING:
+    from ..agent.config import RetryConfig
+
+logger = logging.getLogger(__name__)
+
+_Address = tuple[str, int]
+
+_reachable: set[_Address] = set()
+_in_flight: dict[_Address, asyncio.Task] = {}
+
+
+def gateway_address(endpoint: str) -> _Address:
+    """Return the host and port of an MCP gateway URL or host:port endpoint."""
+    if endpoint.startswith(("http://", "https://")):
+        parsed = urlparse(endpoint)
+        if not parsed.hostname:
+            raise ValueError("invalid MCP gateway URL")
+        return parsed.hostname, parsed.port or 80
+    host, port = endpoint.split(":")
+    return host, int(port)
+
+
+async def probe_gateway(
+    address: _Address, timeout: float, retry: "RetryConfig"
+) -> None:
+    """
+    Wait until the gateway at `address` accepts TCP connections.
+    Raises RuntimeError once all attempts have failed.
+    """
+    if address in _reachable:
+        return
+    task = _in_flight.get(address)
+    if task is None or task.get_loop() is not asyncio.get_running_loop():
+        task = asyncio.ensure_future(_probe(address, timeout, retry))
+        _in_flight[address] = task
+        task.add_done_callback(functools.partial(_forget, address))
+    # Shielded, so a cancelled caller does not cancel the probe for the others
+    await asyncio.shield(task)
+
+
+def _forget(address: _Address, task: asyncio.Task) -> None:
+    if _in_flight.get(address) is task:
+        del _in_flight[address]
+
+
+async def _probe(address: _Address, timeout: float, retry: "RetryConfig") -> None:
+    host, port = address
+    attempts = max(retry.attempts, 1)
+    for attempt_no in range(attempts):
+        try:
+            async with asyncio.timeout(timeout):
+                _, writer = await asyncio.open_connection(host, port)
+            writer.close()
+            _reachable.add(address)
+            return
+        except (OSError, TimeoutError) as e:
+            error = str(e) or type(e).__name__
+            if attempt_no + 1 >= attempts:
+                raise RuntimeError(f"cannot reach {host}:{port}: {error}") from e
+            delay = min(
+                retry.max_backoff, retry.initial_backoff * retry.multiplier**attempt_no
+            )
+            logger.warning(
+                "MCP gateway %s:%s not reachable (%s), retrying in %.1fs",
+                host,
+                port,
+                error,
+                delay,
+            )
+            await asyncio.sleep(delay)
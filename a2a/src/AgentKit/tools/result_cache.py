@@ -0,0 +1,102 @@
+"""Opt-in cache of MCP tool results.
+
+Read-only tools can be given a TTL in their spec, e.g.
+`mcp/duckduckgo:search?ttl=3600`. Their successful results are then cached,
+keyed by tool and canonicalized arguments, in a process-wide LRU bounded by
+entry count and size. Hits and misses are counted per tool in the
+`mcp_tool_cache_requests_total` metric.
+"""
+
+from dataclasses import dataclass
+import json
+import time
+from typing import TYPE_CHECKING, Any, Optional
+
+from .. import metrics
+
+if TYPE_CHECKING:
+    from ..store.memory import LruCache
+
+
+def canonical_args(args: Any) -> str:
+    """
+    Serialize tool arguments so that equivalent calls give the same string:
+    keys are sorted, None values dropped and integral floats written as ints.
+    """
+    return json.dumps(
+        _canonical(args),
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=str,
+    )
+
+
+def _canonical(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: _canonical(v) for k, v in value.items() if v is not None}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+@dataclass
+class _Result:
+    value: Any
+    expires_at: float
+
+
+class ToolResultCache:
+    def __init__(self, max_entries: int, max_bytes: Optional[int] = None):
+        # Imported here, the store package imports the agent package
+        from ..store.memory import LruCache
+
+        self._lru: "LruCache[str, _Result]" = LruCache(
+            "mcp_tool_results", max_entries, max_bytes
+        )
+
+    @staticmethod
+    def key(endpoint: str, tool: str, args: Any) -> str:
+        return f"{endpoint}|{tool}|{canonical_args(args)}"
+
+    def get(self, key: str, tool: str) -> Optional[Any]:
+        result = self._lru.get(key)
+        if result is not None and result.expires_at <= time.monotonic():
+            self._lru.pop(key)
+            result = None
+        metrics.increment(
+            "mcp_tool_cache_requests_total",
+            tool=tool,
+            result="miss" if result is None else "hit",
+        )
+        return result.value if result else None
+
+    def put(self, key: str, value: Any, ttl: float, size: int = 0) -> None:
+        self._lru.put(key, _Result(value, time.monotonic() + ttl), size)
+
+    @property
+    def sized(self) -> bool:
+        return self._lru.sized
+
+
+_cache: Optional[ToolResultCache] = None
+
+
+def configure_tool_result_cache(
+    max_entries: int = 1000, max_mb: Optional[float] = 64.0
+) -> None:
+    """Replace the process-wide tool result cache."""
+    global _cache
+    max_bytes = int(max_mb * 1024 * 1024) if max_mb is not None else None
+    _cache = ToolResultCache(max_entries, max_bytes)
+
+
+def get_tool_result_cache() -> ToolResultCache:
+    """Return the process-wide tool result cache, creating it if needed."""
+    global _cache
+    if _cache is None:
+        configure_tool_result_cache()
+    assert _cache is not None
+    return _cache
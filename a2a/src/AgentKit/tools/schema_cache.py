@@ -0,0 +1,112 @@
+"""MCP tool schema cache.
+
+Tool schemas listed from the MCP gateway are cached in memory, keyed by the
+gateway endpoint, the MCP server and the tool filter, and can be snapshotted
+to disk. Toolsets list their tools once per process instead of on every
+turn, and a restarted agent serves the schemas of the snapshot while they
+are refreshed in the background, so cold start does not wait on the gateway.
+"""
+
+from dataclasses import dataclass
+import json
+import logging
+import os
+from typing import Optional, Sequence
+
+import mcp.types as types
+
+logger = logging.getLogger(__name__)
+
+_SNAPSHOT_VERSION = 1
+
+
+@dataclass
+class _Entry:
+    tools: list[types.Tool]
+    # Whether the tools were listed by this process, not loaded from the snapshot
+    fresh: bool
+
+
+class ToolSchemaCache:
+    def __init__(self, snapshot_path: Optional[str] = None):
+        self._snapshot_path = snapshot_path
+        self._entries: dict[str, _Entry] = {}
+        if snapshot_path:
+            self._load_snapshot(snapshot_path)
+
+    @staticmethod
+    def key(endpoint: str, server: str, tool_filter: Sequence[str]) -> str:
+        return f"{endpoint}|{server}|{','.join(sorted(tool_filter))}"
+
+    def get(self, key: str) -> Optional[list[types.Tool]]:
+        entry = self._entries.get(key)
+        return entry.tools if entry else None
+
+    def is_fresh(self, key: str) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and entry.fresh
+
+    def put(self, key: str, tools: list[types.Tool]) -> None:
+        """Cache the tools listed from the gateway and update the snapshot."""
+        self._entries[key] = _Entry(tools=tools, fresh=True)
+        self._save_snapshot()
+
+    def _load_snapshot(self, path: str) -> None:
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable tool schema snapshot %s: %s", path, e)
+            return
+        if data.get("version") != _SNAPSHOT_VERSION:
+            logger.warning("Ignoring tool schema snapshot %s: version mismatch", path)
+            return
+        for key, tools in data.get("tools", {}).items():
+            try:
+                self._entries[key] = _Entry(
+                    tools=[types.Tool.model_validate(tool) for tool in tools],
+                    fresh=False,
+                )
+            except (TypeError, ValueError) as e:
+                logger.warning("Ignoring snapshot entry for %s: %s", key, e)
+
+    def _save_snapshot(self) -> None:
+        path = self._snapshot_path
+        if not path:
+            return
+        data = {
+            "version": _SNAPSHOT_VERSION,
+            "tools": {
+                key: [
+                    tool.model_dump(mode="json", by_alias=True, exclude_none=True)
+                    for tool in entry.tools
+                ]
+                for key, entry in self._entries.items()
+            },
+        }
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning("Failed to write tool schema snapshot %s: %s", path, e)
+
+
+_cache: Optional[ToolSchemaCache] = None
+
+
+def configure_tool_schema_cache(snapshot_path: Optional[str]) -> None:
+    """Replace the process-wide tool schema cache."""
+    global _cache
+    _cache = ToolSchemaCache(snapshot_path)
+
+
+def get_tool_schema_cache() -> ToolSchemaCache:
+    """Return the process-wide tool schema cache, creating it if needed."""
+    global _cache
+    if _cache is None:
+        _cache = ToolSchemaCache()
+    return _cache
@@ -0,0 +1,151 @@
+"""Shared MCP sessions.
+
+All toolsets of the process that talk to the same MCP gateway endpoint share
+one multiplexed MCP session, instead of each opening its own connection and
+handshake. Tools are filtered per toolset on the client side. A session runs
+in a background task, so it outlives the request that opened it, and it is
+replaced transparently when the gateway drops the connection. The sessions
+are closed by the Starlette app lifespan (see Agent.app).
+"""
+
+import asyncio
+from contextlib import AsyncExitStack
+from datetime import timedelta
+import logging
+from typing import Dict, Optional, Union
+
+from google.adk.tools.mcp_tool.mcp_session_manager import (
+    MCPSessionManager,
+    SseConnectionParams,
+)
+from mcp import ClientSession
+from mcp.client.sse import sse_client
+
+from .tcp import TcpConnectionParams, tcp_client
+
+logger = logging.getLogger(__name__)
+
+ConnectionParams = Union[SseConnectionParams, TcpConnectionParams]
+
+_managers: dict[str, "SharedSessionManager"] = {}
+
+
+def endpoint_key(params: ConnectionParams) -> str:
+    if isinstance(params, TcpConnectionParams):
+        return f"tcp://{params.host}:{params.port}"
+    return params.url
+
+
+def get_session_manager(params: ConnectionParams) -> "SharedSessionManager":
+    """Return the process-wide session manager for the endpoint of `params`."""
+    key = endpoint_key(params)
+    manager = _managers.get(key)
+    if manager is None:
+        manager = _managers[key] = SharedSessionManager(params)
+    return manager
+
+
+async def close_mcp_sessions() -> None:
+    """Close the shared MCP sessions of the process."""
+    managers = list(_managers.values())
+    _managers.clear()
+    for manager in managers:
+        try:
+            await manager.close()
+        except Exception as e:
+            logger.warning("Error closing MCP session: %s", e)
+
+
+class SharedSessionManager(MCPSessionManager):
+    """
+    MCPSessionManager holding a single session to one endpoint.
+    Per-call headers are not supported, as they would need a session each.
+    """
+
+    def __init__(self, connection_params: ConnectionParams):
+        super().__init__(connection_params=connection_params)  # type: ignore[arg-type]
+        self._params = connection_params
+        self._ready: Optional[asyncio.Future[ClientSession]] = None
+        self._closing = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    async def create_session(
+        self, headers: Optional[Dict[str, str]] = None
+    ) -> ClientSession:
+        async with self._session_lock:
+            if self._ready is None or self._is_stale():
+                await self._stop()
+                self._ready = asyncio.get_running_loop().create_future()
+                self._closing = asyncio.Event()
+                self._task = asyncio.create_task(self._run(self._ready, self._closing))
+            ready = self._ready
+        # Shielded, so a cancelled caller does not abort the connection attempt
+        return await asyncio.shield(ready)
+
+    async def close(self) -> None:
+        async with self._session_lock:
+            await self._stop()
+            self._ready = None
+
+    def _is_stale(self) -> bool:
+        ready, task = self._ready, self._task
+        if ready is None or task is None:
+            return True
+        if ready.get_loop() is not asyncio.get_running_loop():
+            return True
+        if not ready.done():
+            return False
+        if ready.cancelled() or ready.exception() or task.done():
+            return True
+        return self._is_session_disconnected(ready.result())
+
+    async def _stop(self) -> None:
+        task, self._task = self._task, None
+        if task is None or task.done():
+            return
+        self._closing.set()
+        if task.get_loop() is asyncio.get_running_loop():
+            await task
+
+    async def _run(
+        self, ready: asyncio.Future[ClientSession], closing: asyncio.Event
+    ) -> None:
+        # The exit stack is entered and closed in this task, as anyio requires
+        try:
+            async with AsyncExitStack() as stack:
+                read, write = await stack.enter_async_context(self._client())
+                session = await stack.enter_async_context(
+                    ClientSession(
+                        read, write, read_timeout_seconds=self._read_timeout()
+                    )
+                )
+                await session.initialize()
+                logger.info("Connected to MCP gateway %s", endpoint_key(self._params))
+                ready.set_result(session)
+                await closing.wait()
+        except Exception as e:
+            if not ready.done():
+                ready.set_exception(e)
+            else:
+                logger.warning(
+                    "MCP session to %s closed: %s", endpoint_key(self._params), e
+                )
+        finally:
+            if not ready.done():
+                ready.cancel()
+
+    def _client(self):
+        params = self._params
+        if isinstance(params, TcpConnectionParams):
+            return tcp_client(params.host, params.port, params.timeout)
+        return sse_client(
+            url=params.url,
+            headers=params.headers,
+            timeout=params.timeout,
+            sse_read_timeout=params.sse_read_timeout,
+        )
+
+    def _read_timeout(self) -> Optional[timedelta]:
+        if isinstance(self._params, TcpConnectionParams):
+            return timedelta(seconds=self._params.timeout)
+        return None
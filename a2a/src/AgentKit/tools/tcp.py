@@ -0,0 +1,93 @@
+"""MCP client transport over a plain TCP connection.
+
+The MCP gateway speaks newline-delimited JSON-RPC on its TCP port, the same
+framing as the stdio transport, so the client connects to it directly instead
+of spawning a `socat STDIO TCP:host:port` child process for every toolset.
+"""
+
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+import anyio
+from anyio.streams.buffered import BufferedByteReceiveStream
+from anyio.streams.memory import MemoryObjectReceiveStream, MemoryObjectSendStream
+from mcp.shared.message import SessionMessage
+import mcp.types as types
+from pydantic import BaseModel
+
+# Upper bound on a single JSON-RPC message, e.g. a large tool result
+_MAX_MESSAGE_BYTES = 64 * 1024 * 1024
+
+
+class TcpConnectionParams(BaseModel):
+    """Parameters for the TCP connection to an MCP server."""
+
+    host: str
+    port: int
+    # Same default read timeout as ADK uses for stdio servers
+    timeout: float = 5.0
+
+
+@asynccontextmanager
+async def tcp_client(
+    host: str, port: int, connect_timeout: float = 5.0
+) -> AsyncIterator[
+    tuple[
+        MemoryObjectReceiveStream[SessionMessage | Exception],
+        MemoryObjectSendStream[SessionMessage],
+    ]
+]:
+    """
+    Connect to the MCP server at `host`:`port` and yield the read and write
+    streams for a `ClientSession`, like `mcp.client.stdio.stdio_client`.
+    """
+    with anyio.fail_after(connect_timeout):
+        stream = await anyio.connect_tcp(host, port)
+
+    read_stream_writer, read_stream = anyio.create_memory_object_stream[
+        SessionMessage | Exception
+    ](0)
+    write_stream, write_stream_reader = anyio.create_memory_object_stream[
+        SessionMessage
+    ](0)
+
+    async def tcp_reader() -> None:
+        buffered = BufferedByteReceiveStream(stream)
+        async with read_stream_writer:
+            while True:
+                try:
+                    line = await buffered.receive_until(b"\n", _MAX_MESSAGE_BYTES)
+                except (anyio.IncompleteRead, anyio.EndOfStream):
+                    break
+                except anyio.DelimiterNotFound as e:
+                    await read_stream_writer.send(e)
+                    break
+                if not line.strip():
+                    continue
+                try:
+                    message = types.JSONRPCMessage.model_validate_json(line)
+                except Exception as e:
+                    await read_stream_writer.send(e)
+                    continue
+                await read_stream_writer.send(SessionMessage(message))
+        # Closing the session's write stream marks the session as disconnected,
+        # so the session manager reconnects on next use
+        await write_stream.aclose()
+
+    async def tcp_writer() -> None:
+        async with write_stream_reader:
+            async for session_message in write_stream_reader:
+                data = session_message.message.model_dump_json(
+                    by_alias=True, exclude_none=True
+                )
+                await stream.send(data.encode() + b"\n")
+
+    async with stream, anyio.create_task_group() as tg:
+        tg.start_soon(tcp_reader)
+        tg.start_soon(tcp_writer)
+        try:
+            yield read_stream, write_stream
+        finally:
+            await read_stream.aclose()
+            await write_stream.aclose()
+            tg.cancel_scope.cancel()
@@ -0,0 +1,41 @@
+from typing import Any, AsyncGenerator, Callable
+
+from a2a.client import A2AClient
+from google.adk.agents import SequentialAgent as ADKSequentialAgent
+from google.adk.agents.base_agent import BaseAgent as ADKBaseAgent
+import httpx
+import pytest
+
+from AgentKit.agent.agent import Agent
+from AgentKit.agent.config import AgentConfig
+from AgentKit.agent.proxy import A2AProxyAgent
+
+RESPONSE_CHUNKS = ["Hel", "lo ", "world"]
+
+
+class FakeProxyAgent(A2AProxyAgent):
+    """Proxy to a sub-agent streaming a fixed response, without a server."""
+
+    async def _initialize_client(self):
+        if self.client is None:
+            self.client = A2AClient(httpx_client=httpx.AsyncClient(), url=self.a2a_url)
+
+    async def _send(self, text: str) -> AsyncGenerator[str, None]:
+        for chunk in RESPONSE_CHUNKS:
+            yield chunk
+
+
+class ProxyAgent(Agent):
+    def _build_agent(self, sub_agents: list[ADKBaseAgent]) -> ADKBaseAgent:
+        proxy: ADKBaseAgent = FakeProxyAgent(a2a_url="http://sub-agent:8000")  # pyright: ignore[reportCallIssue]
+        return ADKSequentialAgent(name=self._config.agent_id, sub_agents=[proxy])
+
+
+@pytest.fixture
+def proxy_agent() -> Callable[..., Agent]:
+    """Factory of agents proxying a sub-agent that streams RESPONSE_CHUNKS."""
+
+    def make(**config: Any) -> Agent:
+        return ProxyAgent(AgentConfig(name="proxy", **config))  # pyright: ignore[reportCallIssue]
+
+    return make
@@ -0,0 +1,28 @@
+import asyncio
+from typing import Any, Callable
+
+from conftest import RESPONSE_CHUNKS
+
+from AgentKit.agent.agent import Agent
+
+
+async def collect(agent: Agent) -> list[dict[str, Any]]:
+    return [item async for item in agent.stream("hello", "session-1")]
+
+
+def test_stream_yields_partial_events_of_sub_agents(
+    proxy_agent: Callable[..., Agent],
+):
+    items = asyncio.run(collect(proxy_agent(streaming=True)))
+
+    deltas = [item["delta"] for item in items if not item["is_task_complete"]]
+    assert deltas == RESPONSE_CHUNKS
+    assert items[-1] == {"is_task_complete": True, "content": "Hello world"}
+
+
+def test_stream_without_streaming_yields_final_response_only(
+    proxy_agent: Callable[..., Agent],
+):
+    items = asyncio.run(collect(proxy_agent()))
+
+    assert items == [{"is_task_complete": True, "content": "Hello world"}]
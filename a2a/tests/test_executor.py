@@ -0,0 +1,115 @@
+import asyncio
+from typing import Any, AsyncIterable, Callable
+
+from a2a.server.agent_execution import RequestContext
+from a2a.server.events import Event, EventQueue
+from a2a.types import (
+    MessageSendParams,
+    Part,
+    TaskArtifactUpdateEvent,
+    TaskState,
+    TaskStatusUpdateEvent,
+    TextPart,
+)
+from a2a.utils import new_agent_text_message
+from conftest import RESPONSE_CHUNKS
+import pytest
+
+from AgentKit.agent.agent import Agent
+from AgentKit.agent.base_agent import BaseAgent
+from AgentKit.agent.config import ArtifactConfig, StatusUpdateConfig
+from AgentKit.executor import ADKAgentExecutor
+
+
+class HangingAgent(BaseAgent):
+    """Agent that never answers."""
+
+    async def stream(
+        self, query: str, session_id: str
+    ) -> AsyncIterable[dict[str, Any]]:
+        await asyncio.Event().wait()
+        yield {}
+
+
+def request_context() -> RequestContext:
+    message = new_agent_text_message("hello", "context-1").model_copy(
+        update={"role": "user"}
+    )
+    return RequestContext(MessageSendParams(message=message), context_id="context-1")
+
+
+async def dequeue_all(queue: EventQueue) -> list[Event]:
+    events: list[Event] = []
+    while not queue.queue.empty():
+        events.append(await queue.dequeue_event(no_wait=True))
+    return events
+
+
+async def execute(executor: ADKAgentExecutor) -> list[Event]:
+    queue = EventQueue()
+    await executor.execute(request_context(), queue)
+    return await dequeue_all(queue)
+
+
+def texts(parts: list[Part]) -> list[str]:
+    return [part.root.text for part in parts if isinstance(part.root, TextPart)]
+
+
+def status_texts(events: list[Event], state: TaskState) -> list[str]:
+    return [
+        text
+        for event in events
+        if isinstance(event, TaskStatusUpdateEvent) and event.status.state == state
+        for text in texts(event.status.message.parts if event.status.message else [])
+    ]
+
+
+def test_status_updates_carry_text_deltas(proxy_agent: Callable[..., Agent]):
+    status_updates = StatusUpdateConfig(min_interval=0, text_deltas=True)
+    agent = proxy_agent(status_updates=status_updates)
+
+    events = asyncio.run(execute(ADKAgentExecutor(agent, status_updates)))
+
+    assert status_texts(events, TaskState.working) == RESPONSE_CHUNKS
+    assert status_texts(events, TaskState.completed) == []
+    assert isinstance(events[-1], TaskStatusUpdateEvent)
+    assert events[-1].status.state == TaskState.completed
+
+
+def test_artifact_is_streamed_in_chunks(proxy_agent: Callable[..., Agent]):
+    artifacts = ArtifactConfig(streaming=True)
+    agent = proxy_agent(artifacts=artifacts)
+
+    events = asyncio.run(execute(ADKAgentExecutor(agent, artifacts=artifacts)))
+
+    chunks = [event for event in events if isinstance(event, TaskArtifactUpdateEvent)]
+    # The last delta is held back to be sent with the closing chunk
+    assert [texts(chunk.artifact.parts) for chunk in chunks] == [
+        ["Hel"],
+        ["lo "],
+        ["world"],
+    ]
+    assert [chunk.append for chunk in chunks] == [False, True, True]
+    assert [chunk.lastChunk for chunk in chunks] == [False, False, True]
+    assert len({chunk.artifact.artifactId for chunk in chunks}) == 1
+    assert isinstance(events[-1], TaskStatusUpdateEvent)
+    assert events[-1].status.state == TaskState.completed
+
+
+def test_cancel_sends_canceled_status_and_propagates():
+    async def cancel_execution() -> list[Event]:
+        queue = EventQueue()
+        execution = asyncio.create_task(
+            ADKAgentExecutor(HangingAgent()).execute(request_context(), queue)
+        )
+        await asyncio.sleep(0.01)
+        execution.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await execution
+        return await dequeue_all(queue)
+
+    events = asyncio.run(cancel_execution())
+
+    assert isinstance(events[-1], TaskStatusUpdateEvent)
+    assert events[-1].status.state == TaskState.canceled
+    assert events[-1].final
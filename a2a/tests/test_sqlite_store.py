@@ -0,0 +1,58 @@
+import asyncio
+from pathlib import Path
+import sqlite3
+
+from google.genai import types
+import pytest
+
+from AgentKit.agent.config import StoreBackend, StoreConfig
+from AgentKit.store.sqlite import SqliteArtifactService, SqliteDatabase
+
+
+def store_config(tmp_path: Path) -> StoreConfig:
+    return StoreConfig(backend=StoreBackend.SQLITE, path=str(tmp_path / "agent.db"))
+
+
+def test_failing_statement_does_not_drop_the_rest_of_the_batch(tmp_path: Path):
+    async def write_batch() -> list[tuple]:
+        db = SqliteDatabase(store_config(tmp_path))
+        first = db.write("INSERT INTO tasks VALUES (?, ?, ?)", ("task-1", "{}", 0))
+        duplicate = db.write("INSERT INTO tasks VALUES (?, ?, ?)", ("task-1", "{}", 0))
+        last = db.write("INSERT INTO tasks VALUES (?, ?, ?)", ("task-2", "{}", 0))
+        await db.flush()
+        await first
+        await last
+        with pytest.raises(sqlite3.IntegrityError):
+            await duplicate
+        rows = await db.read("SELECT id FROM tasks ORDER BY id")
+        await db.close()
+        return rows
+
+    assert asyncio.run(write_batch()) == [("task-1",), ("task-2",)]
+
+
+def test_concurrent_saves_get_consecutive_versions(tmp_path: Path):
+    async def save_concurrently() -> tuple[list[int], list[int]]:
+        db = SqliteDatabase(store_config(tmp_path))
+        artifacts = SqliteArtifactService(db)
+        saved = await asyncio.gather(
+            *(
+                artifacts.save_artifact(
+                    app_name="app",
+                    user_id="user",
+                    session_id="session",
+                    filename="report.txt",
+                    artifact=types.Part(text=f"version {i}"),
+                )
+                for i in range(5)
+            )
+        )
+        versions = await artifacts.list_versions(
+            app_name="app", user_id="user", session_id="session", filename="report.txt"
+        )
+        await db.close()
+        return sorted(saved), versions
+
+    saved, versions = asyncio.run(save_concurrently())
+
+    assert saved == versions == [0, 1, 2, 3, 4]
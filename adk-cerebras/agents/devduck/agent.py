@@ -3,14 +3,19 @@ import os
 from google.adk.agents import Agent
 from google.adk.models.lite_llm import LiteLlm
 
+from .response_cache import CachedLlm
 from .sub_agents import bob_agent, cerebras_agent
 
 root_agent = Agent(
-    model=LiteLlm(
+    model=CachedLlm(
         model=f"openai/{os.environ.get('DEVDUCK_CHAT_MODEL')}",
-        api_base=os.environ.get("DEVDUCK_BASE_URL"),
-        api_key="tada",
-        temperature=0.0,
+        agent_name="devduck",
+        llm=LiteLlm(
+            model=f"openai/{os.environ.get('DEVDUCK_CHAT_MODEL')}",
+            api_base=os.environ.get("DEVDUCK_BASE_URL"),
+            api_key="tada",
+            temperature=0.0,
+        ),
     ),
     name=os.environ.get("DEVDUCK_AGENT_NAME"),
     description=os.environ.get("DEVDUCK_AGENT_DESCRIPTION"),
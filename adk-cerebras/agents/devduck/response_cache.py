@@ -0,0 +1,205 @@
+"""Cache of model responses for repeated requests."""
+
+from collections import Counter
+from dataclasses import dataclass
+import hashlib
+import json
+import logging
+import math
+import time
+from typing import Any, AsyncGenerator, Optional
+
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types
+import litellm
+from pydantic import PrivateAttr
+
+from .lru_cache import LruCache
+
+logger = logging.getLogger(__name__)
+
+response_cache_stats: Counter[str] = Counter()
+
+# Lookup results, as counted in response_cache_stats and as logged
+_RESULTS = {
+    "hits": "hit",
+    "similar_hits": "similar hit",
+    "misses": "miss",
+    "bypassed": "bypassed",
+}
+
+
+@dataclass
+class _Entry:
+    responses: list[LlmResponse]
+    context: str
+    embedding: Optional[list[float]]
+    expires_at: float
+
+
+class CachedLlm(BaseLlm):
+    """
+    Model serving repeated requests from a cache of the responses of `llm`,
+    normally created with the `model` of `llm`.
+
+    Requests are matched on model, generation config, instruction, tools and
+    conversation, with whitespace in texts collapsed. Responses are kept for
+    `ttl` seconds in an LRU cache bounded by `max_entries` and `max_mb`. With
+    `embedding_model`, called through litellm with `embedding_args`, a request
+    whose last user message has an embedding within `similarity_threshold`
+    (cosine) of the one of a cached request with the same earlier conversation
+    is served from the cache as well. Requests carrying tool results always go
+    to the model. Lookups are counted in `response_cache_stats` under
+    `agent_name` and logged at INFO.
+    """
+
+    llm: BaseLlm
+    agent_name: str = ""
+    ttl: float = 3600.0
+    max_entries: int = 256
+    max_mb: Optional[float] = 32.0
+    embedding_model: Optional[str] = None
+    embedding_args: dict[str, Any] = {}
+    similarity_threshold: float = 0.95
+    _cache: LruCache[str, _Entry] = PrivateAttr()
+
+    def model_post_init(self, context: Any) -> None:
+        max_mb = self.max_mb
+        self._cache = LruCache(
+            self.max_entries,
+            int(max_mb * 1024 * 1024) if max_mb is not None else None,
+        )
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        if _has_tool_results(llm_request):
+            self._count("bypassed")
+            async for response in self.llm.generate_content_async(llm_request, stream):
+                yield response
+            return
+
+        context, query = _request_keys(llm_request)
+        key = _digest([context, query])
+        embedding = None
+        entry = self._get(key)
+        if entry is not None:
+            self._count("hits")
+        elif query and self.embedding_model:
+            embedding = await self._embed(query)
+            entry = self._get_similar(context, embedding) if embedding else None
+            if entry is not None:
+                self._count("similar_hits")
+        if entry is not None:
+            for response in entry.responses:
+                yield response.model_copy(deep=True)
+            return
+        self._count("misses")
+
+        responses: list[LlmResponse] = []
+        async for response in self.llm.generate_content_async(llm_request, stream):
+            if not response.partial:
+                responses.append(response.model_copy(deep=True))
+            yield response
+        if responses and not any(r.error_code for r in responses):
+            entry = _Entry(responses, context, embedding, time.monotonic() + self.ttl)
+            size = (
+                sum(len(r.model_dump_json(exclude_none=True)) for r in responses)
+                if self._cache.sized
+                else 0
+            )
+            self._cache.put(key, entry, size)
+
+    def _get(self, key: str) -> Optional[_Entry]:
+        entry = self._cache.get(key)
+        if entry is not None and entry.expires_at <= time.monotonic():
+            self._cache.pop(key)
+            return None
+        return entry
+
+    def _get_similar(self, context: str, embedding: list[float]) -> Optional[_Entry]:
+        now = time.monotonic()
+        best, best_score = None, self.similarity_threshold
+        for key, entry in self._cache.items():
+            if entry.context != context or entry.embedding is None:
+                continue
+            if entry.expires_at <= now:
+                self._cache.pop(key)
+                continue
+            score = _cosine(embedding, entry.embedding)
+            if score >= best_score:
+                best, best_score = key, score
+        return self._cache.get(best) if best else None
+
+    async def _embed(self, text: str) -> Optional[list[float]]:
+        try:
+            result = await litellm.aembedding(
+                model=self.embedding_model, input=[text], **self.embedding_args
+            )
+            return list(result.data[0]["embedding"])
+        except Exception as e:
+            logger.warning("Failed to embed request for response cache: %s", e)
+            return None
+
+    def _count(self, result: str) -> None:
+        name = self.agent_name
+        response_cache_stats[f"{name}.{result}"] += 1
+        logger.info(
+            "%s: response cache %s; %d hits, %d similar hits, %d misses, %d bypassed",
+            name,
+            _RESULTS[result],
+            response_cache_stats[f"{name}.hits"],
+            response_cache_stats[f"{name}.similar_hits"],
+            response_cache_stats[f"{name}.misses"],
+            response_cache_stats[f"{name}.bypassed"],
+        )
+
+
+def _has_tool_results(llm_request: LlmRequest) -> bool:
+    return any(
+        part.function_response
+        for content in llm_request.contents
+        for part in content.parts or []
+    )
+
+
+def _request_keys(llm_request: LlmRequest) -> tuple[str, str]:
+    """
+    Return the digest of the request but its last user message, and the text of
+    that message, if any.
+    """
+    contents = [_normalize(content) for content in llm_request.contents]
+    query = ""
+    last = llm_request.contents[-1] if llm_request.contents else None
+    if last and last.role == "user" and last.parts and all(p.text for p in last.parts):
+        query = " ".join(p["text"] for p in contents.pop()["parts"])
+    config = (
+        llm_request.config.model_dump(mode="json", exclude_none=True)
+        if llm_request.config
+        else None
+    )
+    return _digest([llm_request.model, config, contents]), query
+
+
+def _normalize(content: types.Content) -> dict[str, Any]:
+    parts = []
+    for part in content.parts or []:
+        if part.text is not None:
+            parts.append({"text": " ".join(part.text.split())})
+        else:
+            parts.append(part.model_dump(mode="json", exclude_none=True))
+    return {"role": content.role, "parts": parts}
+
+
+def _digest(value: Any) -> str:
+    data = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+def _cosine(a: list[float], b: list[float]) -> float:
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    if not norm or len(a) != len(b):
+        return 0.0
+    return sum(x * y for x, y in zip(a, b)) / norm
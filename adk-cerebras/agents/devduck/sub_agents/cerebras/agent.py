@@ -3,12 +3,18 @@ import os
 from google.adk.agents import Agent
 from google.adk.models.lite_llm import LiteLlm
 
+from ...response_cache import CachedLlm
+
 cerebras_agent = Agent(
-    model=LiteLlm(
+    model=CachedLlm(
         model=f"openai/{os.environ.get('CEREBRAS_CHAT_MODEL')}",
-        api_base=os.environ.get("CEREBRAS_BASE_URL"),
-        api_key=os.environ.get("CEREBRAS_API_KEY"),
-        temperature=0.0,
+        agent_name="cerebras",
+        llm=LiteLlm(
+            model=f"openai/{os.environ.get('CEREBRAS_CHAT_MODEL')}",
+            api_base=os.environ.get("CEREBRAS_BASE_URL"),
+            api_key=os.environ.get("CEREBRAS_API_KEY"),
+            temperature=0.0,
+        ),
     ),
     name=os.environ.get("CEREBRAS_AGENT_NAME"),
     description=os.environ.get("CEREBRAS_AGENT_DESCRIPTION"),
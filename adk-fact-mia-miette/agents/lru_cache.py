@@ -0,0 +1,78 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Bounded in-memory LRU cache."""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Generic, Hashable, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+@dataclass
+class _Entry(Generic[V]):
+    value: V
+    size: int
+
+
+class LruCache(Generic[K, V]):
+    """
+    Mapping that evicts its least recently used entries beyond `max_entries`
+    or `max_bytes`. Sizes are estimates supplied by the caller.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: Optional[int] = None):
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._entries: OrderedDict[K, _Entry[V]] = OrderedDict()
+        self._bytes = 0
+
+    @property
+    def sized(self) -> bool:
+        """Whether entry sizes are needed, so callers can skip estimating them."""
+        return self._max_bytes is not None
+
+    def get(self, key: K) -> Optional[V]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return entry.value
+
+    def put(self, key: K, value: V, size: int = 0) -> None:
+        if key in self._entries:
+            self._bytes -= self._entries.pop(key).size
+        self._entries[key] = _Entry(value, size)
+        self._bytes += size
+        while len(self._entries) > self._max_entries or (
+            self._max_bytes is not None
+            and self._bytes > self._max_bytes
+            and len(self._entries) > 1
+        ):
+            self.pop(next(iter(self._entries)))
+
+    def pop(self, key: K) -> Optional[V]:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return None
+        self._bytes -= entry.size
+        return entry.value
+
+    def items(self) -> list[tuple[K, V]]:
+        return [(key, entry.value) for key, entry in self._entries.items()]
+
+    def __len__(self) -> int:
+        return len(self._entries)
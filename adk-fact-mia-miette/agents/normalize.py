@@ -0,0 +1,138 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Request normalizer for models served by llama.cpp."""
+
+from collections import OrderedDict
+import json
+from typing import Any, Hashable, Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import (
+    LlmRequest,  # pyright: ignore[reportPrivateImportUsage]
+    LlmResponse,  # pyright: ignore[reportPrivateImportUsage]
+)
+from google.genai import types
+
+
+def _flatten(content: Any) -> tuple[str, str]:
+    """Return the role and the text of a single request content."""
+    # If it is already plain text, keep it
+    if isinstance(content, str):
+        return "user", content
+    # Merge multiple Parts into a single string
+    if isinstance(content, types.Content):
+        text = "\n".join((p.text or "") for p in content.parts or [])
+        return content.role or "user", text
+    # Fallback: JSON-encode any dict / list / None
+    return "user", json.dumps(content, ensure_ascii=False)
+
+
+def _fingerprint(content: Any) -> Hashable:
+    """
+    Return what the normalized form of a content depends on. ADK deep-copies
+    the contents of every request, which keeps their texts, so comparing
+    fingerprints of the same event is cheap.
+    """
+    if isinstance(content, types.Content):
+        return content.role, tuple(p.text for p in content.parts or [])
+    return _flatten(content)
+
+
+def _text_content(role: str, text: str) -> types.Content:
+    return types.Content(role=role, parts=[types.Part(text=text)])
+
+
+class _History:
+    """Normalized form of the contents seen so far for one conversation."""
+
+    def __init__(self) -> None:
+        # Fingerprints of the request contents processed, to tell whether the
+        # next request extends the same history
+        self.fingerprints: list[Hashable] = []
+        # Collapsed contents, except for the trailing run of the same role
+        self.closed: list[types.Content] = []
+        self.role: Optional[str] = None
+        self.chunks: list[str] = []
+        self.tail: Optional[types.Content] = None
+
+    def extends(self, contents: list) -> bool:
+        """Whether `contents` starts with all the contents processed so far."""
+        return 0 < len(self.fingerprints) <= len(contents) and all(
+            _fingerprint(content) == fingerprint
+            for content, fingerprint in zip(contents, self.fingerprints)
+        )
+
+    def add(self, contents: list) -> None:
+        for content in contents:
+            role, text = _flatten(content)
+            self.fingerprints.append(_fingerprint(content))
+            if role != self.role:
+                if self.role is not None:
+                    self.closed.append(self._tail())
+                self.role = role
+                self.chunks = []
+            self.chunks.append(text)
+            self.tail = None
+
+    def contents(self) -> list[types.Content]:
+        if self.role is None:
+            return []
+        return [*self.closed, self._tail()]
+
+    def _tail(self) -> types.Content:
+        if self.tail is None:
+            assert self.role is not None
+            self.tail = _text_content(self.role, "\n".join(self.chunks))
+        return self.tail
+
+
+class ContentNormalizer:
+    """
+    before_model_callback ensuring every Content in llm_request.contents ends up
+    as a *single* text part, so llama.cpp never sees lists/dicts/None, and that
+    consecutive contents of the same role are merged into one.
+
+    The request contents of an agent grow by a few entries per model call, so
+    the normalized history is kept per session and agent, and only the contents
+    added since the previous call are processed. It is rebuilt when any of the
+    contents processed before has changed. The returned contents are shared
+    between calls and must not be modified.
+    """
+
+    def __init__(self, max_histories: int = 256):
+        self._max_histories = max_histories
+        self._histories: OrderedDict[Hashable, _History] = OrderedDict()
+
+    def __call__(
+        self, callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> LlmResponse | None:
+        session = callback_context._invocation_context.session
+        key = (session.id, callback_context.agent_name)
+        llm_request.contents = self.normalize(key, llm_request.contents)
+        return None  # let ADK proceed normally
+
+    def normalize(self, key: Hashable, contents: list) -> list[types.Content]:
+        """Normalize `contents`, reusing the work done for `key` on the last call."""
+        history = self._histories.pop(key, None)
+        if history is None or not history.extends(contents):
+            history = _History()
+        history.add(contents[len(history.fingerprints) :])
+        self._histories[key] = history
+        if len(self._histories) > self._max_histories:
+            self._histories.popitem(last=False)
+        return history.contents()
+
+
+force_string_content = ContentNormalizer()
@@ -1,18 +1,27 @@
 """Agent for reviewing new suppliers before adding them to the Sock Store."""
 
-from google.adk.agents import SequentialAgent
+from google.adk.agents import ParallelAgent, SequentialAgent
 
 from .sub_agents.reddit_researcher import reddit_researcher_agent
 from .sub_agents.customer_feedback import customer_feedback_agent
 from .sub_agents.catalogue import catalog_agent
 
+# The web research and the customer feedback analysis are independent, so they
+# run concurrently; their findings are kept in the session state under the
+# output keys of the agents for the catalog decision
+supplier_research_agent = ParallelAgent(
+    name="supplier_research_agent",
+    description="Researches the supplier on the web and in customer feedback.",
+    sub_agents=[reddit_researcher_agent, customer_feedback_agent],
+)
+
 new_supplier_agent = SequentialAgent(
     name="new_supplier_agent",
     description=
         """
         Supplier Intake Agent
         """,
-    sub_agents=[reddit_researcher_agent, customer_feedback_agent, catalog_agent],
+    sub_agents=[supplier_research_agent, catalog_agent],
 )
 
 root_agent = new_supplier_agent
@@ -0,0 +1,127 @@
+"""LiteLLM client letting the model reuse the cached prefix of its prompt."""
+
+from collections import Counter
+import hashlib
+import json
+import logging
+import os
+from typing import Any, Iterable, Iterator, Optional
+
+from google.adk.models.lite_llm import LiteLLMClient
+
+logger = logging.getLogger(__name__)
+
+prompt_cache_stats: Counter[str] = Counter()
+
+# Roles of the message LiteLlm sends the agent instruction in
+_INSTRUCTION_ROLES = ("system", "developer")
+
+
+def prompt_cache_hit_rate(name: str) -> float:
+    """Share of the prompt tokens of `name` the model reported as cached."""
+    prompt_tokens = prompt_cache_stats[f"{name}.prompt_tokens"]
+    if not prompt_tokens:
+        return 0.0
+    return prompt_cache_stats[f"{name}.cached_tokens"] / prompt_tokens
+
+
+class PromptCacheClient(LiteLLMClient):
+    """
+    LiteLLMClient for agents with a long static instruction.
+
+    ADK sends the instruction first, then the tools and the conversation, so
+    the requests of an agent share a prefix that only grows with the
+    conversation. Requests to the model runner (MODEL_RUNNER_URL) ask it to
+    keep the KV cache of the prompt (`cache_prompt`), and carry a
+    `prompt_cache_key` derived from the instruction and tools for runners that
+    route requests by it. The prompt tokens the model reports as cached are
+    counted in `prompt_cache_stats` under `name`, along with the requests that
+    reused some of the cache (hits) or none of it (misses), and logged at INFO.
+    """
+
+    def __init__(self, name: str, client: Optional[LiteLLMClient] = None):
+        self._name = name
+        self._client = client or LiteLLMClient()
+
+    async def acompletion(self, model, messages, tools, **kwargs) -> Any:
+        response = await self._client.acompletion(
+            model, messages, tools, **self._with_cache(messages, tools, kwargs)
+        )
+        self._record(response)
+        return response
+
+    def completion(self, model, messages, tools, stream=False, **kwargs) -> Any:
+        if stream and _is_model_runner(kwargs):
+            # The usage, with the cached tokens, comes with the last chunk
+            kwargs.setdefault("stream_options", {"include_usage": True})
+        response = self._client.completion(
+            model,
+            messages,
+            tools,
+            stream=stream,
+            **self._with_cache(messages, tools, kwargs),
+        )
+        if stream:
+            return self._watch(response)
+        self._record(response)
+        return response
+
+    def _with_cache(
+        self, messages: list, tools: Optional[list], kwargs: dict[str, Any]
+    ) -> dict[str, Any]:
+        if not _is_model_runner(kwargs):
+            return kwargs
+        instruction = [m for m in messages[:1] if m.get("role") in _INSTRUCTION_ROLES]
+        prefix = json.dumps([instruction, tools or []], sort_keys=True, default=str)
+        digest = hashlib.sha256(prefix.encode()).hexdigest()[:16]
+        extra_body = {
+            **(kwargs.get("extra_body") or {}),
+            "cache_prompt": True,
+            "prompt_cache_key": f"{self._name}-{digest}",
+        }
+        return {**kwargs, "extra_body": extra_body}
+
+    def _watch(self, stream: Iterable[Any]) -> Iterator[Any]:
+        last = None
+        for chunk in stream:
+            if getattr(chunk, "usage", None):
+                last = chunk
+            yield chunk
+        if last is not None:
+            self._record(last)
+
+    def _record(self, response: Any) -> None:
+        usage = getattr(response, "usage", None)
+        if not usage or not usage.prompt_tokens:
+            return
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached = getattr(details, "cached_tokens", None)
+        if cached is None:
+            # llama.cpp reports the tokens taken from its cache in its timings
+            cached = (getattr(response, "timings", None) or {}).get("cache_n", 0)
+        prompt_cache_stats[f"{self._name}.requests"] += 1
+        prompt_cache_stats[f"{self._name}.{'hits' if cached else 'misses'}"] += 1
+        prompt_cache_stats[f"{self._name}.prompt_tokens"] += usage.prompt_tokens
+        prompt_cache_stats[f"{self._name}.cached_tokens"] += cached
+        logger.info(
+            "%s: %d of %d prompt tokens cached; %d hits, %d misses, %.0f%% of "
+            "prompt tokens cached overall",
+            self._name,
+            cached,
+            usage.prompt_tokens,
+            prompt_cache_stats[f"{self._name}.hits"],
+            prompt_cache_stats[f"{self._name}.misses"],
+            100 * prompt_cache_hit_rate(self._name),
+        )
+
+
+def _is_model_runner(kwargs: dict[str, Any]) -> bool:
+    runner_url = os.environ.get("MODEL_RUNNER_URL")
+    base_url = (
+        kwargs.get("api_base")
+        or kwargs.get("base_url")
+        or os.environ.get("OPENAI_BASE_URL")
+    )
+    if not runner_url or not base_url:
+        return False
+    return base_url.rstrip("/") == runner_url.rstrip("/")
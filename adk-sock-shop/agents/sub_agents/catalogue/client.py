@@ -0,0 +1,127 @@
+"""Async client for the catalogue service.
+
+Products are added over a shared `httpx.AsyncClient`, so calls reuse pooled
+keep-alive connections and never block the event loop. When
+CATALOGUE_BULK_PATH is set, a batch of products is sent in a single request
+to that path of the catalogue; otherwise the products of a batch are added
+with concurrent requests.
+"""
+
+import asyncio
+import os
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+CATALOGUE_URL = os.environ.get("CATALOGUE_URL", "http://catalogue")
+CATALOGUE_BULK_PATH = os.environ.get("CATALOGUE_BULK_PATH")
+
+_MAX_CONCURRENT_REQUESTS = 8
+
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Return the client of the running event loop, creating it if needed."""
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        _client = httpx.AsyncClient(
+            base_url=CATALOGUE_URL,
+            timeout=httpx.Timeout(10.0, connect=5.0),
+            limits=httpx.Limits(
+                max_connections=_MAX_CONCURRENT_REQUESTS,
+                max_keepalive_connections=_MAX_CONCURRENT_REQUESTS,
+            ),
+        )
+        _client_loop = loop
+    return _client
+
+
+async def close_catalogue_client() -> None:
+    """Close the shared client and its pooled connections."""
+    global _client, _client_loop
+    if _client is not None:
+        await _client.aclose()
+    _client, _client_loop = None, None
+
+
+async def add_to_catalog(
+    name: str,
+    description: str,
+    imageUrl: List[str],
+    price: float,
+    count: int,
+    tag: List[str],
+) -> Dict[str, Any]:
+    """Add a new product to the catalog via HTTP POST."""
+    payload = {
+        "name": name,
+        "description": description,
+        "imageUrl": imageUrl,
+        "price": price,
+        "count": count,
+        "tag": tag,
+    }
+    try:
+        response = await _get_client().post("/catalogue", json=payload)
+        response.raise_for_status()
+        return {
+            "success": True,
+            "message": f"Product '{name}' added successfully to catalog",
+            "status_code": response.status_code,
+            "response_data": response.json() if response.content else {},
+        }
+    except httpx.HTTPError as e:
+        return {
+            "success": False,
+            "message": f"Failed to add product to catalog: {str(e)}",
+            "error": str(e),
+        }
+
+
+async def add_products_to_catalog(products: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Add several products to the catalog at once. Each product has the same
+    fields as the payload of add_to_catalog: name, description, imageUrl,
+    price, count and tag.
+    """
+    if CATALOGUE_BULK_PATH:
+        try:
+            response = await _get_client().post(CATALOGUE_BULK_PATH, json=products)
+            response.raise_for_status()
+            return {
+                "success": True,
+                "message": f"{len(products)} products added successfully to catalog",
+                "status_code": response.status_code,
+                "response_data": response.json() if response.content else {},
+            }
+        except httpx.HTTPError as e:
+            return {
+                "success": False,
+                "message": f"Failed to add products to catalog: {str(e)}",
+                "error": str(e),
+            }
+
+    results = await asyncio.gather(*(_add_product(product) for product in products))
+    failed = [result for result in results if not result["success"]]
+    return {
+        "success": not failed,
+        "message": (
+            f"{len(products) - len(failed)} of {len(products)} products added "
+            "successfully to catalog"
+        ),
+        "results": results,
+    }
+
+
+async def _add_product(product: Dict[str, Any]) -> Dict[str, Any]:
+    try:
+        return await add_to_catalog(**product)
+    except TypeError as e:
+        return {
+            "success": False,
+            "message": f"Invalid product {product.get('name')!r}: {str(e)}",
+            "error": str(e),
+        }
@@ -3,11 +3,19 @@
 PROMPT = """
         You are reviewing new suppliers for whether they should be added to the store or not.
 
+        Base your decision on the research done on the supplier:
+
+        Web research and reviews:
+        {reddit_research?}
+
+        Customer demand, from the analysis of our customer feedback:
+        {customer_feedback?}
+
         If you don't think that supplier will be a good fit, then reject them but if you know their email address, then send them an email to let them know they've been rejected and why.
 
-        If you think that supplier is a good fit, then go ahead and approve them, and add a sku to the catalog using our api by using curl to make a POST request to 
-        the endpoint http://catalogue/catalogue with content type application/json and a payload
-        that matches the following example. You will always need exactly two imageUrls. Never send just one. If the supplier provides only one image, ask for a second one to be provided.
+        If you think that supplier is a good fit, then go ahead and approve them, and add a sku to the catalog using the add_to_catalog tool
+        with values that match the following example. When the supplier has several products, add them all at once with the add_products_to_catalog tool,
+        passing a list of such products. You will always need exactly two imageUrls. Never send just one. If the supplier provides only one image, ask for a second one to be provided.
 
         ```
         {
@@ -20,5 +28,5 @@ PROMPT = """
         }
         ```
 
-        Fill out the values of this payload with data from the supplier.  Always choose a name that is shorter than 12 characters.
+        Fill out the values of each product with data from the supplier.  Always choose a name that is shorter than 12 characters.
         """
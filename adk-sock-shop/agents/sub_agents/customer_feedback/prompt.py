@@ -16,13 +16,15 @@ If the description lacks detail, ask for clarification.
 
 ### Step 2: Database Search
 
-Use the mongodb find tool to search the MongoDB 'reviews' collection of the 'sockstore' database using a keyword based search.  The filter should be constructed with a json payload like the following:
+Call the get_feedback_summary tool once with all the keywords. For each keyword, it returns the number of reviews, the average rating and rating histogram, the number of reviews asking for more such products, the top complaint terms of low-rated reviews and the most recent reviews.
+
+Only if you need more review quotes, use the mongodb find tool to search the MongoDB 'reviews' collection of the 'sockstore' database using a keyword based search.  The filter should be constructed with a json payload like the following:
 
 ```json
 {"keywords": {"$in": ["compression"]}}
 ```
 Step 3: Analysis and Recommendation
-After retrieving the reviews, analyze them to determine if there is sufficient customer interest in the product.
+After retrieving the review summaries, analyze them to determine if there is sufficient customer interest in the product.
 
 Positive indicators:
 
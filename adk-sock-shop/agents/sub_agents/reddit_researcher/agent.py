@@ -7,6 +7,7 @@ from google.adk import Agent
 from google.adk.models.lite_llm import LiteLlm
 
 from . import prompt
+from ...prompt_cache import PromptCacheClient
 from ...tools import create_mcp_toolsets
 
 tools = create_mcp_toolsets(tools_cfg=["mcp/brave:brave_web_search"])
@@ -18,8 +19,9 @@ logging.info(f"Reddit Research: Use model {api_base_model} and url {api_base_url
 reddit_researcher_agent = Agent(
     # Using local model runner with MODEL_RUNNER_URL
     #model=LiteLlm(model=f"openai/{os.environ.get('MODEL_RUNNER_MODEL')}", api_base=f"{os.environ.get('MODEL_RUNNER_URL')}"),
-    model=LiteLlm(model=f"{api_base_model}", api_base=f"{api_base_url}", api_key=os.environ.get('OPENAI_API_KEY')),
+    model=LiteLlm(model=f"{api_base_model}", api_base=f"{api_base_url}", api_key=os.environ.get('OPENAI_API_KEY'), llm_client=PromptCacheClient("reddit_researcher_agent")),
     name="reddit_researcher_agent",
     instruction=prompt.PROMPT,
+    output_key="reddit_research",
     tools=tools,  # type: ignore
 )
@@ -1,59 +1,409 @@
-from collections import defaultdict
+import asyncio
+from collections import Counter, OrderedDict, defaultdict
+from contextlib import AsyncExitStack, asynccontextmanager
+from datetime import timedelta
+import functools
+import json
+import logging
 import os
-import socket
-from typing import List, Sequence, Union
-from urllib.parse import urlparse
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Union
+from urllib.parse import parse_qs, urlparse
 
+import anyio
+from anyio.streams.buffered import BufferedByteReceiveStream
+from google.adk.agents.readonly_context import ReadonlyContext
+from google.adk.tools.base_tool import BaseTool
 from google.adk.tools.base_toolset import BaseToolset
-from google.adk.tools.mcp_tool.mcp_session_manager import SseConnectionParams
+from google.adk.tools.mcp_tool.mcp_session_manager import (
+    MCPSessionManager,
+    SseConnectionParams,
+)
 from google.adk.tools.mcp_tool.mcp_toolset import MCPToolset
-from mcp.client.stdio import StdioServerParameters
+from google.adk.tools.tool_context import ToolContext
+from mcp import ClientSession
+from mcp.client.sse import sse_client
+from mcp.shared.message import SessionMessage
+import mcp.types as types
+from pydantic import BaseModel
 
+logger = logging.getLogger(__name__)
 
-def _tcp_check(host: str, port: int) -> None:
-    """Fail fast if the MCP gateway is unreachable."""
-    try:
-        with socket.create_connection((host, port), timeout=5):
-            pass
-    except OSError as e:
-        raise RuntimeError(f"cannot reach {host}:{port}: {e}") from e
+_Address = tuple[str, int]
+
+# Gateways known to be reachable, and probes in progress, shared by all toolsets
+_reachable: set[_Address] = set()
+_in_flight: dict[_Address, asyncio.Task] = {}
+
+# One session manager per gateway, so all toolsets share a single MCP session
+_session_managers: dict[_Address, "_SharedSessionManager"] = {}
+
+
+def _forget(address: _Address, task: asyncio.Task) -> None:
+    if _in_flight.get(address) is task:
+        del _in_flight[address]
+
+
+async def _probe_gateway(
+    address: _Address, timeout: float, attempts: int, backoff: float
+) -> None:
+    """Wait until the MCP gateway accepts TCP connections, sharing one probe."""
+    if address in _reachable:
+        return
+    task = _in_flight.get(address)
+    if task is None or task.get_loop() is not asyncio.get_running_loop():
+        task = asyncio.ensure_future(_probe(address, timeout, attempts, backoff))
+        _in_flight[address] = task
+        task.add_done_callback(functools.partial(_forget, address))
+    await asyncio.shield(task)
+
+
+async def _probe(
+    address: _Address, timeout: float, attempts: int, backoff: float
+) -> None:
+    host, port = address
+    for attempt_no in range(max(attempts, 1)):
+        try:
+            async with asyncio.timeout(timeout):
+                _, writer = await asyncio.open_connection(host, port)
+            writer.close()
+            _reachable.add(address)
+            return
+        except (OSError, TimeoutError) as e:
+            error = str(e) or type(e).__name__
+            if attempt_no + 1 >= attempts:
+                raise RuntimeError(f"cannot reach {host}:{port}: {error}") from e
+            delay = backoff * 2**attempt_no
+            logger.warning(
+                "MCP gateway %s:%s not reachable (%s), retrying in %.1fs",
+                host,
+                port,
+                error,
+                delay,
+            )
+            await asyncio.sleep(delay)
+
+
+# Upper bound on a single JSON-RPC message, e.g. a large tool result
+_MAX_MESSAGE_BYTES = 64 * 1024 * 1024
+
+
+class _TcpConnectionParams(BaseModel):
+    host: str
+    port: int
+    # Same default read timeout as ADK uses for stdio servers
+    timeout: float = 5.0
+
+
+@asynccontextmanager
+async def _tcp_client(host: str, port: int, connect_timeout: float) -> AsyncIterator:
+    """
+    Connect to the gateway, which speaks newline-delimited JSON-RPC over TCP,
+    and yield the read and write streams for a `ClientSession`.
+    """
+    with anyio.fail_after(connect_timeout):
+        stream = await anyio.connect_tcp(host, port)
+
+    read_stream_writer, read_stream = anyio.create_memory_object_stream[
+        SessionMessage | Exception
+    ](0)
+    write_stream, write_stream_reader = anyio.create_memory_object_stream[
+        SessionMessage
+    ](0)
+
+    async def tcp_reader() -> None:
+        buffered = BufferedByteReceiveStream(stream)
+        async with read_stream_writer:
+            while True:
+                try:
+                    line = await buffered.receive_until(b"\n", _MAX_MESSAGE_BYTES)
+                except (anyio.IncompleteRead, anyio.EndOfStream):
+                    break
+                except anyio.DelimiterNotFound as e:
+                    await read_stream_writer.send(e)
+                    break
+                if not line.strip():
+                    continue
+                try:
+                    message = types.JSONRPCMessage.model_validate_json(line)
+                except Exception as e:
+                    await read_stream_writer.send(e)
+                    continue
+                await read_stream_writer.send(SessionMessage(message))
+        # Marks the session as disconnected, so it is replaced on next use
+        await write_stream.aclose()
+
+    async def tcp_writer() -> None:
+        async with write_stream_reader:
+            async for session_message in write_stream_reader:
+                data = session_message.message.model_dump_json(
+                    by_alias=True, exclude_none=True
+                )
+                await stream.send(data.encode() + b"\n")
+
+    async with stream, anyio.create_task_group() as tg:
+        tg.start_soon(tcp_reader)
+        tg.start_soon(tcp_writer)
+        try:
+            yield read_stream, write_stream
+        finally:
+            await read_stream.aclose()
+            await write_stream.aclose()
+            tg.cancel_scope.cancel()
+
+
+class _SharedSessionManager(MCPSessionManager):
+    """
+    MCPSessionManager holding the single session to one gateway. The session
+    runs in a background task, so it outlives the request that opened it, and
+    it is replaced when the gateway drops the connection. TCP endpoints are
+    connected to in-process, without socat.
+    """
+
+    def __init__(
+        self, connection_params: Union[SseConnectionParams, _TcpConnectionParams]
+    ):
+        super().__init__(connection_params=connection_params)  # type: ignore[arg-type]
+        self._params = connection_params
+        self._ready: Optional[asyncio.Future[ClientSession]] = None
+        self._closing = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    async def create_session(
+        self, headers: Optional[Dict[str, str]] = None
+    ) -> ClientSession:
+        async with self._session_lock:
+            if self._ready is None or self._is_stale():
+                await self._stop()
+                self._ready = asyncio.get_running_loop().create_future()
+                self._closing = asyncio.Event()
+                self._task = asyncio.create_task(self._run(self._ready, self._closing))
+            ready = self._ready
+        # Shielded, so a cancelled caller does not abort the connection attempt
+        return await asyncio.shield(ready)
+
+    async def close(self) -> None:
+        async with self._session_lock:
+            await self._stop()
+            self._ready = None
+
+    def _is_stale(self) -> bool:
+        ready, task = self._ready, self._task
+        if ready is None or task is None:
+            return True
+        if ready.get_loop() is not asyncio.get_running_loop():
+            return True
+        if not ready.done():
+            return False
+        if ready.cancelled() or ready.exception() or task.done():
+            return True
+        return self._is_session_disconnected(ready.result())
+
+    async def _stop(self) -> None:
+        task, self._task = self._task, None
+        if task is None or task.done():
+            return
+        self._closing.set()
+        if task.get_loop() is asyncio.get_running_loop():
+            await task
+
+    async def _run(
+        self, ready: asyncio.Future[ClientSession], closing: asyncio.Event
+    ) -> None:
+        # The exit stack is entered and closed in this task, as anyio requires
+        try:
+            async with AsyncExitStack() as stack:
+                read, write = await stack.enter_async_context(self._client())
+                session = await stack.enter_async_context(
+                    ClientSession(
+                        read, write, read_timeout_seconds=self._read_timeout()
+                    )
+                )
+                await session.initialize()
+                ready.set_result(session)
+                await closing.wait()
+        except Exception as e:
+            if not ready.done():
+                ready.set_exception(e)
+            else:
+                logger.warning("MCP gateway session closed: %s", e)
+        finally:
+            if not ready.done():
+                ready.cancel()
+
+    def _client(self):
+        params = self._params
+        if isinstance(params, _TcpConnectionParams):
+            return _tcp_client(params.host, params.port, params.timeout)
+        return sse_client(
+            url=params.url,
+            headers=params.headers,
+            timeout=params.timeout,
+            sse_read_timeout=params.sse_read_timeout,
+        )
+
+    def _read_timeout(self) -> Optional[timedelta]:
+        if isinstance(self._params, _TcpConnectionParams):
+            return timedelta(seconds=self._params.timeout)
+        return None
+
+
+# Results of tools given a TTL in their spec, e.g. mcp/duckduckgo:search?ttl=3600,
+# keyed by tool and canonical arguments and evicted least recently used first
+_MAX_CACHED_RESULTS = 512
+_MAX_CACHED_BYTES = 32 * 1024 * 1024
+_results: OrderedDict[str, tuple[float, int, Any]] = OrderedDict()
+_results_bytes = 0
+result_cache_stats: Counter[str] = Counter()
+
+
+def _canonical(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: _canonical(v) for k, v in value.items() if v is not None}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+class _CachedTool(BaseTool):
+    """Tool whose successful results are cached for `ttl` seconds"""
+
+    def __init__(self, tool: BaseTool, ttl: float):
+        super().__init__(name=tool.name, description=tool.description)
+        self._tool = tool
+        self._ttl = ttl
+
+    def _get_declaration(self):
+        return self._tool._get_declaration()
+
+    async def run_async(
+        self, *, args: dict[str, Any], tool_context: ToolContext
+    ) -> Any:
+        global _results_bytes
+        key = self.name + json.dumps(
+            _canonical(args), sort_keys=True, separators=(",", ":"), default=str
+        )
+        cached = _results.get(key)
+        if cached and cached[0] > time.monotonic():
+            _results.move_to_end(key)
+            result_cache_stats[f"{self.name}.hit"] += 1
+            return cached[2]
+        result_cache_stats[f"{self.name}.miss"] += 1
+        result = await self._tool.run_async(args=args, tool_context=tool_context)
+        if getattr(result, "isError", False):
+            return result
+        dump = getattr(result, "model_dump_json", None)
+        size = len(dump() if dump else str(result))
+        if key in _results:
+            _results_bytes -= _results.pop(key)[1]
+        _results[key] = (time.monotonic() + self._ttl, size, result)
+        _results_bytes += size
+        while len(_results) > _MAX_CACHED_RESULTS or (
+            _results_bytes > _MAX_CACHED_BYTES and len(_results) > 1
+        ):
+            _results_bytes -= _results.popitem(last=False)[1][1]
+        return result
+
+
+class _GatewayToolset(MCPToolset):
+    """
+    MCPToolset that waits for the gateway to be reachable before first use.
+    Toolsets of the same gateway share its session and filter the tools of
+    their server on the client side.
+    """
+
+    def __init__(
+        self,
+        *,
+        address: _Address,
+        probe_args: tuple,
+        connection_params: Union[SseConnectionParams, _TcpConnectionParams],
+        result_ttls: dict[str, float],
+        **kwargs,
+    ):
+        super().__init__(connection_params=connection_params, **kwargs)  # type: ignore[arg-type]
+        manager = _session_managers.get(address)
+        if manager is None:
+            manager = _session_managers[address] = _SharedSessionManager(
+                connection_params
+            )
+        self._mcp_session_manager = manager
+        self._address = address
+        self._probe_args = probe_args
+        self._result_ttls = result_ttls
+
+    async def get_tools(
+        self, readonly_context: Optional[ReadonlyContext] = None
+    ) -> List[BaseTool]:
+        # The probe result is cached, so this only waits on the first call
+        await _probe_gateway(self._address, *self._probe_args)
+        tools = await super().get_tools(readonly_context)
+        return [
+            _CachedTool(tool, self._result_ttls[tool.name])
+            if tool.name in self._result_ttls
+            else tool
+            for tool in tools
+        ]
 
 
 def create_mcp_toolsets(
     tools_cfg: Sequence[str],
+    probe_timeout: float = 5.0,
+    probe_attempts: int = 3,
+    probe_backoff: float = 0.5,
 ) -> List[BaseToolset]:
-    """Return MCPToolset objects - let ADK handle async initialization naturally."""
+    """
+    Return MCPToolset objects - let ADK handle async initialization naturally.
+    Nothing connects to the gateway here: toolsets probe it, with retries and
+    exponential backoff, when they are first used. TCP endpoints are connected
+    to in-process rather than through a socat child process. A spec may opt
+    in to result caching with a TTL in seconds, as in `mcp/server:tool?ttl=60`.
+    """
     if not tools_cfg:
         return []
 
     tools_by_server: defaultdict[str, list[str]] = defaultdict(list)
+    result_ttls: dict[str, float] = {}
     for raw in tools_cfg:
         if not raw.startswith("mcp/") or ":" not in raw:
             raise ValueError(f"Bad MCP spec: {raw}")
         server, tool = raw[4:].split(":", 1)
+        tool, _, options = tool.partition("?")
+        if options:
+            try:
+                params = parse_qs(options, strict_parsing=True)
+                if set(params) != {"ttl"} or float(params["ttl"][-1]) <= 0:
+                    raise ValueError
+            except ValueError:
+                raise ValueError(f"Bad MCP spec: {raw}") from None
+            result_ttls[tool] = float(params["ttl"][-1])
         # Use just the tool name, not server:tool format
         tools_by_server[server].append(tool)
 
     endpoint = os.environ["MCPGATEWAY_ENDPOINT"]
-    conn_params: Union[SseConnectionParams, StdioServerParameters]
+    conn_params: Union[SseConnectionParams, _TcpConnectionParams]
     if endpoint.startswith(("http://", "https://")):
         parsed = urlparse(endpoint)
         if not parsed.hostname:
             raise ValueError("invalid MCP gateway URL")
-        host, port = parsed.hostname, parsed.port or 80
-        _tcp_check(host, port)
+        address = (parsed.hostname, parsed.port or 80)
         conn_params = SseConnectionParams(url=endpoint)
     else:
         host, port_str = endpoint.split(":")
-        _tcp_check(host, int(port_str))
-        conn_params = StdioServerParameters(
-            command="socat",
-            args=["STDIO", f"TCP:{endpoint}"],
-        )
+        address = (host, int(port_str))
+        conn_params = _TcpConnectionParams(host=host, port=int(port_str))
 
     result: list[BaseToolset] = []
     for tool_list in tools_by_server.values():
-        toolset = MCPToolset(connection_params=conn_params, tool_filter=tool_list)
+        toolset = _GatewayToolset(
+            address=address,
+            probe_args=(probe_timeout, probe_attempts, probe_backoff),
+            connection_params=conn_params,
+            tool_filter=tool_list,
+            result_ttls={t: result_ttls[t] for t in tool_list if t in result_ttls},
+        )
         result.append(toolset)
 
     return result
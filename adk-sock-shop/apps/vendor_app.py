@@ -1,7 +1,10 @@
 import streamlit as st
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import os
+import queue
+import threading
 import uuid
 import time
 import sseclient
@@ -14,6 +17,10 @@ st.set_page_config(
 
 API_BASE_URL = os.environ.get('API_BASE_URL', "http://adk:8000")
 APP_NAME = "agents"
+# Connections to ADK kept open per browser session
+HTTP_POOL_SIZE = 4
+# Seconds between checks for reruns while waiting for the events of a run
+EVENT_POLL_INTERVAL = 0.1
 
 if "user_id" not in st.session_state:
     st.session_state.user_id = f"vendor-{uuid.uuid4()}"
@@ -24,17 +31,51 @@ if "session_id" not in st.session_state:
 if "messages" not in st.session_state:
     st.session_state.messages = []
 
+# Agent run in progress: the queue of its events and the text of the
+# responses being streamed, by author
+if "run" not in st.session_state:
+    st.session_state.run = None
+
+def new_http_session():
+    """HTTP session keeping its connections to ADK open between requests"""
+    http = requests.Session()
+    http.mount(API_BASE_URL, HTTPAdapter(pool_connections=1, pool_maxsize=HTTP_POOL_SIZE))
+    http.headers["Content-Type"] = "application/json"
+    return http
+
+def get_http_session():
+    """
+    HTTP session of the browser session, used by the script thread only. Its
+    keep-alive connections to ADK are reused by every request, so connection
+    setup is not paid per message.
+    """
+    if "http" not in st.session_state:
+        st.session_state.http = new_http_session()
+    return st.session_state.http
+
+def get_stream_sessions():
+    """
+    Pool of the idle HTTP sessions of the consumer threads of the browser
+    session. requests sessions are not thread-safe, so each consumer takes one
+    for itself, and gives it back when done.
+    """
+    if "stream_http" not in st.session_state:
+        st.session_state.stream_http = queue.SimpleQueue()
+    return st.session_state.stream_http
+
 def create_adk_session():
     try:
         session_id = f"session={int(time.time())}"
-        response = requests.post(
+        response = get_http_session().post(
             f"{API_BASE_URL}/apps/{APP_NAME}/users/{st.session_state.user_id}/sessions/{session_id}",
-            headers={"Content-Type": "application/json"},
-            data=json.dumps({})
+            data=json.dumps({}),
+            timeout=10
         )
         if response.status_code == 200:
             st.session_state.session_id = session_id
             st.session_state.messages = []
+            # Events of a run of the previous session are dropped
+            st.session_state.run = None
             st.rerun()
             return True
         else:
@@ -76,27 +117,86 @@ def summarize_content(parts):
     return "\n".join([summarize(part) for part in parts])
 
 
+def event_message(event_data):
+    """
+    Return the message of an SSE event. Its summary is computed once, when the
+    event arrives, so redrawing the history does not summarize it again.
+    """
+    message = {"role": "event", "content": event_data, "id": str(uuid.uuid4())}
+    if isinstance(event_data, dict):
+        parts = (event_data.get("content") or {}).get("parts") or []
+        message["summary"] = summarize_content(parts)
+    else:
+        message["summary"] = summarize(event_data)
+    return message
+
+
+def partial_text(event_data):
+    """Text of a partial (token-level) event, empty if it has none"""
+    parts = (event_data.get("content") or {}).get("parts") or []
+    return "".join(part.get("text", "") for part in parts if isinstance(part, dict))
+
+
+def render_message(message, placeholder=None):
+    """Draw a single message at the current position, or in the placeholder"""
+    if message["role"] != "event":
+        with st.chat_message(message["role"]):
+            st.markdown(message["content"])
+        return
+
+    # Display SSE events in a bordered container
+    with (placeholder or st).container(border=True):
+        content = message["content"]
+        author = content.get("author", "Unknown") if isinstance(content, dict) else "Unknown"
+        st.markdown(f"<h5 style='text-decoration: underline;'>{author}</h5>", unsafe_allow_html=True)
+        st.markdown(message["summary"])
+
+        # The JSON of the parts is only rendered when asked for
+        if isinstance(content, dict) and st.toggle("View Details", key=f"details-{message['id']}"):
+            st.json((content.get("content") or {}).get("parts") or [])
+
+
+def render_partial(placeholder, author, text):
+    """Draw the text streamed so far by an agent in a single updating block"""
+    with placeholder.container(border=True):
+        st.markdown(f"<h5 style='text-decoration: underline;'>{author}</h5>", unsafe_allow_html=True)
+        st.markdown(f"{text}▌")
+
+
 def display_messages(container):
-    """Display messages in the provided container"""
-    with container.container():
+    """Display all messages in the provided container, once per script run"""
+    with container:
         for message in st.session_state.messages:
-            if message["role"] == "event":
-                # Display SSE events in a bordered container
-                with st.container(border=True):
-                    # Title with content message
-                    author = message['content'].get("author", "Unknown")
-                    role = message["content"]["content"].get("role", "Unknown") if isinstance(message["content"], dict) else "Unknown"
-                    st.markdown(f"<h5 style='text-decoration: underline;'>{author}</h4>", unsafe_allow_html=True)
-                    
-                    # Additional markdown section
-                    st.markdown(summarize_content(message['content']['content']['parts']))
-                    
-                    # Expander with JSON content
-                    with st.expander("View Details"):
-                        st.json(message["content"]["content"]["parts"])
-            else:
-                with st.chat_message(message["role"]):
-                    st.markdown(message["content"])
+            render_message(message)
+
+def consume_events(sessions, payload, events):
+    """
+    Run the agent and put its SSE events in the queue, parsed, from a
+    background thread, with an HTTP session of the pool. The last item of the
+    queue is ("done", None).
+    """
+    try:
+        http = sessions.get_nowait()
+    except queue.Empty:
+        http = new_http_session()
+    try:
+        with http.post(f"{API_BASE_URL}/run_sse", data=json.dumps(payload), stream=True, timeout=(5, None)) as response:
+            if response.status_code != 200:
+                events.put(("error", f"Error: {response.text}"))
+                return
+            for event in sseclient.SSEClient(response).events():
+                if not event.data:
+                    continue
+                try:
+                    events.put(("event", json.loads(event.data)))
+                except json.JSONDecodeError:
+                    # Handle non-JSON events
+                    events.put(("event", event.data))
+    except Exception as e:
+        events.put(("error", f"Error processing SSE stream: {str(e)}"))
+    finally:
+        sessions.put(http)
+        events.put(("done", None))
 
 def send_message(message, messages_container):
     """
@@ -104,9 +204,9 @@ def send_message(message, messages_container):
     
     This function:
     1. Adds the user message to the chat history
-    2. Sends the message to the ADK SSE API
-    3. Processes the SSE event stream
-    4. Updates only the messages container for each event
+    2. Starts a background consumer of the ADK SSE API
+    3. Processes the SSE events it queues
+    4. Appends each new event to the messages container
     
     Args:
         message (str): The user's message to send to the agent
@@ -119,60 +219,96 @@ def send_message(message, messages_container):
         POST /run_sse
         
     Response Processing:
-        - Streams SSE events from the ADK API
-        - Updates only the messages container for each event
+        - Streams SSE events from the ADK API on a background thread, over
+          an HTTP session of the pool of the browser session
+        - Draws each new event below the ones already displayed, without
+          redrawing the history
+        - Collapses the partial (token-level) events of a response into a
+          single block, replaced by the final event of the response
     """
     if not st.session_state.session_id:
         st.error("No active session. Please create a session first.")
         return False
     
     # Add user message to chat
-    st.session_state.messages.append({"role": "user", "content": message})
+    user_message = {"role": "user", "content": message}
+    st.session_state.messages.append(user_message)
     
-    # Update messages display immediately
-    display_messages(messages_container)
+    # Show the user message immediately, below the history already displayed
+    with messages_container:
+        render_message(user_message)
     
-    try:
-        # Send message to SSE API
-        response = requests.post(
-            f"{API_BASE_URL}/run_sse",
-            headers={"Content-Type": "application/json"},
-            data=json.dumps({
-                "app_name": APP_NAME,
-                "user_id": st.session_state.user_id,
-                "session_id": st.session_state.session_id,
-                "new_message": {
-                    "role": "user",
-                    "parts": [{"text": message}]
-                }
-            }),
-            stream=True
-        )
-        
-        if response.status_code != 200:
-            st.error(f"Error: {response.text}")
-            return False
-        
-        # Process SSE events with real-time updates
-        client = sseclient.SSEClient(response)
-        for event in client.events():
-            if event.data:
-                try:
-                    event_data = json.loads(event.data)
-                    # Add each SSE event to messages
-                    st.session_state.messages.append({"role": "event", "content": event_data})
-                    # Update only the messages container
-                    display_messages(messages_container)
-                except json.JSONDecodeError:
-                    # Handle non-JSON events
-                    st.session_state.messages.append({"role": "event", "content": event.data})
-                    display_messages(messages_container)
-        
-        return True
-        
-    except Exception as e:
-        st.error(f"Error processing SSE stream: {str(e)}")
-        return False
+    payload = {
+        "app_name": APP_NAME,
+        "user_id": st.session_state.user_id,
+        "session_id": st.session_state.session_id,
+        "streaming": True,
+        "new_message": {
+            "role": "user",
+            "parts": [{"text": message}]
+        }
+    }
+    run = {"events": queue.Queue(), "partials": {}, "ok": True}
+    threading.Thread(
+        target=consume_events,
+        args=(get_stream_sessions(), payload, run["events"]),
+        daemon=True
+    ).start()
+    st.session_state.run = run
+    return process_events(messages_container)
+
+def process_events(messages_container):
+    """
+    Draw the events of the run in progress as the consumer queues them, until
+    the run is done.
+
+    The run outlives the script run: when a widget reruns the script, the
+    consumer keeps streaming and the new script run picks up its queue. The
+    queue is polled, so a rerun requested while no event arrives, e.g. during a
+    slow tool call, interrupts the script right away.
+    """
+    run = st.session_state.run
+    # Blocks of the responses being streamed, by author: the agents of a
+    # parallel agent stream at the same time
+    placeholders = {}
+    with messages_container:
+        for author, text in run["partials"].items():
+            placeholders[author] = st.empty()
+            render_partial(placeholders[author], author, text)
+    # Streamlit handles a pending rerun when the script sends an element
+    idle = st.empty()
+
+    while True:
+        try:
+            kind, event_data = run["events"].get(timeout=EVENT_POLL_INTERVAL)
+        except queue.Empty:
+            idle.empty()
+            continue
+        if kind == "done":
+            st.session_state.run = None
+            return run["ok"]
+        if kind == "error":
+            run["ok"] = False
+            st.error(event_data)
+            continue
+
+        author = event_data.get("author", "Unknown") if isinstance(event_data, dict) else "Unknown"
+        # The state is updated before drawing, a rerun may stop the drawing
+        if isinstance(event_data, dict) and event_data.get("partial"):
+            # Tokens of a response, not kept in the history
+            text = run["partials"].get(author, "") + partial_text(event_data)
+            run["partials"][author] = text
+            with messages_container:
+                if author not in placeholders:
+                    placeholders[author] = st.empty()
+                render_partial(placeholders[author], author, text)
+            continue
+        message = event_message(event_data)
+        st.session_state.messages.append(message)
+        run["partials"].pop(author, None)
+        with messages_container:
+            # The final event of a response replaces its partial events
+            render_message(message, placeholders.pop(author, None))
 
 st.title("🧦 Sock Shop Vendor Portal")
 
@@ -191,15 +327,20 @@ with st.sidebar:
 st.subheader("Conversation")
 st.markdown("Welcome! Chat with our agent to learn how to add your socks to our store.")
 
-# Create a container for messages that can be updated
-messages_container = st.empty()
+# Create a container for messages that new events are appended to
+messages_container = st.container()
 
 # Initial display of messages
 display_messages(messages_container)
 
 if st.session_state.session_id:  # Only show input if session exists
     user_input = st.chat_input("Type your message...")
-    if user_input:
+    if st.session_state.run:
+        # The script was rerun while the agent was answering
+        if user_input:
+            st.warning("The agent is still answering the previous message.")
+        process_events(messages_container)
+    elif user_input:
         send_message(user_input, messages_container)
 else:
     st.info("👈 Create a session to start chatting")
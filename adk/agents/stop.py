@@ -0,0 +1,109 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""LiteLLM client ending model responses at stop sequences."""
+
+import logging
+from typing import Any, Iterable, Iterator
+
+from google.adk.models.lite_llm import LiteLLMClient
+import litellm
+
+logger = logging.getLogger(__name__)
+
+
+class StopSequenceClient(LiteLLMClient):
+    """
+    LiteLLMClient ending responses at the first of the `stop` sequences, so the
+    model does not keep generating past them.
+
+    The sequences are passed as the `stop` parameter of models that support it.
+    Streamed responses are also watched for them: the stream is closed as soon
+    as one shows up in the output, and the text before it is returned with a
+    `stop` finish reason, as if the model had stopped there.
+    """
+
+    def __init__(self, stop: list[str]):
+        self._stop = stop
+
+    async def acompletion(self, model, messages, tools, **kwargs) -> Any:
+        return await super().acompletion(
+            model, messages, tools, **self._with_stop(model, kwargs)
+        )
+
+    def completion(self, model, messages, tools, stream=False, **kwargs) -> Any:
+        response = super().completion(
+            model, messages, tools, stream=stream, **self._with_stop(model, kwargs)
+        )
+        return self._cut(response) if stream else response
+
+    def _with_stop(self, model: str, kwargs: dict[str, Any]) -> dict[str, Any]:
+        try:
+            supported = (
+                litellm.get_supported_openai_params(  # pyright: ignore[reportPrivateImportUsage]
+                    model=model
+                )
+                or []
+            )
+        except Exception as e:
+            logger.debug("Cannot tell whether %s supports stop: %s", model, e)
+            supported = []
+        if "stop" not in supported:
+            return kwargs
+        stop = kwargs.get("stop") or []
+        stop = [stop] if isinstance(stop, str) else list(stop)
+        return {**kwargs, "stop": stop + [s for s in self._stop if s not in stop]}
+
+    def _cut(self, stream: Iterable[Any]) -> Iterator[Any]:
+        # Text received but not passed on yet, as it may be the start of a stop
+        # sequence
+        pending = ""
+        for chunk in stream:
+            choice = chunk.choices[0] if chunk.choices else None
+            content = getattr(choice.delta, "content", None) if choice else None
+            if not choice or not (content or choice.finish_reason and pending):
+                yield chunk
+                continue
+            pending += content or ""
+            end = min(
+                (i for i in (pending.find(s) for s in self._stop) if i >= 0),
+                default=-1,
+            )
+            if end >= 0:
+                choice.delta.content = pending[:end]
+                choice.finish_reason = "stop"
+                yield chunk
+                _close(stream)
+                return
+            held = 0 if choice.finish_reason else self._held(pending)
+            choice.delta.content = pending[: len(pending) - held]
+            pending = pending[len(pending) - held :]
+            yield chunk
+
+    def _held(self, text: str) -> int:
+        """Length of the longest end of `text` that may start a stop sequence."""
+        for n in range(min(len(text), max(map(len, self._stop)) - 1), 0, -1):
+            if any(s.startswith(text[-n:]) for s in self._stop):
+                return n
+        return 0
+
+
+def _close(stream: Any) -> None:
+    # litellm's stream wrapper has no close method; closing the stream it wraps
+    # ends the request
+    for obj in (stream, getattr(stream, "completion_stream", None)):
+        close = getattr(obj, "close", None)
+        if callable(close):
+            close()
+            return
@@ -19,14 +19,23 @@ import os
 from google.adk import Agent
 from google.adk.models.lite_llm import LiteLlm
 
+from ...prompt_cache import PromptCacheClient
+from ...response_cache import CachedLlm
 from . import prompt
 from .tools import create_mcp_toolsets
 
-tools = create_mcp_toolsets(tools_cfg=["mcp/duckduckgo:search"])
+tools = create_mcp_toolsets(tools_cfg=["mcp/duckduckgo:search?ttl=3600"])
 
 critic_agent = Agent(
     # OPENAI_MODEL_NAME is set by entrypoint.sh with the model name
-    model=LiteLlm(model=os.environ.get("OPENAI_MODEL_NAME", "")),
+    model=CachedLlm(
+        model=os.environ.get("OPENAI_MODEL_NAME", ""),
+        agent_name="critic_agent",
+        llm=LiteLlm(
+            model=os.environ.get("OPENAI_MODEL_NAME", ""),
+            llm_client=PromptCacheClient("critic_agent"),
+        ),
+    ),
     name="critic_agent",
     instruction=prompt.CRITIC_PROMPT,
     tools=tools,  # type: ignore
@@ -14,18 +14,19 @@
 
 """Reviser agent for correcting inaccuracies based on verified findings."""
 
-import json
 import os
 
 from google.adk import Agent
 from google.adk.agents.callback_context import CallbackContext
 from google.adk.models import (
-    LlmRequest,  # pyright: ignore[reportPrivateImportUsage]
     LlmResponse,  # pyright: ignore[reportPrivateImportUsage]
 )
 from google.adk.models.lite_llm import LiteLlm
-from google.genai import types
 
+from ...normalize import force_string_content
+from ...prompt_cache import PromptCacheClient
+from ...response_cache import CachedLlm
+from ...stop import StopSequenceClient
 from . import prompt
 
 _END_OF_EDIT_MARK = "---END-OF-EDIT---"
@@ -47,56 +48,19 @@ def _remove_end_of_edit_mark(
     return llm_response
 
 
-def force_string_content(
-    callback_context: CallbackContext, llm_request: LlmRequest
-) -> LlmResponse | None:
-    del callback_context  # unused
-    """
-    Ensure every Content in llm_request.contents ends up as a *single* text part,
-    so llama.cpp never sees lists/dicts/None.
-    """
-    new_contents: list[types.Content] = []
-
-    for content in llm_request.contents:
-        # If it is already plain text, keep it
-        if isinstance(content, str):
-            new_contents.append(
-                types.Content(role="user", parts=[types.Part(text=content)])
-            )
-            continue
-
-        # Merge multiple Parts into a single string
-        if isinstance(content, types.Content):
-            merged_text = "\n".join((p.text or "") for p in content.parts or [])
-            new_contents.append(
-                types.Content(
-                    role=content.role or "user", parts=[types.Part(text=merged_text)]
-                )
-            )
-            continue
-
-        # Fallback: JSON-encode any dict / list / None
-        new_contents.append(
-            types.Content(
-                role="user",
-                parts=[types.Part(text=json.dumps(content, ensure_ascii=False))],
-            )
-        )
-
-    # add after new_contents construction
-    collapsed: list = []
-    for c in new_contents:
-        if collapsed and collapsed[-1].role == c.role and c.parts:
-            collapsed[-1].parts[0].text += "\n" + (c.parts[0].text or "")
-        else:
-            collapsed.append(c)
-    llm_request.contents = collapsed
-    return None  # let ADK proceed normally
-
-
 reviser_agent = Agent(
     # OPENAI_MODEL_NAME is set by entrypoint.sh with the model name
-    model=LiteLlm(model=os.environ.get("OPENAI_MODEL_NAME", "")),
+    model=CachedLlm(
+        model=os.environ.get("OPENAI_MODEL_NAME", ""),
+        agent_name="reviser_agent",
+        llm=LiteLlm(
+            model=os.environ.get("OPENAI_MODEL_NAME", ""),
+            # Stop generating at the mark rather than only trimming it afterwards
+            llm_client=PromptCacheClient(
+                "reviser_agent", StopSequenceClient(stop=[_END_OF_EDIT_MARK])
+            ),
+        ),
+    ),
     name="reviser_agent",
     instruction=prompt.REVISER_PROMPT,
     before_model_callback=force_string_content,
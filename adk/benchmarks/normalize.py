@@ -0,0 +1,92 @@
+"""Microbenchmark of the request normalizer on long conversations.
+
+Simulates a conversation growing by a user message and a multi-part model
+response per turn, and times the normalization of the request contents of
+each turn, against rebuilding them from scratch as the normalizer used to.
+
+Run from the project directory with `python -m benchmarks.normalize`.
+"""
+
+import argparse
+import copy
+import os
+import time
+
+from google.genai import types
+
+# Importing the agents package creates the agents; their MCP toolsets only
+# connect to the gateway when used
+os.environ.setdefault("MCPGATEWAY_ENDPOINT", "localhost:8811")
+
+from agents.normalize import ContentNormalizer, _flatten, _text_content
+
+
+def rebuild(contents: list) -> list[types.Content]:
+    """Normalize `contents` from scratch, concatenating merged texts."""
+    collapsed: list[types.Content] = []
+    for content in contents:
+        role, text = _flatten(content)
+        if collapsed and collapsed[-1].role == role:
+            collapsed[-1].parts[0].text += "\n" + text  # type: ignore[index,operator]
+        else:
+            collapsed.append(_text_content(role, text))
+    return collapsed
+
+
+def conversation(turns: int, size: int) -> list[list[types.Content]]:
+    """Return the request contents of each turn of a conversation."""
+    contents: list[types.Content] = []
+    requests = []
+    for turn in range(turns):
+        contents.append(
+            types.Content(role="user", parts=[types.Part(text=f"{turn} " * size)])
+        )
+        # Model responses follow each other when the agent calls tools
+        for _ in range(2):
+            contents.append(
+                types.Content(
+                    role="model",
+                    parts=[types.Part(text="a" * size), types.Part(text="b" * size)],
+                )
+            )
+        # ADK deep-copies the session events into the contents of each request
+        requests.append(copy.deepcopy(contents))
+    return requests
+
+
+def timed(normalize, requests: list[list[types.Content]], repeat: int) -> list[float]:
+    """Return the best time of `normalize` for each turn, in microseconds."""
+    best = [float("inf")] * len(requests)
+    for _ in range(repeat):
+        normalizer = ContentNormalizer()
+        for turn, contents in enumerate(requests):
+            start = time.perf_counter()
+            normalize(normalizer, contents)
+            best[turn] = min(best[turn], time.perf_counter() - start)
+    return [t * 1e6 for t in best]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the request normalizer.")
+    parser.add_argument("--turns", type=int, default=200)
+    parser.add_argument("--size", type=int, default=200, help="characters per part")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    requests = conversation(args.turns, args.size)
+    normalizer = ContentNormalizer()
+    for contents in requests:
+        assert normalizer.normalize("check", contents) == rebuild(contents)
+
+    full = timed(lambda _, contents: rebuild(contents), requests, args.repeat)
+    incremental = timed(
+        lambda n, contents: n.normalize("bench", contents), requests, args.repeat
+    )
+    print(f"{'turn':>6} {'rebuild (us)':>14} {'incremental (us)':>18}")
+    step = max(1, args.turns // 8)
+    for turn in sorted({*range(0, args.turns, step), args.turns - 1}):
+        print(f"{turn + 1:>6} {full[turn]:>14.1f} {incremental[turn]:>18.1f}")
+
+
+if __name__ == "__main__":
+    main()
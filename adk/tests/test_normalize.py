@@ -0,0 +1,52 @@
+import copy
+import os
+
+from google.genai import types
+
+# Importing the agents package creates the agents; their MCP toolsets only
+# connect to the gateway when used
+os.environ.setdefault("MCPGATEWAY_ENDPOINT", "localhost:8811")
+
+from agents.normalize import ContentNormalizer  # noqa: E402
+
+
+def content(role: str, *texts: str) -> types.Content:
+    return types.Content(role=role, parts=[types.Part(text=t) for t in texts])
+
+
+def texts(contents: list[types.Content]) -> list[tuple[str | None, str | None]]:
+    return [(c.role, c.parts[0].text if c.parts else None) for c in contents]
+
+
+def test_history_is_extended():
+    contents = [content("user", "hi"), content("model", "a", "b")]
+    normalizer = ContentNormalizer()
+    normalizer.normalize("key", copy.deepcopy(contents))
+
+    contents += [content("model", "c"), content("user", "bye")]
+    normalized = normalizer.normalize("key", copy.deepcopy(contents))
+
+    assert texts(normalized) == [("user", "hi"), ("model", "a\nb\nc"), ("user", "bye")]
+
+
+def test_history_is_rebuilt_when_a_middle_content_changes():
+    contents = [
+        content("user", "hi"),
+        content("model", "a"),
+        content("user", "question"),
+        content("model", "b"),
+    ]
+    normalizer = ContentNormalizer()
+    normalizer.normalize("key", copy.deepcopy(contents))
+
+    contents[2] = content("user", "edited question")
+    contents.append(content("user", "bye"))
+    normalized = normalizer.normalize("key", copy.deepcopy(contents))
+
+    assert texts(normalized) == [
+        ("user", "hi"),
+        ("model", "a"),
+        ("user", "edited question"),
+        ("model", "b"),
+        ("user", "bye"),
+    ]
@@ -0,0 +1,103 @@
+import asyncio
+import os
+from typing import AsyncGenerator
+import uuid
+
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types
+
+# Importing the agents package creates the agents; their MCP toolsets only
+# connect to the gateway when used
+os.environ.setdefault("MCPGATEWAY_ENDPOINT", "localhost:8811")
+
+from agents.response_cache import CachedLlm, response_cache_stats  # noqa: E402
+
+
+class CountingLlm(BaseLlm):
+    """Model answering every request with the number of requests so far."""
+
+    calls: int = 0
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        self.calls += 1
+        yield LlmResponse(
+            content=types.Content(
+                role="model", parts=[types.Part(text=str(self.calls))]
+            )
+        )
+
+
+def text_request(query: str) -> LlmRequest:
+    return LlmRequest(
+        model="model",
+        contents=[types.Content(role="user", parts=[types.Part(text=query)])],
+    )
+
+
+def tool_request(query: str, result: str) -> LlmRequest:
+    """Return a request carrying a search call and its result, with a new id."""
+    call_id = f"adk-{uuid.uuid4()}"
+    return LlmRequest(
+        model="model",
+        contents=[
+            types.Content(role="user", parts=[types.Part(text=query)]),
+            types.Content(
+                role="model",
+                parts=[
+                    types.Part(
+                        function_call=types.FunctionCall(
+                            id=call_id, name="search", args={"query": query}
+                        )
+                    )
+                ],
+            ),
+            types.Content(
+                role="user",
+                parts=[
+                    types.Part(
+                        function_response=types.FunctionResponse(
+                            id=call_id, name="search", response={"result": result}
+                        )
+                    )
+                ],
+            ),
+        ],
+    )
+
+
+def generate(llm: CachedLlm, request: LlmRequest) -> list[str]:
+    async def texts() -> list[str]:
+        return [
+            part.text or ""
+            async for response in llm.generate_content_async(request)
+            for part in (response.content.parts if response.content else None) or []
+        ]
+
+    return asyncio.run(texts())
+
+
+def test_requests_with_tool_results_are_bypassed():
+    model = CountingLlm(model="model")
+    llm = CachedLlm(model="model", llm=model, agent_name="test_tools")
+
+    assert generate(llm, tool_request("sky", "blue")) == ["1"]
+    assert generate(llm, tool_request("sky", "blue")) == ["2"]
+    assert model.calls == 2
+    assert response_cache_stats["test_tools.bypassed"] == 2
+    assert response_cache_stats["test_tools.misses"] == 0
+
+
+def test_least_recently_used_responses_are_evicted():
+    model = CountingLlm(model="model")
+    llm = CachedLlm(model="model", llm=model, agent_name="test_lru", max_entries=2)
+
+    for query in ["a", "b", "a", "c", "a", "b"]:
+        generate(llm, text_request(query))
+
+    # "b" was evicted by "c", as "a" was used more recently
+    assert model.calls == 4
+    assert response_cache_stats["test_lru.hits"] == 2
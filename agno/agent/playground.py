@@ -1,6 +1,10 @@
 import asyncio
+from contextlib import AsyncExitStack, asynccontextmanager
+from datetime import timedelta
+import json
 import os
 import sys
+from typing import AsyncIterator, Awaitable, Callable, Optional
 
 from agno.agent import Agent
 from agno.models.openai import OpenAIChat
@@ -8,13 +12,125 @@ from agno.playground import Playground, serve_playground_app
 from agno.team import Team
 from agno.tools import Toolkit
 from agno.tools.mcp import MCPTools
+import anyio
+from anyio.streams.buffered import BufferedByteReceiveStream
 from fastapi.middleware.cors import CORSMiddleware
+from mcp import ClientSession
+from mcp.client.sse import sse_client
+from mcp.shared.message import SessionMessage
+import mcp.types as types
 import nest_asyncio
 import yaml
 
 # Allow nested event loops
 nest_asyncio.apply()
 
+# Upper bound on a single JSON-RPC message, e.g. a large tool result
+MAX_MCP_MESSAGE_BYTES = 64 * 1024 * 1024
+
+# Keeps the connections to the MCP gateway open while the server runs
+mcp_connections = AsyncExitStack()
+
+# Tool schemas listed from the MCP gateway, by gateway, servers and tool filter.
+# With MCP_TOOL_SCHEMA_SNAPSHOT set, they are persisted to that file and served
+# from it on restart, while they are listed again in the background.
+TOOL_SCHEMA_SNAPSHOT_VERSION = 1
+tool_schemas: dict[str, types.ListToolsResult] = {}
+# Keys of the tool schemas listed by this process, not loaded from the snapshot
+fresh_tool_schemas: set[str] = set()
+
+
+def load_tool_schemas() -> None:
+    """Load the tool schema snapshot, if any."""
+    path = os.environ.get("MCP_TOOL_SCHEMA_SNAPSHOT")
+    if not path or not os.path.exists(path):
+        return
+    try:
+        with open(path) as f:
+            data = json.load(f)
+        if data.get("version") != TOOL_SCHEMA_SNAPSHOT_VERSION:
+            print(f"WARNING: ignoring tool schema snapshot {path}: version mismatch")
+            return
+        for key, result in data["tools"].items():
+            tool_schemas[key] = types.ListToolsResult.model_validate(result)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"WARNING: ignoring unreadable tool schema snapshot {path}: {e}")
+
+
+def save_tool_schemas() -> None:
+    path = os.environ.get("MCP_TOOL_SCHEMA_SNAPSHOT")
+    if not path:
+        return
+    data = {
+        "version": TOOL_SCHEMA_SNAPSHOT_VERSION,
+        "tools": {
+            key: result.model_dump(mode="json", by_alias=True, exclude_none=True)
+            for key, result in tool_schemas.items()
+        },
+    }
+    try:
+        with open(f"{path}.tmp", "w") as f:
+            json.dump(data, f)
+        os.replace(f"{path}.tmp", path)
+    except OSError as e:
+        print(f"WARNING: failed to write tool schema snapshot {path}: {e}")
+
+
+class CachedToolsSession(ClientSession):
+    """
+    ClientSession answering list_tools from the tool schema cache. Schemas
+    loaded from the snapshot are served right away and refreshed in the
+    background, calling `on_refresh` when they changed.
+    """
+
+    def __init__(
+        self,
+        *args,
+        cache_key: str,
+        tool_names: list[str],
+        on_refresh: Optional[Callable[[], Awaitable[None]]] = None,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self.cache_key = cache_key
+        self.tool_names = tool_names
+        self.on_refresh = on_refresh
+        self.initialize_result: Optional[types.InitializeResult] = None
+        self.refresh_task: Optional[asyncio.Task] = None
+
+    async def initialize(self) -> types.InitializeResult:
+        # MCPTools initializes the session again when it reloads its tools
+        if self.initialize_result is None:
+            self.initialize_result = await super().initialize()
+        return self.initialize_result
+
+    async def list_tools(self, *args, **kwargs) -> types.ListToolsResult:
+        result = tool_schemas.get(self.cache_key)
+        if result is None:
+            result = await self.list_gateway_tools(*args, **kwargs)
+        elif self.cache_key not in fresh_tool_schemas and self.refresh_task is None:
+            self.refresh_task = asyncio.create_task(self.refresh(result))
+        return result
+
+    async def list_gateway_tools(self, *args, **kwargs) -> types.ListToolsResult:
+        result = await super().list_tools(*args, **kwargs)
+        result.tools = [t for t in result.tools if t.name in self.tool_names]
+        tool_schemas[self.cache_key] = result
+        fresh_tool_schemas.add(self.cache_key)
+        save_tool_schemas()
+        return result
+
+    async def refresh(self, snapshot: types.ListToolsResult) -> None:
+        try:
+            result = await self.list_gateway_tools()
+        except Exception as e:
+            print(f"WARNING: failed to refresh tool schemas: {e}")
+            # Try again on the next list_tools
+            self.refresh_task = None
+            return
+        if result.tools != snapshot.tools and self.on_refresh:
+            await self.on_refresh()
+
 
 def create_model_from_config(entity_data: dict, entity_id: str) -> OpenAIChat:
     """Create a model instance from entity configuration data."""
@@ -62,39 +178,102 @@ def create_model(
     raise ValueError(f"Unknown agent model provider: {provider}")
 
 
+@asynccontextmanager
+async def tcp_client(host: str, port: int) -> AsyncIterator:
+    """
+    Connect to an MCP server speaking newline-delimited JSON-RPC over TCP and
+    yield the read and write streams for a ClientSession.
+    """
+    stream = await anyio.connect_tcp(host, port)
+    read_stream_writer, read_stream = anyio.create_memory_object_stream[
+        SessionMessage | Exception
+    ](0)
+    write_stream, write_stream_reader = anyio.create_memory_object_stream[
+        SessionMessage
+    ](0)
+
+    async def tcp_reader() -> None:
+        buffered = BufferedByteReceiveStream(stream)
+        async with read_stream_writer:
+            while True:
+                try:
+                    line = await buffered.receive_until(b"\n", MAX_MCP_MESSAGE_BYTES)
+                except (anyio.IncompleteRead, anyio.EndOfStream):
+                    break
+                except anyio.DelimiterNotFound as e:
+                    await read_stream_writer.send(e)
+                    break
+                if not line.strip():
+                    continue
+                try:
+                    message = types.JSONRPCMessage.model_validate_json(line)
+                except Exception as e:
+                    await read_stream_writer.send(e)
+                    continue
+                await read_stream_writer.send(SessionMessage(message))
+        await write_stream.aclose()
+
+    async def tcp_writer() -> None:
+        async with write_stream_reader:
+            async for session_message in write_stream_reader:
+                data = session_message.message.model_dump_json(
+                    by_alias=True, exclude_none=True
+                )
+                await stream.send(data.encode() + b"\n")
+
+    async with stream, anyio.create_task_group() as tg:
+        tg.start_soon(tcp_reader)
+        tg.start_soon(tcp_writer)
+        try:
+            yield read_stream, write_stream
+        finally:
+            await read_stream.aclose()
+            await write_stream.aclose()
+            tg.cancel_scope.cancel()
+
+
 async def create_mcp_tools(tools_list: list[str], entity_type: str) -> list[Toolkit]:
     """Create MCP tools from a list of tool names."""
     if len(tools_list) == 0:
         return []
 
     tool_names = [name.split(":", 1)[1] for name in tools_list]
+    servers = sorted(
+        {name.split(":", 1)[0].removeprefix("mcp/") for name in tools_list}
+    )
 
     gateway_url = os.environ.get("MCPGATEWAY_URL")
     if not gateway_url:
         raise ValueError(
             f"MCPGATEWAY_URL environment variable not set for {entity_type} tools"
         )
-    command: str | None = None
-    url: str | None = None
-    transport: str = ""
     if gateway_url.startswith("http://") or gateway_url.startswith("https://"):
-        url = gateway_url
-        transport = "sse"
-        print(f"DEBUG: {entity_type} connecting to MCP gateway via SSE {url}")
+        print(f"DEBUG: {entity_type} connecting to MCP gateway via SSE {gateway_url}")
+        client = sse_client(gateway_url)
     else:
-        # Assume it's a TCP endpoint
-        tcp_endpoint = gateway_url
-        transport = "stdio"
-        command = f"socat STDIO TCP:{tcp_endpoint}"
-        print(
-            f"DEBUG: {entity_type} connecting to MCP gateway via STDIO {tcp_endpoint}"
+        # Assume it's a TCP endpoint, connected to in-process instead of socat
+        print(f"DEBUG: {entity_type} connecting to MCP gateway via TCP {gateway_url}")
+        host, port = gateway_url.rsplit(":", 1)
+        client = tcp_client(host, int(port))
+
+    async def reload_tools() -> None:
+        # MCPTools only registers the tools of the session when initialized
+        t.functions.clear()
+        t._initialized = False
+        await t.initialize()
+
+    read, write = await mcp_connections.enter_async_context(client)
+    session = await mcp_connections.enter_async_context(
+        CachedToolsSession(
+            read,
+            write,
+            read_timeout_seconds=timedelta(seconds=5),
+            cache_key=f"{gateway_url}|{','.join(servers)}|{','.join(sorted(tool_names))}",
+            tool_names=tool_names,
+            on_refresh=reload_tools,
         )
-    t = MCPTools(
-        command=command,
-        url=url,
-        transport=transport,  # type: ignore
-        include_tools=tool_names,
     )
+    t = MCPTools(session=session, include_tools=tool_names)
     mcp_tools = await t.__aenter__()
     return [mcp_tools]
 
@@ -110,6 +289,7 @@ def get_common_config(entity_data: dict) -> dict:
 
 async def run_server(config) -> None:
     """Run the playground server."""
+    load_tool_schemas()
     # Create a client session to connect to the MCP server
     agents = []
     agents_by_id = {}
@@ -1,8 +1,11 @@
+import json
 import os
-from typing import Optional
+import threading
+from typing import Any, Optional
 
 from crewai.tools import BaseTool
 from crewai_tools import MCPServerAdapter, ScrapeWebsiteTool, SerperDevTool
+from pydantic import BaseModel, Field, create_model
 
 
 def get_tools() -> list[BaseTool]:
@@ -18,12 +21,136 @@ def _get_tools_crewai() -> list[BaseTool]:
     return [SerperDevTool(), ScrapeWebsiteTool()]
 
 
+# Tool schemas listed from the MCP server are snapshotted to the file named by
+# MCP_TOOL_SCHEMA_SNAPSHOT. On restart, the tools are built from the snapshot
+# and serve right away, while a background thread connects to the server and
+# refreshes the snapshot and the tools.
+_SNAPSHOT_VERSION = 1
+
+_JSON_TYPES: dict[str, type] = {
+    "string": str,
+    "integer": int,
+    "number": float,
+    "boolean": bool,
+    "array": list,
+    "object": dict,
+}
+
 _server: Optional[MCPServerAdapter] = None
+_server_lock = threading.Lock()
+_tools: Optional[list[BaseTool]] = None
 
 
 def _get_tools_mcp() -> list[BaseTool]:
+    global _tools
+    if _tools is None:
+        schemas = _load_tool_schemas()
+        if schemas is None:
+            _tools = list(_connect().values())
+        else:
+            _tools = [_SnapshotTool.from_schema(schema) for schema in schemas]
+            threading.Thread(target=_refresh, args=(_tools,), daemon=True).start()
+        print(f"Available MCP tools {[tool.name for tool in _tools]}")
+    return _tools
+
+
+def _refresh(snapshot_tools: list[BaseTool]) -> None:
+    """Connect to the MCP server and update the tools built from the snapshot."""
+    global _tools
+    try:
+        live_tools = _connect()
+    except Exception as e:
+        print(f"Failed to refresh MCP tool schemas: {e}")
+        return
+    for tool in snapshot_tools:
+        live_tool = live_tools.get(tool.name)
+        if live_tool is not None:
+            tool.description = live_tool.description
+            tool.args_schema = live_tool.args_schema
+    # Crews created from now on also get the tools added to the server
+    _tools = list(live_tools.values())
+
+
+def _connect() -> dict[str, BaseTool]:
+    """Connect to the MCP server once, and return its tools by name."""
     global _server
-    if _server is None:
-        _server = MCPServerAdapter(dict(url=os.getenv("MCP_SERVER_URL")))
-        print(f"Available MCP tools {[tool.name for tool in _server.tools]}")
-    return _server.tools
+    with _server_lock:
+        if _server is None:
+            _server = MCPServerAdapter(dict(url=os.getenv("MCP_SERVER_URL")))
+            _save_tool_schemas(_server.tools)
+        return {tool.name: tool for tool in _server.tools}
+
+
+class _SnapshotTool(BaseTool):
+    """MCP tool built from the schema snapshot, connecting on first use."""
+
+    def _run(self, **kwargs: Any) -> Any:
+        return _connect()[self.name].run(**kwargs)
+
+    @classmethod
+    def from_schema(cls, schema: dict) -> "_SnapshotTool":
+        properties = schema["args_schema"].get("properties", {})
+        required = set(schema["args_schema"].get("required", []))
+        fields: dict[str, Any] = {
+            name: (
+                _JSON_TYPES.get(spec.get("type"), Any),
+                Field(
+                    ... if name in required else None,
+                    description=spec.get("description"),
+                ),
+            )
+            for name, spec in properties.items()
+        }
+        return cls(
+            name=schema["name"],
+            description=schema["description"],
+            args_schema=create_model(f"{schema['name']}_args", **fields),
+        )
+
+
+def _load_tool_schemas() -> Optional[list[dict]]:
+    path = os.getenv("MCP_TOOL_SCHEMA_SNAPSHOT")
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Ignoring unreadable tool schema snapshot {path}: {e}")
+        return None
+    if data.get("version") != _SNAPSHOT_VERSION:
+        print(f"Ignoring tool schema snapshot {path}: version mismatch")
+        return None
+    return data.get("tools", {}).get(os.getenv("MCP_SERVER_URL"))
+
+
+def _save_tool_schemas(tools: list[BaseTool]) -> None:
+    path = os.getenv("MCP_TOOL_SCHEMA_SNAPSHOT")
+    url = os.getenv("MCP_SERVER_URL")
+    if not path or not url:
+        return
+    data: dict[str, Any] = {"version": _SNAPSHOT_VERSION, "tools": {}}
+    try:
+        with open(path) as f:
+            previous = json.load(f)
+        if previous.get("version") == _SNAPSHOT_VERSION:
+            data["tools"] = previous.get("tools", {})
+    except (OSError, ValueError):
+        pass
+    data["tools"][url] = [_tool_schema(tool) for tool in tools]
+    try:
+        with open(f"{path}.tmp", "w") as f:
+            json.dump(data, f)
+        os.replace(f"{path}.tmp", path)
+    except OSError as e:
+        print(f"Failed to write tool schema snapshot {path}: {e}")
+
+
+def _tool_schema(tool: BaseTool) -> dict:
+    args_schema: type[BaseModel] = tool.args_schema
+    return {
+        "name": tool.name,
+        # crewAI prefixes the description with the name and arguments of the tool
+        "description": tool.description.split("Tool Description: ", 1)[-1],
+        "args_schema": args_schema.model_json_schema(),
+    }